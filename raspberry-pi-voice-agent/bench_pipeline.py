@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Genio AI - Headless Pipeline Replay Benchmark
+Drives the real GenioAI pipeline (capture ring buffer, VAD endpointing,
+pipeline stages, tracing) from a directory of WAV files instead of a
+microphone, and reports throughput, per-stage latency and real-time
+factor as JSON, along with the peak memory allocated per utterance
+between the end of recording and the transcript.
+
+Each fixture is a 16 kHz mono 16-bit WAV holding one spoken command
+(optionally preceded by the wake word when --wakeword real is used).
+A `name.txt` next to it holds the transcript the stub STT returns and
+the reference for the word error rate with --stt real.
+
+Porcupine, Whisper and Piper are replaced by fast deterministic stubs
+unless --wakeword/--stt/--tts real is given, so the harness runs on any
+machine without a microphone, access key or downloaded models.
+
+Usage:
+    python bench_pipeline.py fixtures/ --speed 4 --output result.json
+"""
+
+import sys
+import json
+import time
+import argparse
+import platform
+import resource
+import threading
+import subprocess
+import tracemalloc
+from contextlib import nullcontext, redirect_stdout
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+# Settings print configuration warnings on import; keep stdout for the report
+with redirect_stdout(sys.stderr):
+    from main import GenioAI
+from audio.sinks import NullSink
+from audio.sources import WavSource
+from utils.tracing import Tracer, percentile
+
+
+class StubDetector:
+    """Deterministic wake word: fires when the replay reaches each fixture."""
+
+    def __init__(self, capture, positions, frame_length=512):
+        self.reader = capture.reader()
+        self.positions = list(positions)
+        self.frame_length = frame_length
+        self.detection_position = None
+
+    def detect(self):
+        try:
+            self.reader.read(self.frame_length, timeout=1.0)
+        except (RuntimeError, TimeoutError):
+            # Replay finished
+            time.sleep(0.01)
+            return False
+        if self.positions and self.reader.position >= self.positions[0]:
+            self.positions.pop(0)
+            self.detection_position = self.reader.position
+            return True
+        return False
+
+    def cleanup(self):
+        self.reader = None
+
+
+class StubSTT:
+    """Returns the fixture transcripts in order, optionally simulating decode time."""
+
+    def __init__(self, transcripts, rtf=0.0, rate=16000):
+        self.transcripts = list(transcripts)
+        self.rtf = rtf
+        self.rate = rate
+        self.tracer = None
+
+    def transcribe(self, audio):
+        if self.rtf:
+            time.sleep(len(audio) / self.rate * self.rtf)
+        return self.transcripts.pop(0) if self.transcripts else ""
+
+
+class StubTTS:
+    """Accepts speech instantly; nothing is synthesized or played."""
+
+    backend = 'stub'
+    sample_rate = 22050
+
+    def __init__(self):
+        self.tracer = None
+        self.on_playback = None
+        self.is_speaking = False
+
+    def _span(self, name):
+        return self.tracer.span(name) if self.tracer else nullcontext()
+
+    def speak(self, text, stream=True):
+        with self._span('tts_total'):
+            with self._span('tts_first_audio'):
+                pass
+
+    def interrupt(self):
+        pass
+
+    def clear_interrupt(self):
+        pass
+
+
+class ReplayGenioAI(GenioAI):
+    """GenioAI with stub engines swapped in where real ones are not requested."""
+
+    def __init__(self, source, transcripts, engines, stub_stt_rtf, tracer):
+        self.source = source
+        self.transcripts = transcripts
+        self.engines = engines
+        self.stub_stt_rtf = stub_stt_rtf
+        self.transcribed = []
+        self.peak_bytes = []  # Per utterance, while tracemalloc is tracing
+        super().__init__(audio_source=source, tracer=tracer, use_mqtt=False)
+
+    def _init_wakeword(self):
+        if self.engines['wakeword'] == 'real':
+            return super()._init_wakeword()
+        self.porcupine_detector = StubDetector(self.capture, self.source.starts)
+
+    def _init_stt(self):
+        if self.engines['stt'] == 'real':
+            return super()._init_stt()
+        self.stt = StubSTT(self.transcripts, rtf=self.stub_stt_rtf, rate=self.capture.rate)
+
+    def transcribe_command(self, audio, state=None):
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            baseline = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        command = super().transcribe_command(audio, state)
+        if tracing:
+            self.peak_bytes.append(tracemalloc.get_traced_memory()[1] - baseline)
+        self.transcribed.append(command)
+        return command
+
+    def _open_sink(self):
+        # Real Piper synthesis, but the audio is discarded instead of played
+        return NullSink()
+
+    def _init_tts(self):
+        from audio.scheduler import SpeechScheduler
+        from audio.speaker import Speaker
+
+        if self.engines['tts'] == 'real':
+            return super()._init_tts()
+        self.tts = StubTTS()
+        self.tts.tracer = self.tracer
+        self.speaker = Speaker(self.tts)
+        self.speech = SpeechScheduler(self.speaker, tracer=self.tracer)
+
+
+def load_fixtures(fixtures_dir):
+    """Return (wav paths, transcripts) for every WAV in the directory."""
+    paths = sorted(Path(fixtures_dir).glob("*.wav"))
+    transcripts = []
+    for path in paths:
+        txt = path.with_suffix(".txt")
+        transcripts.append(txt.read_text(encoding="utf-8").strip() if txt.exists() else "")
+    return paths, transcripts
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=Path(__file__).parent,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def summarize(values, unit="ms"):
+    """Percentiles in the same shape as Tracer.summary()."""
+    return {
+        "count": len(values),
+        f"p50_{unit}": percentile(values, 50),
+        f"p95_{unit}": percentile(values, 95),
+        f"p99_{unit}": percentile(values, 99),
+    }
+
+
+def run(args):
+    paths, transcripts = load_fixtures(args.fixtures)
+    if not paths:
+        raise SystemExit(f"No WAV fixtures in {args.fixtures}")
+
+    engines = {"wakeword": args.wakeword, "stt": args.stt, "tts": args.tts}
+    source = WavSource(paths, gap_seconds=args.gap, speed=args.speed, paused=True)
+    traces = []
+    tracer = Tracer(publish=lambda line: traces.append(json.loads(line)))
+
+    agent = ReplayGenioAI(source, transcripts, engines, args.stub_stt_rtf, tracer)
+    agent.timeline.wait_all()
+    if args.memory:
+        # numpy reports its array allocations to tracemalloc
+        tracemalloc.start()
+
+    runner = threading.Thread(target=agent.run_pipeline, name='Replay', daemon=True)
+    runner.start()
+    # Model loading is not part of the measurement
+    start = time.monotonic()
+    source.play()
+
+    deadline = start + source.total_seconds / (args.speed or 1.0) + args.timeout
+    while time.monotonic() < deadline:
+        if sum(1 for trace in traces if trace['name'] == 'interaction') >= len(paths):
+            break
+        time.sleep(0.05)
+    wall = time.monotonic() - start
+
+    pipeline_stats = agent.pipeline.stats() if getattr(agent, 'pipeline', None) else {}
+    if getattr(agent, 'pipeline', None):
+        agent.pipeline.stop()
+    runner.join(timeout=5.0)
+    tracemalloc.stop()
+    agent.shutdown()
+    memory = {
+        "recording_buffers_kb": round(agent.microphone.recording.nbytes / 1024, 1) if agent.microphone else None,
+        "utterance_peak": summarize([round(n / 1024, 1) for n in agent.peak_bytes], unit="kb"),
+        # Linux reports kilobytes, macOS bytes
+        "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+                            / (1024 * 1024 if sys.platform == "darwin" else 1024), 1),
+    }
+    return build_report(args, engines, paths, transcripts, agent.transcribed, source, traces, tracer,
+                        pipeline_stats, memory, wall)
+
+
+def build_report(args, engines, paths, transcripts, transcribed, source, traces, tracer, pipeline_stats, memory,
+                 wall):
+    interactions = [trace for trace in traces if trace['name'] == 'interaction']
+    audio_seconds = sum(source.durations)
+
+    def span_ms(name):
+        return [span['duration_ms'] for trace in interactions for span in trace['spans'] if span['name'] == name]
+
+    # End of the recorded utterance to the first reply audio
+    response_ms = []
+    for trace in interactions:
+        spans = {span['name']: span for span in trace['spans']}
+        if 'record' in spans and 'tts_first_audio' in spans:
+            record_end = spans['record']['offset_ms'] + spans['record']['duration_ms']
+            first_audio = spans['tts_first_audio']['offset_ms'] + spans['tts_first_audio']['duration_ms']
+            response_ms.append(round(first_audio - record_end, 1))
+
+    transcribe_s = sum(span_ms('transcribe')) / 1000.0
+    busy_s = sum(stage.get('busy_seconds', 0.0) for name, stage in pipeline_stats.items() if name != 'record')
+    report = {
+        "build": {
+            "git": git_revision(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "node": platform.node(),
+        },
+        "engines": engines,
+        "fixtures": len(paths),
+        "speed": args.speed,
+        "audio_seconds": round(audio_seconds, 2),
+        "wall_seconds": round(wall, 2),
+        "interactions": len(interactions),
+        "throughput_per_minute": round(60.0 * len(interactions) / wall, 2) if wall else None,
+        "real_time_factor": {
+            "stt": round(transcribe_s / audio_seconds, 4) if audio_seconds else None,
+            "pipeline": round(busy_s / audio_seconds, 4) if audio_seconds else None,
+        },
+        "latency_ms": dict(tracer.summary(), response=summarize(response_ms)),
+        "pipeline": pipeline_stats,
+        "memory": memory,
+    }
+
+    if engines['stt'] == 'real':
+        from stt.tuner import word_error_rate
+
+        scored = [(ref, hyp) for ref, hyp in zip(transcripts, transcribed) if ref]
+        if scored:
+            report["wer"] = round(sum(word_error_rate(ref, hyp) for ref, hyp in scored) / len(scored), 4)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay WAV fixtures through the Genio AI pipeline")
+    parser.add_argument("fixtures", help="Directory of 16 kHz mono WAV files (+ optional .txt transcripts)")
+    parser.add_argument("--wakeword", choices=["stub", "real"], default="stub")
+    parser.add_argument("--stt", choices=["stub", "real"], default="stub")
+    parser.add_argument("--tts", choices=["stub", "real"], default="stub")
+    parser.add_argument("--stub-stt-rtf", type=float, default=0.0,
+                        help="Simulated decode time of the stub STT, as a fraction of audio length")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="Replay speed relative to real time (default: 1.0)")
+    parser.add_argument("--gap", type=float, default=1.5, help="Seconds of silence before each fixture")
+    parser.add_argument("--timeout", type=float, default=10.0,
+                        help="Extra seconds to wait for the last interaction")
+    parser.add_argument("--no-memory", dest="memory", action="store_false",
+                        help="Skip tracemalloc, which slows Python code down a little")
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    args = parser.parse_args()
+
+    # Components print progress to stdout; keep it free for the report
+    with redirect_stdout(sys.stderr):
+        report = run(args)
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Genio AI - Startup Benchmark
+Measures time until the wake word detector is listening and until every
+component is ready, for sequential and parallel initialization.
+Requires the real models, a microphone and a configured Porcupine key.
+"""
+
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from main import GenioAI
+
+
+def measure(parallel):
+    start = time.monotonic()
+    agent = GenioAI(parallel_startup=parallel)
+    agent.timeline.wait('wakeword')
+    wake_ready = time.monotonic() - start
+    agent.timeline.wait_all()
+    all_ready = time.monotonic() - start
+
+    result = {
+        "time_to_wake_word_s": round(wake_ready, 2),
+        "time_to_ready_s": round(all_ready, 2),
+        "components": {
+            name: {"start_s": round(offset, 2), "duration_s": round(duration, 2)}
+            for name, (offset, duration) in agent.timeline.entries.items()
+        },
+    }
+
+    agent.shutdown()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Genio AI startup time")
+    parser.add_argument("--mode", choices=["sequential", "parallel", "both"], default="both")
+    args = parser.parse_args()
+
+    results = {}
+    if args.mode in ("sequential", "both"):
+        results["sequential"] = measure(parallel=False)
+    if args.mode in ("parallel", "both"):
+        results["parallel"] = measure(parallel=True)
+
+    print(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
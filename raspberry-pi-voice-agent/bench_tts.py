@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Genio AI - Piper TTS Latency Benchmark
+Compares per-utterance synthesis latency of the legacy piper subprocess
+(one process and model load per sentence) with the persistent in-process voice,
+and the time to the first streamed audio block for each backend.
+"""
+
+import sys
+import json
+import time
+import argparse
+import statistics
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from tts.tts_engine import PiperTTS, PiperVoice
+from config.settings import TTS_MODEL_PATH, TTS_CONFIG_PATH, TTS_LANGUAGE
+
+PHRASES = [
+    "Hej!",
+    "Ursäkta, jag kunde inte förstå det.",
+    "Mottaget kommando: tänd lampan i köket.",
+    "Klockan är kvart över tre och det är sol ute.",
+    "Jag har skickat ditt kommando till hemautomationen.",
+]
+
+
+def time_utterances(tts, phrases, rounds):
+    """Synthesize every phrase `rounds` times and return latencies in ms."""
+    latencies = []
+    for _ in range(rounds):
+        for phrase in phrases:
+            start = time.perf_counter()
+            tts.synthesize(phrase)
+            latencies.append((time.perf_counter() - start) * 1000.0)
+    return latencies
+
+
+def time_first_block(tts, phrases, rounds):
+    """Stream every phrase and return the latency to the first audio block in ms."""
+    latencies = []
+    for _ in range(rounds):
+        for phrase in phrases:
+            start = time.perf_counter()
+            blocks = tts.stream(phrase)
+            next(blocks)
+            latencies.append((time.perf_counter() - start) * 1000.0)
+            blocks.close()
+    return latencies
+
+
+def summarize(latencies):
+    ordered = sorted(latencies)
+    return {
+        "count": len(ordered),
+        "mean_ms": round(statistics.mean(ordered), 1),
+        "p50_ms": round(ordered[len(ordered) // 2], 1),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 1),
+        "max_ms": round(ordered[-1], 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Piper TTS per-utterance latency")
+    parser.add_argument("--rounds", type=int, default=3, help="Repetitions of the phrase set")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable JSON only")
+    args = parser.parse_args()
+
+    results = {}
+
+    # Before: a new piper process (and model load) for every utterance
+    legacy = PiperTTS(TTS_MODEL_PATH, TTS_CONFIG_PATH, TTS_LANGUAGE, use_python_api=False)
+    results["subprocess"] = summarize(time_utterances(legacy, PHRASES, args.rounds))
+    results["subprocess_first_block"] = summarize(time_first_block(legacy, PHRASES, args.rounds))
+
+    # After: voice loaded once, reused for every utterance
+    if PiperVoice is None:
+        print("⚠️  piper-tts Python package not installed, skipping persistent backend")
+    else:
+        start = time.perf_counter()
+        persistent = PiperTTS(TTS_MODEL_PATH, TTS_CONFIG_PATH, TTS_LANGUAGE)
+        load_ms = (time.perf_counter() - start) * 1000.0
+        results["python"] = summarize(time_utterances(persistent, PHRASES, args.rounds))
+        results["python"]["load_ms"] = round(load_ms, 1)
+        results["python_first_block"] = summarize(time_first_block(persistent, PHRASES, args.rounds))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print("=" * 60)
+    print("Genio AI - Piper TTS Latency Benchmark")
+    print("=" * 60)
+    for backend, stats in results.items():
+        print(f"\n{backend}:")
+        for key, value in stats.items():
+            print(f"   {key:>8}: {value}")
+    if "python" in results:
+        speedup = results["subprocess"]["p50_ms"] / max(results["python"]["p50_ms"], 0.1)
+        print(f"\n⚡ Median speedup: {speedup:.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Genio AI - Wake Word Frame Loop Micro-Benchmark
+Measures the per-frame cost of PorcupineDetector.detect() against the old
+struct.unpack_from loop, in frames/sec and CPU% of one core at the real
+frame rate (512 samples @ 16 kHz = 31.25 frames/sec).
+
+Uses a stub Porcupine engine unless --access-key is given, so the numbers
+isolate the Python-side overhead of the loop.
+"""
+
+import sys
+import json
+import time
+import ctypes
+import struct
+import argparse
+import numpy as np
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from wakeword.porcupine_detector import PorcupineDetector
+
+FRAME_LENGTH = 512
+SAMPLE_RATE = 16000
+
+
+class StubPorcupine:
+    """Mimics the pvporcupine binding without the neural network."""
+
+    frame_length = FRAME_LENGTH
+    sample_rate = SAMPLE_RATE
+
+    def __init__(self):
+        self._handle = None
+
+    def _process_func(self, handle, pcm, result):
+        result.contents.value = -1
+        return 0
+
+    def process(self, pcm):
+        # Same conversion pvporcupine performs before calling into C
+        result = ctypes.c_int()
+        self._process_func(self._handle, (ctypes.c_short * len(pcm))(*pcm), ctypes.pointer(result))
+        return result.value
+
+    def delete(self):
+        pass
+
+
+class BytesStream:
+    """PyAudio-like stream returning the same frame of bytes forever."""
+
+    def __init__(self, frame):
+        self.frame = frame.tobytes()
+
+    def read(self, num_frames, exception_on_overflow=True):
+        return self.frame
+
+
+class RingReader:
+    """CaptureReader-like source returning a view of one frame."""
+
+    def __init__(self, frame):
+        self.frame = frame
+        self.position = 0
+
+    def read(self, num_samples, timeout=None):
+        self.position += num_samples
+        return self.frame[:num_samples]
+
+
+def legacy_detect(porcupine, stream):
+    """The original per-frame loop body."""
+    try:
+        pcm = stream.read(porcupine.frame_length, exception_on_overflow=False)
+        pcm = struct.unpack_from("h" * porcupine.frame_length, pcm)
+        return porcupine.process(pcm) >= 0
+    except Exception as e:
+        print(f"Error during detection: {e}")
+        return False
+
+
+def make_detector(porcupine, stream=None, reader=None):
+    detector = PorcupineDetector(access_key="bench", keywords=["porcupine"])
+    detector.porcupine = porcupine
+    detector.audio_stream = stream
+    detector.reader = reader
+    detector._prepare_frame_buffer()
+    detector.is_initialized = True
+    return detector
+
+
+def run(step, frames):
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    for _ in range(frames):
+        step()
+    cpu = time.process_time() - cpu_start
+    wall = time.perf_counter() - wall_start
+    frame_seconds = FRAME_LENGTH / SAMPLE_RATE
+    return {
+        "frames_per_sec": round(frames / wall),
+        "us_per_frame": round(cpu / frames * 1e6, 2),
+        "cpu_percent_at_realtime": round(cpu / frames / frame_seconds * 100, 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the wake word frame loop")
+    parser.add_argument("--frames", type=int, default=50000)
+    parser.add_argument("--access-key", help="Use the real Porcupine engine with this key")
+    args = parser.parse_args()
+
+    if args.access_key:
+        import pvporcupine
+        porcupine = pvporcupine.create(access_key=args.access_key, keywords=["porcupine"])
+    else:
+        porcupine = StubPorcupine()
+
+    rng = np.random.default_rng(0)
+    frame = rng.integers(-2000, 2000, porcupine.frame_length, dtype=np.int16)
+    stream = BytesStream(frame)
+
+    results = {
+        "legacy_struct_unpack": run(lambda: legacy_detect(porcupine, stream), args.frames),
+        "preallocated_stream": run(make_detector(porcupine, stream=stream).detect, args.frames),
+        "preallocated_ring": run(make_detector(porcupine, reader=RingReader(frame)).detect, args.frames),
+    }
+    results["engine"] = "porcupine" if args.access_key else "stub"
+    print(json.dumps(results, indent=2))
+    porcupine.delete()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
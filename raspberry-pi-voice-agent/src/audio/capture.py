@@ -0,0 +1,288 @@
+import threading
+import numpy as np
+from .sources import PyAudioSource
+
+
+class CaptureStopped(RuntimeError):
+    """The shared capture has stopped: its source ended or failed."""
+
+
+class RingBuffer:
+    """
+    Preallocated int16 ring buffer that hands out zero-copy views.
+
+    Every sample is stored twice (at i and i + capacity), so any window
+    of up to `capacity` samples is contiguous in memory and can be
+    returned as a numpy view without copying, even across the wrap point.
+    """
+
+    def __init__(self, capacity):
+        """
+        Initialize the ring buffer.
+
+        Args:
+            capacity: Number of most recent samples that stay readable
+        """
+        self.capacity = capacity
+        self.written = 0  # Total samples written since start
+        self._data = np.zeros(capacity * 2, dtype=np.int16)
+
+    def write(self, samples):
+        """
+        Append samples, overwriting the oldest data when full.
+
+        Args:
+            samples: int16 numpy array
+        """
+        if len(samples) > self.capacity:
+            self.written += len(samples) - self.capacity
+            samples = samples[-self.capacity:]
+
+        n = len(samples)
+        start = self.written % self.capacity
+        end = start + n
+
+        # Primary copy, which may run past `capacity` into the mirror half
+        self._data[start:end] = samples
+        # Mirror copy on the other side of the wrap point
+        first = min(end, self.capacity)
+        self._data[start + self.capacity:first + self.capacity] = samples[:first - start]
+        if end > self.capacity:
+            self._data[:end - self.capacity] = samples[self.capacity - start:]
+
+        self.written += n
+
+    @property
+    def oldest(self):
+        """Absolute index of the oldest sample still in the buffer."""
+        return max(0, self.written - self.capacity)
+
+    def view(self, start, length):
+        """
+        Return a read-only view of `length` samples starting at absolute index `start`.
+
+        The view stays valid until the writer wraps around and overwrites it.
+        """
+        if length > self.capacity:
+            raise ValueError(f"Requested {length} samples, buffer holds {self.capacity}")
+        if start < self.oldest or start + length > self.written:
+            raise IndexError("Requested samples are not in the buffer")
+
+        offset = start % self.capacity
+        window = self._data[offset:offset + length]
+        window.flags.writeable = False
+        return window
+
+
+
+class RecordingBuffer:
+    """
+    Preallocated float32 buffers that recordings are normalized into.
+
+    Whisper expects float32 samples in [-1, 1). Each int16 block is scaled
+    straight into the buffer as it arrives, so a finished recording is
+    handed to STT as a view without any further conversion or copy.
+    Recordings rotate through `count` buffers: a recording stays valid
+    while up to count - 1 newer ones are made, e.g. while it waits in the
+    pipeline's STT queue.
+    """
+
+    SCALE = np.float32(1.0 / 32768.0)
+
+    def __init__(self, capacity, count=1):
+        """
+        Initialize the buffers.
+
+        Args:
+            capacity: Samples each buffer holds before it has to grow
+            count: Number of recordings that can be alive at once
+        """
+        self._buffers = [np.zeros(capacity, dtype=np.float32) for _ in range(max(1, count))]
+        self._index = 0
+        self.length = 0  # Samples in the current recording
+
+    @property
+    def capacity(self):
+        return len(self._buffers[self._index])
+
+    @property
+    def nbytes(self):
+        """Memory held by all buffers."""
+        return sum(buffer.nbytes for buffer in self._buffers)
+
+    def start(self):
+        """Begin a new recording in the next buffer."""
+        self._index = (self._index + 1) % len(self._buffers)
+        self.length = 0
+
+    def append(self, samples):
+        """
+        Normalize int16 samples into the current recording.
+
+        Args:
+            samples: int16 numpy array (or a view into the capture ring buffer)
+        """
+        end = self.length + len(samples)
+        buffer = self._buffers[self._index]
+        if end > len(buffer):
+            # Longer than expected; grow once instead of failing mid-utterance
+            grown = np.zeros(max(end, 2 * len(buffer)), dtype=np.float32)
+            grown[:self.length] = buffer[:self.length]
+            self._buffers[self._index] = buffer = grown
+        np.multiply(samples, self.SCALE, out=buffer[self.length:end], dtype=np.float32)
+        self.length = end
+
+    def view(self):
+        """Return a read-only float32 view of the current recording."""
+        window = self._buffers[self._index][:self.length]
+        window.flags.writeable = False
+        return window
+
+
+class AudioCapture:
+    """
+    Single microphone stream shared by all audio consumers.
+
+    A capture thread owns the only input stream on the device and writes
+    frames into a RingBuffer. Consumers (wake word detector, command
+    recorder) each get a CaptureReader with their own read position.
+    """
+
+    def __init__(self, rate=16000, frame_length=512, capacity_seconds=10, device_index=None, source=None):
+        """
+        Initialize the shared capture.
+
+        Args:
+            rate: Sample rate in Hz (default: 16000, what Porcupine and Whisper expect)
+            frame_length: Samples per device read (default: 512, one Porcupine frame)
+            capacity_seconds: Seconds of audio kept in the ring buffer (default: 10)
+            device_index: PyAudio input device index (default: system default)
+            source: Optional object with read(num_samples) -> bytes and close()
+                used instead of a PyAudio stream (e.g. WavSource for replay).
+                Capture stops when it returns no data.
+        """
+        self.rate = rate
+        self.frame_length = frame_length
+        self.device_index = device_index
+        self.ring = RingBuffer(int(rate * capacity_seconds))
+        self.is_running = False
+        self.error = None  # Exception that stopped the capture thread, if any
+        self._condition = threading.Condition()
+        self._thread = None
+        self._source = source
+
+    def start(self):
+        """Open the input stream and start the capture thread."""
+        if self.is_running:
+            return
+
+        if self._source is None:
+            self._source = PyAudioSource(self.rate, self.frame_length, self.device_index)
+        self.is_running = True
+        self._thread = threading.Thread(target=self._run, name='AudioCapture', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while self.is_running:
+            try:
+                data = self._source.read(self.frame_length)
+            except Exception as e:
+                if self.is_running:
+                    print(f"❌ Audio capture failed: {e}")
+                    self.error = e
+                # Wake up readers so they raise instead of waiting forever
+                with self._condition:
+                    self.is_running = False
+                    self._condition.notify_all()
+                break
+            if not data:
+                # Source exhausted: wake up readers so they see capture has stopped
+                with self._condition:
+                    self.is_running = False
+                    self._condition.notify_all()
+                break
+            samples = np.frombuffer(data, dtype=np.int16)
+            with self._condition:
+                self.ring.write(samples)
+                self._condition.notify_all()
+
+    @property
+    def position(self):
+        """Absolute index of the next sample to be captured."""
+        return self.ring.written
+
+    def reader(self):
+        """Create a new consumer positioned at the live edge of the stream."""
+        return CaptureReader(self)
+
+    def stop(self):
+        """Stop the capture thread and release the device."""
+        self.is_running = False
+        with self._condition:
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        if self._source is not None:
+            self._source.close()
+
+
+class CaptureReader:
+    """Independent read position into a shared AudioCapture."""
+
+    def __init__(self, capture):
+        self.capture = capture
+        self.position = capture.position
+        self.overruns = 0  # Times this reader fell behind and skipped audio
+
+    def seek_to_live(self):
+        """Discard everything captured so far and continue from the live edge."""
+        self.position = self.capture.position
+
+    def seek(self, position):
+        """
+        Continue reading from an absolute sample position.
+
+        Positions older than the ring buffer are clamped to the oldest
+        sample still available.
+        """
+        self.position = max(position, self.capture.ring.oldest)
+
+    def read(self, num_samples, timeout=None):
+        """
+        Block until `num_samples` new samples are available and return them.
+
+        Args:
+            num_samples: Number of samples to read
+            timeout: Maximum seconds to wait (default: wait forever)
+
+        Returns:
+            Read-only int16 numpy view into the ring buffer
+        
+        Raises:
+            CaptureStopped: Capture ended before enough audio arrived
+            TimeoutError: No audio within `timeout`
+        """
+        capture = self.capture
+        ring = capture.ring
+        with capture._condition:
+            ready = capture._condition.wait_for(
+                lambda: ring.written >= self.position + num_samples or not capture.is_running,
+                timeout=timeout
+            )
+            if ring.written < self.position + num_samples and not capture.is_running:
+                # Audio captured before a finite source ended is still returned
+                if capture.error is not None:
+                    raise CaptureStopped(f"Audio capture failed: {capture.error}") from capture.error
+                raise CaptureStopped("Audio capture is not running")
+            if not ready:
+                raise TimeoutError(f"No audio within {timeout} seconds")
+
+            if self.position < ring.oldest:
+                # Reader fell behind; skip to the oldest audio still available
+                self.overruns += 1
+                self.position = ring.oldest
+
+            window = ring.view(self.position, num_samples)
+            self.position += num_samples
+            return window
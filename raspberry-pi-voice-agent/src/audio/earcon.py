@@ -0,0 +1,69 @@
+import wave
+import numpy as np
+from .playback import Resampler
+
+
+class Earcon:
+    """
+    Short acknowledgement sound, kept in memory as int16 PCM.
+
+    Played the moment the wake word is heard, so the user knows Genio is
+    listening long before the reply is ready.
+    """
+
+    def __init__(self, samples, rate):
+        """
+        Args:
+            samples: int16 numpy array
+            rate: Sample rate of `samples` in Hz
+        """
+        self.samples = samples
+        self.rate = rate
+        self._resampled = {rate: samples}
+
+    @classmethod
+    def tone(cls, rate=48000, notes=(660.0, 990.0), note_ms=70, volume=0.3):
+        """
+        Build a rising two-note chime.
+
+        Args:
+            rate: Sample rate in Hz (ideally the output device rate)
+            notes: Frequencies in Hz, played one after the other
+            note_ms: Length of each note
+            volume: Peak level, 0.0-1.0
+        """
+        length = int(rate * note_ms / 1000)
+        t = np.arange(length) / rate
+        # Raised-cosine envelope so the notes start and stop without clicks
+        envelope = np.sin(np.pi * np.arange(length) / length) ** 2
+        parts = [np.sin(2 * np.pi * frequency * t) * envelope for frequency in notes]
+        samples = np.concatenate(parts) * volume * 32767
+        return cls(samples.astype(np.int16), rate)
+
+    @classmethod
+    def load(cls, path, volume=1.0):
+        """
+        Load a mono 16-bit WAV clip at any sample rate.
+
+        Args:
+            path: Path to the WAV file
+            volume: Gain applied to the clip
+        """
+        with wave.open(str(path), 'rb') as wf:
+            if wf.getnchannels() != 1 or wf.getsampwidth() != 2:
+                raise ValueError(f"Earcon {path} must be mono 16-bit PCM")
+            samples = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+            rate = wf.getframerate()
+        if volume != 1.0:
+            samples = np.clip(samples * volume, -32768, 32767).astype(np.int16)
+        return cls(samples, rate)
+
+    @property
+    def duration(self):
+        return len(self.samples) / self.rate
+
+    def at_rate(self, rate):
+        """Return the clip at `rate`, resampling only the first time."""
+        if rate not in self._resampled:
+            self._resampled[rate] = Resampler(self.rate, rate).process(self.samples)
+        return self._resampled[rate]
@@ -0,0 +1,121 @@
+import threading
+import numpy as np
+
+
+class EchoCanceller:
+    """
+    Removes our own speech from microphone frames during playback.
+
+    Every block handed to the speaker is resampled to the capture rate
+    and stored at the capture position where it is expected to reach the
+    microphone. While that reference overlaps a microphone frame, the
+    frame is cross-correlated with the reference over a small range of
+    lags and the best-matching reference, scaled by a least-squares gain,
+    is subtracted. What remains is mostly the user's voice, so the wake
+    word detector can keep listening while Genio talks.
+    """
+
+    def __init__(self, capture, delay_ms=60, search_ms=20, capacity_seconds=30):
+        """
+        Initialize the echo canceller.
+
+        Args:
+            capture: Shared AudioCapture whose positions frames are aligned to
+            delay_ms: Expected time from play() until the sound is captured,
+                on top of the output latency passed to play()
+            search_ms: How far around that delay to search for the echo
+            capacity_seconds: Seconds of reference audio kept
+        """
+        self.capture = capture
+        self.rate = capture.rate
+        self.delay = int(self.rate * delay_ms / 1000)
+        self.search = int(self.rate * search_ms / 1000)
+        self.capacity = int(self.rate * capacity_seconds)
+        self._reference = np.zeros(self.capacity, dtype=np.float32)
+        self._end = 0  # Capture position just after the last reference sample
+        self._lock = threading.Lock()
+        self.frames_processed = 0
+
+    def _store(self, position, samples):
+        """Write float32 samples into the circular reference at an absolute position."""
+        samples = samples[-self.capacity:]
+        index = (position + np.arange(len(samples))) % self.capacity
+        self._reference[index] = samples
+
+    def play(self, samples, sample_rate, latency=0.0):
+        """
+        Register audio that is about to be played.
+
+        Args:
+            samples: int16 numpy array sent to the output device
+            sample_rate: Sample rate of `samples` in Hz
+            latency: Output latency of the playback stream in seconds
+        """
+        samples = samples.astype(np.float32)
+        if sample_rate != self.rate and len(samples) > 1:
+            num = int(round(len(samples) * self.rate / sample_rate))
+            samples = np.interp(
+                np.linspace(0, len(samples) - 1, num), np.arange(len(samples)), samples
+            ).astype(np.float32)
+
+        with self._lock:
+            arrival = self.capture.position + self.delay + int(latency * self.rate)
+            if arrival > self._end:
+                # Playback (re)started after a pause: silence in between
+                gap = min(arrival - self._end, self.capacity)
+                self._store(arrival - gap, np.zeros(gap, dtype=np.float32))
+                self._end = arrival
+            # Consecutive blocks play back to back
+            self._store(self._end, samples)
+            self._end += len(samples)
+
+    def cancel(self):
+        """Forget reference audio that will no longer be played."""
+        with self._lock:
+            self._end = min(self._end, self.capture.position + self.delay)
+
+    def active(self, position, length):
+        """True if reference audio overlaps the frame at `position`."""
+        return position - self.search < self._end and length > 0
+
+    def _window(self, start, stop):
+        """Reference between two absolute positions, zeros where there is none."""
+        window = np.zeros(stop - start, dtype=np.float32)
+        first = max(start, self._end - self.capacity, 0)
+        last = min(stop, self._end)
+        if last > first:
+            window[first - start:last - start] = self._reference[np.arange(first, last) % self.capacity]
+        return window
+
+    def process(self, frame, position):
+        """
+        Subtract the echo of our own playback from one microphone frame.
+
+        Args:
+            frame: int16 numpy array captured at absolute `position`
+            position: Capture position of the first sample in `frame`
+
+        Returns:
+            int16 numpy array; `frame` itself when nothing is playing
+        """
+        n = len(frame)
+        if not self.active(position, n):
+            return frame
+
+        with self._lock:
+            reference = self._window(position - self.search, position + n + self.search)
+
+        mic = frame.astype(np.float32)
+        # Correlation and reference energy for every lag in [-search, +search]
+        correlation = np.correlate(reference, mic, mode='valid')
+        squares = np.concatenate(([0.0], np.cumsum(reference * reference, dtype=np.float64)))
+        energy = squares[n:] - squares[:-n]
+        score = np.where(energy > 1.0, correlation * correlation / np.maximum(energy, 1.0), 0.0)
+        lag = int(np.argmax(score))
+        if score[lag] <= 0.0 or correlation[lag] <= 0.0:
+            return frame
+
+        gain = correlation[lag] / energy[lag]
+        self.frames_processed += 1
+        cleaned = mic - gain * reference[lag:lag + n]
+        return np.clip(cleaned, -32768, 32767).astype(np.int16)
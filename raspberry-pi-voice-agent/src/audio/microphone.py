@@ -1,53 +1,203 @@
-import pyaudio
 import wave
+from contextlib import nullcontext
+import numpy as np
+from .capture import RecordingBuffer
+from .sources import PyAudioSource
 
 class Microphone:
-    def __init__(self, rate=16000, chunk=1024, record_seconds=5):
-        self.rate = rate
+    def __init__(self, rate=16000, chunk=1024, record_seconds=5, capture=None, preroll_ms=0, endpointer=None, source=None,
+                 buffers=1, echo_canceller=None):
+        """
+        Args:
+            rate: Sample rate in Hz (ignored when a shared capture is used)
+            chunk: Samples per read
+            record_seconds: Default recording duration in seconds
+            capture: Optional shared AudioCapture. When given, no stream of
+                our own is opened and recordings are read from its ring buffer.
+            preroll_ms: Audio from before the recording start to prepend,
+                so words spoken right after the wake word are kept
+                (requires a shared capture)
+            endpointer: Optional Endpointer. When given, listen() without an
+                explicit duration stops as soon as the speaker stops talking.
+            source: Optional audio.sources.AudioSource to record from when
+                no shared capture is used (default: the sound card)
+            buffers: Recordings that stay valid at once; more than one when
+                recordings are queued for STT while the next one is made
+            echo_canceller: Optional EchoCanceller that removes our own
+                sounds, such as the wake acknowledgement, from recordings
+                from the shared capture
+        """
         self.chunk = chunk
         self.record_seconds = record_seconds
-        self.audio = pyaudio.PyAudio()
-        self.stream = self.audio.open(format=pyaudio.paInt16,
-                                       channels=1,
-                                       rate=self.rate,
-                                       input=True,
-                                       frames_per_buffer=self.chunk)
+        self.capture = capture
+        self.preroll_ms = preroll_ms
+        self.endpointer = endpointer
+        self.echo_canceller = echo_canceller
+        self._start_position = None
+        self._recording = False
+        self.tracer = None  # Optional utils.tracing.Tracer for latency spans
+        if capture is not None:
+            self.rate = capture.rate
+            self.stream = None
+            self.reader = capture.reader()
+        else:
+            self.stream = source if source is not None else PyAudioSource(rate, self.chunk)
+            self.rate = self.stream.rate
+        # Sized for the longest expected command so recording never allocates
+        max_seconds = endpointer.max_seconds if endpointer is not None else record_seconds
+        self.recording = RecordingBuffer(int(self.rate * (max_seconds + preroll_ms / 1000 + 1)), buffers)
 
     def listen(self, duration=None):
         """
         Record audio for a specified duration.
         
         Args:
-            duration: Recording duration in seconds. If None, uses self.record_seconds.
+            duration: Recording duration in seconds. If None, the endpointer
+                decides when to stop, or self.record_seconds is used without one.
         
         Returns:
-            bytes: Recorded audio data
+            Read-only float32 view of the recording, normalized to [-1, 1)
+            as Whisper expects. It is overwritten by later recordings once
+            all `buffers` have been reused.
         """
+        with self.tracer.span('record') if self.tracer else nullcontext():
+            return self._listen(duration)
+
+    def _listen(self, duration):
+        endpointed = duration is None and self.endpointer is not None
         if duration is None:
             duration = self.record_seconds
+        
+        self.recording.start()
+        if self.capture is not None:
+            return self._listen_shared(None if endpointed else duration)
+        if endpointed:
+            return self._listen_endpointed()
             
-        frames = []
         num_chunks = int(self.rate / self.chunk * duration)
         
         try:
             print(f"🎤 Recording for {duration} seconds...")
             for i in range(num_chunks):
-                data = self.stream.read(self.chunk, exception_on_overflow=False)
-                frames.append(data)
+                data = self.stream.read(self.chunk)
+                if not data:
+                    break
+                self.recording.append(np.frombuffer(data, dtype=np.int16))
             print("✅ Recording complete!")
         except KeyboardInterrupt:
             print("⚠️  Recording stopped by user.")
         
-        return b''.join(frames)
+        return self.recording.view()
+
+    def _listen_endpointed(self):
+        """Record from our own stream until the endpointer ends the utterance."""
+        block = self.endpointer.block_length
+        self.endpointer.reset()
+        
+        try:
+            print(f"🎤 Listening (max {self.endpointer.max_seconds} seconds)...")
+            while True:
+                data = self.stream.read(block)
+                if not data:
+                    break
+                samples = np.frombuffer(data, dtype=np.int16)
+                self.recording.append(samples)
+                if self.endpointer.update(samples):
+                    break
+            print(f"✅ Recording complete! ({self.endpointer.reason}, {self.endpointer.elapsed:.1f}s)")
+        except KeyboardInterrupt:
+            print("⚠️  Recording stopped by user.")
+        
+        if self.endpointer.reason == 'no_speech':
+            return self.recording.view()[:0]
+        return self.recording.view()
+
+    def current_recording(self):
+        """
+        Return the audio of the recording in progress.
+        
+        Returns:
+            Read-only float32 view of everything recorded so far, or None if
+            no endpointed recording from the shared capture is running
+        """
+        if not self._recording:
+            return None
+        return self.recording.view()
+
+    def mark_start(self, position):
+        """
+        Anchor the next recording at an absolute capture position.
+
+        Used to start the recording where the wake word ended rather than
+        whenever listen() gets called.
+
+        Args:
+            position: Absolute sample index in the shared capture
+        """
+        self._start_position = position
+
+    def _listen_shared(self, duration):
+        """
+        Record from the shared capture, including the configured pre-roll.
+        
+        Records `duration` seconds, or until the endpointer ends the
+        utterance when duration is None.
+        """
+        start = self._start_position
+        self._start_position = None
+        if start is None:
+            # Skip audio captured while nobody was recording
+            start = self.capture.position
+        preroll = int(self.rate * self.preroll_ms / 1000)
+        self.reader.seek(start - preroll)
+        
+        if duration is None:
+            block = self.endpointer.block_length
+            self.endpointer.reset()
+            print(f"🎤 Listening (max {self.endpointer.max_seconds} seconds)...")
+            self._recording = True
+            try:
+                # The pre-roll is kept but not scored: it ends with the wake
+                # word, so the timers start at the mark instead
+                if self.reader.position < start:
+                    self.recording.append(self._read_shared(start - self.reader.position))
+                while True:
+                    samples = self._read_shared(block)
+                    self.recording.append(samples)
+                    if self.endpointer.update(samples):
+                        break
+            finally:
+                self._recording = False
+            print(f"✅ Recording complete! ({self.endpointer.reason}, {self.endpointer.elapsed:.1f}s)")
+            if self.endpointer.reason == 'no_speech':
+                return self.recording.view()[:0]
+            return self.recording.view()
+        
+        # Record `duration` seconds after the start point, plus whatever pre-roll we got
+        num_samples = start + int(self.rate * duration) - self.reader.position
+        print(f"🎤 Recording for {duration} seconds...")
+        self.recording.append(self._read_shared(num_samples))
+        print("✅ Recording complete!")
+        return self.recording.view()
+
+    def _read_shared(self, num_samples):
+        """Read from the shared capture with our own playback removed."""
+        samples = self.reader.read(num_samples)
+        if self.echo_canceller is not None:
+            samples = self.echo_canceller.process(samples, self.reader.position - len(samples))
+        return samples
 
     def stop(self):
-        self.stream.stop_stream()
+        # A shared capture is owned and stopped by whoever created it
+        if self.stream is None:
+            return
         self.stream.close()
-        self.audio.terminate()
 
     def save(self, filename):
         with wave.open(filename, 'wb') as wf:
             wf.setnchannels(1)
-            wf.setsampwidth(self.audio.get_sample_size(pyaudio.paInt16))
+            wf.setsampwidth(2)  # 16-bit PCM
             wf.setframerate(self.rate)
-            wf.writeframes(self.listen())
\ No newline at end of file
+            # Back to 16-bit PCM; the recording was normalized for Whisper
+            audio = np.clip(self.listen() * 32768.0, -32768, 32767).astype(np.int16)
+            wf.writeframes(audio.tobytes())
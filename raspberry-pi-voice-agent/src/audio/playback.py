@@ -0,0 +1,212 @@
+import threading
+from collections import deque
+import numpy as np
+
+
+class Resampler:
+    """
+    Streaming linear-interpolation resampler between two fixed rates.
+
+    Blocks can be fed one at a time; the phase and the last input sample
+    are carried over, so block boundaries do not click.
+    """
+
+    def __init__(self, from_rate, to_rate):
+        """
+        Args:
+            from_rate: Input sample rate in Hz
+            to_rate: Output sample rate in Hz
+        """
+        self.from_rate = from_rate
+        self.to_rate = to_rate
+        self.step = from_rate / to_rate
+        self._phase = 0.0  # Input position of the next output sample, relative to _tail
+        self._tail = np.zeros(0, dtype=np.float32)
+
+    def process(self, samples):
+        """
+        Resample one block.
+
+        Args:
+            samples: int16 numpy array at from_rate
+
+        Returns:
+            int16 numpy array at to_rate (the input itself when the rates match)
+        """
+        if self.from_rate == self.to_rate:
+            return samples
+        x = np.concatenate((self._tail, samples.astype(np.float32)))
+        n = len(x)
+        if n < 2:
+            self._tail = x
+            return np.zeros(0, dtype=np.int16)
+        positions = np.arange(self._phase, n - 1, self.step)
+        out = np.interp(positions, np.arange(n), x)
+        # The last input sample becomes index 0 of the next block
+        self._phase = (positions[-1] + self.step if len(positions) else self._phase) - (n - 1)
+        self._tail = x[-1:]
+        return np.clip(np.rint(out), -32768, 32767).astype(np.int16)
+
+
+class PlaybackQueue:
+    """
+    int16 PCM blocks waiting for an audio callback.
+
+    Producers put() blocks and are held back once `max_samples` are
+    waiting. The device callback fill()s its buffer from the queue and
+    plays silence when the queue is empty. Running dry while an utterance
+    is still being produced (after its first block was put() and before
+    flush()) is counted as an underrun: the listener hears a gap in the
+    speech. The wait for the first block is latency, not a gap. Short sounds
+    can also be mix()ed over whatever plays next without queueing.
+    """
+
+    def __init__(self, max_samples):
+        """
+        Args:
+            max_samples: Samples that may wait before put() blocks
+        """
+        self.max_samples = max_samples
+        self.queued = 0  # Samples waiting, including the rest of the current block
+        self.active = False  # An utterance has started playing and is not finished
+        self._utterance = False  # Between begin() and flush()/cancel()
+        self.played = 0
+        self.dropped = 0  # Samples thrown away by cancel()
+        self.underruns = 0
+        self.underrun_samples = 0
+        self._blocks = deque()
+        self._offset = 0  # Samples of _blocks[0] already played
+        self._overlays = []  # [samples, samples already played] mixed over the output
+        self._generation = 0
+        self._condition = threading.Condition()
+
+    def begin(self):
+        """Mark the start of an utterance; gaps after its first block are underruns."""
+        with self._condition:
+            self._utterance = True
+            self.active = False
+
+    def put(self, samples, timeout=None):
+        """
+        Queue a block, waiting while the queue is full.
+
+        Args:
+            samples: int16 numpy array
+            timeout: Maximum seconds to wait for room (default: forever)
+
+        Returns:
+            True if queued, False if cancel() was called or the wait timed out
+        """
+        if len(samples) == 0:
+            return True
+        with self._condition:
+            generation = self._generation
+            room = self._condition.wait_for(
+                lambda: self.queued + len(samples) <= self.max_samples or self.queued == 0
+                or self._generation != generation,
+                timeout=timeout
+            )
+            if not room or self._generation != generation:
+                return False
+            self._blocks.append(samples)
+            self.queued += len(samples)
+            self.active = self._utterance
+            return True
+
+    def mix(self, samples):
+        """
+        Overlay samples on the output, starting with the next fill().
+
+        Unlike put(), this never waits behind queued speech and is not
+        affected by cancel().
+
+        Args:
+            samples: int16 numpy array
+        """
+        with self._condition:
+            self._overlays.append([samples, 0])
+
+    def _mix_overlays(self, out):
+        """Add pending overlays to a filled buffer, saturating at 16 bits."""
+        remaining = []
+        for overlay in self._overlays:
+            samples, offset = overlay
+            n = min(len(out), len(samples) - offset)
+            mixed = out[:n].astype(np.int32) + samples[offset:offset + n]
+            np.clip(mixed, -32768, 32767, out=mixed)
+            out[:n] = mixed
+            overlay[1] = offset + n
+            if overlay[1] < len(samples):
+                remaining.append(overlay)
+        self._overlays = remaining
+
+    def fill(self, out):
+        """
+        Copy queued audio into a device buffer, padding with silence.
+
+        Called from the audio callback, so it never blocks on producers.
+
+        Args:
+            out: Writable int16 numpy array to fill completely
+
+        Returns:
+            Number of samples of queued audio written
+        """
+        filled = 0
+        with self._condition:
+            while filled < len(out) and self._blocks:
+                block = self._blocks[0]
+                n = min(len(out) - filled, len(block) - self._offset)
+                out[filled:filled + n] = block[self._offset:self._offset + n]
+                filled += n
+                self._offset += n
+                if self._offset == len(block):
+                    self._blocks.popleft()
+                    self._offset = 0
+            self.queued -= filled
+            self.played += filled
+            if filled < len(out) and self.active:
+                self.underruns += 1
+                self.underrun_samples += len(out) - filled
+            out[filled:] = 0
+            if self._overlays:
+                self._mix_overlays(out)
+            self._condition.notify_all()
+        return filled
+
+    def cancel(self):
+        """Drop everything queued and release producers waiting in put()."""
+        with self._condition:
+            self.dropped += self.queued
+            self._blocks.clear()
+            self._offset = 0
+            self.queued = 0
+            self.active = False
+            self._utterance = False
+            self._generation += 1
+            self._condition.notify_all()
+
+    def flush(self, timeout=None):
+        """
+        End the utterance and wait until everything queued has been played.
+
+        Args:
+            timeout: Maximum seconds to wait (default: forever)
+
+        Returns:
+            True once the queue is empty, False on timeout
+        """
+        with self._condition:
+            self.active = False
+            self._utterance = False
+            return self._condition.wait_for(lambda: self.queued == 0, timeout=timeout)
+
+    def stats(self):
+        with self._condition:
+            return {
+                'queued': self.queued,
+                'played': self.played,
+                'dropped': self.dropped,
+                'underruns': self.underruns,
+                'underrun_samples': self.underrun_samples,
+            }
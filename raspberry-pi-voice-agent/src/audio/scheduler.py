@@ -0,0 +1,236 @@
+import heapq
+import itertools
+import json
+import threading
+import time
+from contextlib import nullcontext
+
+# Higher numbers preempt lower ones
+PRIORITIES = {'info': 0, 'reply': 1, 'alert': 2}
+
+
+def parse_speech_payload(payload):
+    """
+    Read text, priority and TTL from an MQTT payload.
+
+    Plain text is spoken as is; a JSON object may carry "text",
+    "priority" ("alert", "reply" or "info") and "ttl" (seconds).
+
+    Returns:
+        (text, priority, ttl)
+    """
+    try:
+        data = json.loads(payload)
+    except ValueError:
+        data = None
+    if not isinstance(data, dict):
+        return payload, 'info', None
+    priority = data.get('priority', 'info')
+    if priority not in PRIORITIES:
+        raise ValueError(f"Unknown speech priority '{priority}'")
+    ttl = data.get('ttl')
+    return str(data.get('text', '')), priority, float(ttl) if ttl is not None else None
+
+
+class SpeechRequest:
+    """Text waiting to be spoken; wait() for the outcome."""
+
+    def __init__(self, text, priority, ttl=None, trace=None):
+        self.text = text
+        self.priority = priority
+        self.level = PRIORITIES[priority]
+        self.created = time.monotonic()
+        self.deadline = self.created + ttl if ttl else None
+        self.trace = trace
+        # queued, speaking, spoken, preempted, interrupted, expired, dropped or failed
+        self.status = 'queued'
+        self.error = None
+        self._callbacks = []
+        self._done = threading.Event()
+
+    def expired(self, now):
+        return self.deadline is not None and now > self.deadline
+
+    def wait(self, timeout=None):
+        """Block until the request was spoken or dropped, and return its status."""
+        self._done.wait(timeout)
+        return self.status
+
+    def _finish(self, status):
+        self.status = status
+        self._done.set()
+        for callback in self._callbacks:
+            callback(self)
+
+
+class SpeechScheduler:
+    """
+    Single owner of the speaker, serving speech requests by priority.
+
+    Requests are spoken one at a time from one thread: highest priority
+    first, in arrival order within a priority. A request with a higher
+    priority than the speech playing now interrupts it. Identical texts
+    already waiting are merged, and requests still waiting when their
+    TTL runs out are dropped.
+    """
+
+    def __init__(self, speaker, tracer=None, maxsize=16):
+        """
+        Initialize the scheduler and start its thread.
+
+        Args:
+            speaker: Speaker (speak(text), interrupt() and clear_interrupt())
+            tracer: Optional Tracer; spans of the trace active when a
+                request was made are recorded while it is spoken
+            maxsize: Requests that may wait; the lowest-priority, oldest
+                one is dropped beyond that
+        """
+        self.speaker = speaker
+        self.tracer = tracer
+        self.maxsize = maxsize
+        self.counters = {
+            'spoken': 0, 'preempted': 0, 'interrupted': 0, 'expired': 0,
+            'deduplicated': 0, 'dropped': 0, 'failed': 0,
+        }
+        self._heap = []
+        self._order = itertools.count()
+        self._current = None
+        self._cancelled = False  # The current request was preempted or interrupted
+        self._running = True
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name='SpeechScheduler', daemon=True)
+        self._thread.start()
+
+    def say(self, text, priority='reply', ttl=None, on_done=None):
+        """
+        Queue text to be spoken.
+
+        Args:
+            text: Text to speak
+            priority: 'alert', 'reply' or 'info'
+            ttl: Seconds the request may wait before it is dropped (default: no limit)
+            on_done: Optional callable(request) called once it was spoken or dropped
+
+        Returns:
+            SpeechRequest (an earlier identical one when deduplicated)
+        """
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown speech priority '{priority}'")
+        trace = self.tracer.current if self.tracer else None
+        dropped = None
+        with self._condition:
+            request = self._find(text)
+            if request is not None:
+                self.counters['deduplicated'] += 1
+                if PRIORITIES[priority] > request.level:
+                    request.priority, request.level = priority, PRIORITIES[priority]
+                    heapq.heapify(self._heap)
+            else:
+                request = SpeechRequest(text, priority, ttl, trace)
+                heapq.heappush(self._heap, (-request.level, next(self._order), request))
+                if len(self._heap) > self.maxsize:
+                    dropped = self._drop_lowest()
+            if on_done is not None:
+                request._callbacks.append(on_done)
+            current = self._current
+            if current is not None and not self._cancelled and request.level > current.level:
+                self._cancelled = True
+                self.counters['preempted'] += 1
+                current.status = 'preempted'
+                self.speaker.interrupt()
+            self._condition.notify_all()
+        if dropped is not None:
+            dropped._finish('dropped')
+        return request
+
+    def _find(self, text):
+        for _, _, request in self._heap:
+            if request.text == text:
+                return request
+        return None
+
+    def _drop_lowest(self):
+        """Remove the lowest-priority, oldest waiting request."""
+        lowest = min(self._heap, key=lambda item: (-item[0], item[1]))
+        self._heap.remove(lowest)
+        heapq.heapify(self._heap)
+        self.counters['dropped'] += 1
+        return lowest[2]
+
+    def interrupt(self, keep='alert'):
+        """
+        Barge-in: stop the speech playing now and drop waiting requests below `keep`.
+
+        Returns:
+            True if speech was playing
+        """
+        with self._condition:
+            dropped = [request for _, _, request in self._heap if request.level < PRIORITIES[keep]]
+            self._heap = [item for item in self._heap if item[2].level >= PRIORITIES[keep]]
+            heapq.heapify(self._heap)
+            self.counters['dropped'] += len(dropped)
+            current = self._current
+            if current is not None and not self._cancelled:
+                self._cancelled = True
+                self.counters['interrupted'] += 1
+                current.status = 'interrupted'
+                self.speaker.interrupt()
+        for request in dropped:
+            request._finish('dropped')
+        return current is not None
+
+    def _next(self):
+        """Wait for the next request that has not expired; None once stopped."""
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._heap or not self._running)
+                if not self._running:
+                    return None
+                _, _, request = heapq.heappop(self._heap)
+                if not request.expired(time.monotonic()):
+                    # Before publishing it, so a preemption from here on sticks
+                    self.speaker.clear_interrupt()
+                    self._current = request
+                    self._cancelled = False
+                    request.status = 'speaking'
+                    return request
+                self.counters['expired'] += 1
+            request._finish('expired')
+
+    def _run(self):
+        while True:
+            request = self._next()
+            if request is None:
+                return
+            try:
+                with self.tracer.activate(request.trace) if self.tracer else nullcontext():
+                    self.speaker.speak(request.text)
+            except Exception as e:
+                request.error = e
+            with self._condition:
+                self._current = None
+                if request.error is not None:
+                    status = 'failed'
+                elif self._cancelled:
+                    status = request.status  # preempted or interrupted
+                else:
+                    status = 'spoken'
+                if status in ('spoken', 'failed'):
+                    self.counters[status] += 1
+            request._finish(status)
+
+    @property
+    def depth(self):
+        with self._condition:
+            return len(self._heap)
+
+    def stop(self):
+        """Stop after the current request; waiting requests are dropped."""
+        with self._condition:
+            self._running = False
+            dropped = [request for _, _, request in self._heap]
+            self._heap = []
+            self._condition.notify_all()
+        for request in dropped:
+            request._finish('dropped')
+        self._thread.join(timeout=1.0)
@@ -0,0 +1,355 @@
+import os
+import sys
+import time
+import wave
+import socket
+import threading
+from pathlib import Path
+from .playback import PlaybackQueue, Resampler
+from .sources import unix_socket
+
+
+class AudioSink:
+    """
+    Where synthesized speech goes.
+
+    Each utterance is played as open(sample_rate), any number of blocking
+    write() calls with int16 mono numpy blocks, then close(), which waits
+    until the audio has been played. abort() drops whatever is still
+    buffered; close() must still be called afterwards. Sinks that keep a
+    device open between utterances acquire it in start() and release it
+    in shutdown().
+    """
+
+    latency = 0.0  # Seconds from write() until the audio is heard
+
+    def start(self):
+        pass
+
+    def open(self, sample_rate):
+        self.sample_rate = sample_rate
+
+    def write(self, samples):
+        raise NotImplementedError
+
+    def abort(self):
+        pass
+
+    def close(self):
+        pass
+
+    def shutdown(self):
+        pass
+
+    def mix(self, samples, sample_rate):
+        """
+        Play a short sound over the output right away, if the sink can.
+
+        Returns:
+            Seconds until it is heard, or None if the sink cannot mix
+        """
+        return None
+
+    def stats(self):
+        return {}
+
+
+class NullSink(AudioSink):
+    """Discards audio; for benchmarks and load tests."""
+
+    def write(self, samples):
+        pass
+
+
+class SoundDeviceSink(AudioSink):
+    """
+    Sound card output through one long-lived sounddevice stream.
+
+    Opening a PortAudio stream per utterance costs 50-150 ms and clicks on
+    USB speakers, so the stream is opened once and keeps running: its
+    callback pulls blocks from a PlaybackQueue and plays silence between
+    utterances. Speech is resampled once, from the voice's rate to the
+    device rate, as it is queued.
+    """
+
+    def __init__(self, device=None, rate=None, blocksize=256, max_queued_seconds=0.5):
+        """
+        Args:
+            device: sounddevice output device (default: system default)
+            rate: Device sample rate in Hz (default: the device's default rate)
+            blocksize: Samples per callback; smaller means lower latency
+            max_queued_seconds: Audio that may wait in the queue before
+                write() blocks, which bounds how late barge-in can stop speech
+        """
+        self.device = device
+        self.rate = rate
+        self.blocksize = blocksize
+        self.max_queued_seconds = max_queued_seconds
+        self.queue = None
+        self.device_underflows = 0  # Callbacks PortAudio reported as late
+        self._stream = None
+        self._resampler = None
+
+    @property
+    def latency(self):
+        if self._stream is None:
+            return 0.0
+        # Audio written now plays after everything already queued
+        return self._stream.latency + self.queue.queued / self.rate
+
+    def start(self):
+        """Open and start the output stream; later calls do nothing."""
+        if self._stream is not None:
+            return
+        # Imported here so other sinks work on machines without PortAudio
+        import sounddevice as sd
+
+        if not self.rate:
+            self.rate = int(sd.query_devices(self.device, 'output')['default_samplerate'])
+        self.queue = PlaybackQueue(int(self.rate * self.max_queued_seconds))
+        self._stream = sd.OutputStream(
+            samplerate=self.rate, channels=1, dtype='int16', device=self.device,
+            blocksize=self.blocksize, latency='low', callback=self._callback
+        )
+        self._stream.start()
+
+    def _callback(self, outdata, frames, time_info, status):
+        if status.output_underflow:
+            self.device_underflows += 1
+        self.queue.fill(outdata[:, 0])
+
+    def open(self, sample_rate):
+        self.start()
+        self.sample_rate = sample_rate
+        self._resampler = Resampler(sample_rate, self.rate)
+        self.queue.begin()
+
+    def enqueue(self, samples):
+        """
+        Queue int16 samples at the voice's rate, waiting while the queue is full.
+
+        Returns:
+            False if the queue was cancelled while waiting
+        """
+        return self.queue.put(self._resampler.process(samples))
+
+    def mix(self, samples, sample_rate):
+        """Overlay a short sound, e.g. an Earcon, from the next callback on."""
+        self.start()
+        if sample_rate != self.rate:
+            samples = Resampler(sample_rate, self.rate).process(samples)
+        self.queue.mix(samples)
+        return self._stream.latency
+
+    def cancel(self):
+        """Stop playback immediately and drop everything queued."""
+        if self.queue is not None:
+            self.queue.cancel()
+
+    def flush(self, timeout=None):
+        """
+        Wait until everything queued has been heard.
+
+        Returns:
+            False if the queue did not drain within `timeout` seconds
+        """
+        if self.queue is None:
+            return True
+        if timeout is None:
+            # Never hang on a stalled device
+            timeout = self.queue.queued / self.rate + 1.0
+        drained = self.queue.flush(timeout)
+        if drained:
+            time.sleep(self._stream.latency)
+        return drained
+
+    write = enqueue
+    abort = cancel
+
+    def close(self):
+        self.flush()
+
+    def shutdown(self):
+        if self._stream is not None:
+            self.cancel()
+            self._stream.stop()
+            self._stream.close()
+            self._stream = None
+
+    def stats(self):
+        if self.queue is None:
+            return {}
+        return dict(self.queue.stats(), device_underflows=self.device_underflows)
+
+
+class WavSink(AudioSink):
+    """
+    Writes every utterance to a WAV file.
+
+    With a directory, utterances go to numbered files in it; with a file
+    path, each utterance overwrites that file.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.count = 0
+        self.last_file = None
+        self._wav = None
+
+    def open(self, sample_rate):
+        self.sample_rate = sample_rate
+        self.count += 1
+        if self.path.is_dir() or not self.path.suffix:
+            self.path.mkdir(parents=True, exist_ok=True)
+            self.last_file = self.path / f"utterance-{self.count:04d}.wav"
+        else:
+            self.last_file = self.path
+        self._wav = wave.open(str(self.last_file), 'wb')
+        self._wav.setnchannels(1)
+        self._wav.setsampwidth(2)
+        self._wav.setframerate(sample_rate)
+
+    def write(self, samples):
+        self._wav.writeframes(samples.tobytes())
+
+    def close(self):
+        if self._wav is not None:
+            self._wav.close()
+            self._wav = None
+
+
+class _RawSink(AudioSink):
+    """Raw PCM to a byte stream. Readers must know the voice's sample rate."""
+
+    def _write(self, data):
+        raise NotImplementedError
+
+    def write(self, samples):
+        # Blocks from Piper and the cache are contiguous, so no copy is needed
+        self._write(memoryview(samples).cast('B'))
+
+
+class PipeSink(_RawSink):
+    """Raw PCM to a pipe or file, e.g. `genio | aplay -t raw -f S16_LE -r 22050`."""
+
+    def __init__(self, stream=None):
+        """
+        Args:
+            stream: Binary file object (default: stdout)
+        """
+        self.stream = stream if stream is not None else sys.stdout.buffer
+
+    def _write(self, data):
+        self.stream.write(data)
+
+    def close(self):
+        self.stream.flush()
+
+
+class UnixSocketSink(_RawSink):
+    """
+    Raw PCM to another local process over a UNIX socket.
+
+    The consumer is connected in open(), not in the middle of a write, and
+    is dropped when it goes away, so the next utterance waits for a new
+    one instead of failing until restart. Listening sinks create the
+    socket in start() and keep it until shutdown().
+    """
+
+    def __init__(self, path, listen=True):
+        """
+        Args:
+            path: Socket path
+            listen: Create the socket and wait for the consumer to connect
+                (default), or connect to a socket the consumer created
+        """
+        self.path = path
+        self.listen = listen
+        self._server = None
+        self._sock = None
+        self._aborted = threading.Event()
+
+    def start(self):
+        """Create the listening socket, so the consumer can connect ahead of the first reply."""
+        if not self.listen or self._server is not None:
+            return
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(self.path)
+        server.listen(1)
+        # accept() wakes up regularly so abort() can end the wait
+        server.settimeout(0.1)
+        self._server = server
+
+    def open(self, sample_rate):
+        self.sample_rate = sample_rate
+        if self._sock is not None:
+            return
+        if not self.listen:
+            self._sock = unix_socket(self.path, listen=False)
+            return
+        self.start()
+        while not self._aborted.is_set():
+            try:
+                sock, _ = self._server.accept()
+            except socket.timeout:
+                continue
+            sock.settimeout(None)
+            self._sock = sock
+            return
+
+    def _write(self, data):
+        if self._sock is None:
+            return  # Aborted before a consumer connected
+        try:
+            self._sock.sendall(data)
+        except OSError:
+            # The consumer went away; the next utterance waits for another
+            self._disconnect()
+            raise
+
+    def _disconnect(self):
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def abort(self):
+        self._aborted.set()
+
+    def close(self):
+        self._aborted.clear()
+
+    def shutdown(self):
+        self._aborted.set()
+        self._disconnect()
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+
+
+def open_sink(spec):
+    """
+    Create an audio sink from its config.yaml description.
+
+    Args:
+        spec: "device", "device:<name or index>", "wav:<file or directory>",
+            "stdout", "unix:<path>" (we listen), "unix-connect:<path>" or "null"
+
+    Returns:
+        AudioSink
+    """
+    kind, _, arg = (spec or 'device').partition(':')
+    if kind == 'device':
+        return SoundDeviceSink(int(arg) if arg.isdigit() else (arg or None))
+    if kind == 'wav':
+        return WavSink(arg)
+    if kind == 'stdout':
+        return PipeSink()
+    if kind in ('unix', 'unix-connect'):
+        return UnixSocketSink(arg, listen=(kind == 'unix'))
+    if kind == 'null':
+        return NullSink()
+    raise ValueError(f"Unknown audio sink '{spec}'")
@@ -0,0 +1,284 @@
+import os
+import sys
+import time
+import wave
+import socket
+import threading
+import numpy as np
+from pathlib import Path
+
+
+def read_wav(path, rate=16000):
+    """
+    Read a 16-bit mono WAV file.
+
+    Args:
+        path: Path to the WAV file
+        rate: Required sample rate in Hz
+
+    Returns:
+        int16 numpy array
+    """
+    with wave.open(str(path), 'rb') as wf:
+        if wf.getframerate() != rate or wf.getnchannels() != 1 or wf.getsampwidth() != 2:
+            raise ValueError(f"{Path(path).name} must be {rate} Hz mono 16-bit PCM")
+        return np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+
+
+def unix_socket(path, listen):
+    """
+    Open a connected UNIX stream socket.
+
+    Args:
+        path: Socket path
+        listen: Create the socket and wait for one peer to connect,
+            instead of connecting to a socket someone else created
+
+    Returns:
+        Connected socket
+    """
+    if not listen:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(path)
+        return sock
+    if os.path.exists(path):
+        os.unlink(path)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    server.listen(1)
+    try:
+        sock, _ = server.accept()
+    finally:
+        server.close()
+        os.unlink(path)
+    return sock
+
+
+class AudioSource:
+    """
+    Where microphone audio comes from.
+
+    A source delivers 16-bit mono PCM at `rate`. read() blocks like a
+    device would and returns bytes (or a memoryview) holding up to
+    `num_samples` samples, or b'' when the source has ended.
+    """
+
+    rate = 16000
+
+    def read(self, num_samples):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class PyAudioSource(AudioSource):
+    """Sound card input through PyAudio (ALSA on the Pi)."""
+
+    def __init__(self, rate=16000, frame_length=512, device_index=None):
+        """
+        Args:
+            rate: Sample rate in Hz
+            frame_length: Samples per device buffer
+            device_index: PyAudio input device index (default: system default)
+        """
+        # Imported here so other sources work without PyAudio installed
+        import pyaudio
+
+        self.rate = rate
+        self._pa = pyaudio.PyAudio()
+        self._stream = self._pa.open(
+            rate=rate,
+            channels=1,
+            format=pyaudio.paInt16,
+            input=True,
+            frames_per_buffer=frame_length,
+            input_device_index=device_index
+        )
+
+    def read(self, num_samples):
+        return self._stream.read(num_samples, exception_on_overflow=False)
+
+    def close(self):
+        if self._stream is not None:
+            self._stream.stop_stream()
+            self._stream.close()
+            self._stream = None
+        if self._pa is not None:
+            self._pa.terminate()
+            self._pa = None
+
+
+class _RawSource(AudioSource):
+    """Raw PCM from a byte stream, read into one reused buffer."""
+
+    def __init__(self, rate=16000):
+        self.rate = rate
+        self._buffer = bytearray()
+
+    def _readinto(self, view):
+        """Fill part of `view`; return the number of bytes read, 0 at end of stream."""
+        raise NotImplementedError
+
+    def read(self, num_samples):
+        size = num_samples * 2
+        if len(self._buffer) != size:
+            self._buffer = bytearray(size)
+        view = memoryview(self._buffer)
+        filled = 0
+        while filled < size:
+            n = self._readinto(view[filled:])
+            if not n:
+                break
+            filled += n
+        # A stream can end in the middle of a sample
+        return view[:filled - filled % 2]
+
+
+class PipeSource(_RawSource):
+    """Raw PCM from a pipe or file, e.g. `arecord -t raw -f S16_LE -r 16000 | genio`."""
+
+    def __init__(self, stream=None, rate=16000):
+        """
+        Args:
+            stream: Binary file object (default: stdin)
+            rate: Sample rate of the incoming PCM in Hz
+        """
+        super().__init__(rate)
+        self.stream = stream if stream is not None else sys.stdin.buffer
+
+    def _readinto(self, view):
+        return self.stream.readinto(view)
+
+    def close(self):
+        if self.stream is not sys.stdin.buffer:
+            self.stream.close()
+
+
+class UnixSocketSource(_RawSource):
+    """Raw PCM from another local process over a UNIX socket."""
+
+    def __init__(self, path, listen=True, rate=16000):
+        """
+        Args:
+            path: Socket path
+            listen: Create the socket and wait for the producer to connect
+                (default), or connect to a socket the producer created
+            rate: Sample rate of the incoming PCM in Hz
+        """
+        super().__init__(rate)
+        self.path = path
+        self.listen = listen
+        self._sock = None
+
+    def _readinto(self, view):
+        if self._sock is None:
+            self._sock = unix_socket(self.path, self.listen)
+        return self._sock.recv_into(view)
+
+    def close(self):
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+
+class WavSource(AudioSource):
+    """
+    Replays WAV files in place of a microphone.
+
+    The files are played back to back with silence in between, at real
+    time (speed=1.0) or faster, so the rest of the pipeline sees the same
+    frame cadence as from a live device. `starts` holds the capture
+    position where each file begins.
+    """
+
+    def __init__(self, paths, rate=16000, gap_seconds=1.5, tail_seconds=3.0, speed=1.0, paused=False):
+        """
+        Initialize the source.
+
+        Args:
+            paths: WAV files to play, in order
+            rate: Sample rate in Hz (files must match)
+            gap_seconds: Silence before each file
+            tail_seconds: Silence after the last file
+            speed: Playback speed relative to real time, 0 for as fast as possible
+            paused: Hold back all audio until play() is called, e.g. until
+                every engine has loaded
+        """
+        self.rate = rate
+        self.speed = speed
+        self.names = [Path(path).stem for path in paths]
+        gap = np.zeros(int(rate * gap_seconds), dtype=np.int16)
+        parts, self.starts, self.durations = [], [], []
+        position = 0
+        for path in paths:
+            audio = read_wav(path, rate)
+            parts += [gap, audio]
+            self.starts.append(position + len(gap))
+            self.durations.append(len(audio) / rate)
+            position += len(gap) + len(audio)
+        parts.append(np.zeros(int(rate * tail_seconds), dtype=np.int16))
+        self._audio = np.concatenate(parts) if parts else np.zeros(0, dtype=np.int16)
+        self.position = 0
+        self._t0 = None
+        self._playing = threading.Event()
+        if not paused:
+            self._playing.set()
+
+    def play(self):
+        """Start (or resume) delivering audio."""
+        self._playing.set()
+
+    @property
+    def total_seconds(self):
+        return len(self._audio) / self.rate
+
+    def read(self, num_samples):
+        """
+        Return the next `num_samples` samples as bytes, pacing to `speed`.
+
+        Returns:
+            bytes, or b'' once every file has been played
+        """
+        self._playing.wait()
+        if self._t0 is None:
+            self._t0 = time.monotonic()
+        block = self._audio[self.position:self.position + num_samples]
+        self.position += len(block)
+        if self.speed > 0:
+            due = self._t0 + self.position / self.rate / self.speed
+            delay = due - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        return block.tobytes()
+
+    def close(self):
+        self.position = len(self._audio)
+        self._playing.set()
+
+
+def open_source(spec, rate=16000, frame_length=512):
+    """
+    Create an audio source from its config.yaml description.
+
+    Args:
+        spec: "device", "device:<index>", "wav:<file or directory>",
+            "stdin", "unix:<path>" (we listen) or "unix-connect:<path>"
+        rate: Sample rate in Hz
+        frame_length: Samples per device buffer
+
+    Returns:
+        AudioSource
+    """
+    kind, _, arg = (spec or 'device').partition(':')
+    if kind == 'device':
+        return PyAudioSource(rate, frame_length, int(arg) if arg else None)
+    if kind == 'wav':
+        path = Path(arg)
+        paths = sorted(path.glob('*.wav')) if path.is_dir() else [path]
+        return WavSource(paths, rate=rate)
+    if kind == 'stdin':
+        return PipeSource(rate=rate)
+    if kind in ('unix', 'unix-connect'):
+        return UnixSocketSource(arg, listen=(kind == 'unix'), rate=rate)
+    raise ValueError(f"Unknown audio source '{spec}'")
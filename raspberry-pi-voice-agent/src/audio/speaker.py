@@ -1,7 +1,63 @@
 class Speaker:
-    def __init__(self, tts_engine):
+    """
+    Plays speech from a TTS engine on an audio sink.
+
+    The speaker owns the sink: for the sound card that is one output
+    stream, opened by start() and kept open until close(), so replies do
+    not pay for stream setup.
+    """
+
+    def __init__(self, tts_engine, sink=None):
+        """
+        Args:
+            tts_engine: PiperTTS (or anything with speak() and interrupt())
+            sink: audio.sinks.AudioSink to play on (default: the engine's own)
+        """
         self.tts_engine = tts_engine
+        if sink is not None:
+            tts_engine.sink = sink
+        self.sink = getattr(tts_engine, 'sink', None)  # Stub engines have none
+
+    def start(self):
+        """Open the output device ahead of the first reply."""
+        if self.sink is not None:
+            self.sink.start()
+
+    def speak(self, text, stream=True):
+        self.tts_engine.speak(text, stream=stream)
+
+    def interrupt(self):
+        self.tts_engine.interrupt()
+
+    def clear_interrupt(self):
+        self.tts_engine.clear_interrupt()
+
+    def acknowledge(self, earcon):
+        """
+        Play an earcon over the open output stream without waiting for it.
+
+        Args:
+            earcon: audio.earcon.Earcon
+
+        Returns:
+            Seconds until it is heard, or None if the sink cannot mix
+        """
+        if self.sink is None:
+            return None
+        rate = getattr(self.sink, 'rate', None) or earcon.rate
+        return self.sink.mix(earcon.at_rate(rate), rate)
+
+    def flush(self, timeout=None):
+        """Wait until queued audio has been played."""
+        if self.sink is not None and hasattr(self.sink, 'flush'):
+            return self.sink.flush(timeout)
+        return True
+
+    def stats(self):
+        """Playback counters of the sink, e.g. underruns."""
+        return self.sink.stats() if self.sink is not None else {}
 
-    def speak(self, text):
-        self.tts_engine.synthesize(text)
-        self.tts_engine.play()
\ No newline at end of file
+    def close(self):
+        """Release the output device."""
+        if self.sink is not None:
+            self.sink.shutdown()
@@ -0,0 +1,131 @@
+import numpy as np
+
+
+class EnergyVAD:
+    """
+    Frame-energy voice activity detector.
+
+    Classifies fixed-size frames of int16 audio as speech or silence by
+    their level in dBFS, computed for a whole block at once with numpy.
+    The threshold adapts to the background noise floor so a fan or a
+    quiet room does not need retuning.
+    """
+
+    def __init__(self, rate=16000, frame_ms=30, threshold_db=-45.0, noise_margin_db=10.0):
+        """
+        Initialize the detector.
+
+        Args:
+            rate: Sample rate in Hz
+            frame_ms: Frame length in milliseconds (default: 30)
+            threshold_db: Minimum frame level in dBFS counted as speech
+            noise_margin_db: How far above the noise floor speech must be
+        """
+        self.rate = rate
+        self.frame_length = int(rate * frame_ms / 1000)
+        self.threshold_db = threshold_db
+        self.noise_margin_db = noise_margin_db
+        self.noise_floor_db = None
+
+    def frame_levels(self, samples):
+        """Return the level in dBFS of every complete frame in `samples`."""
+        num_frames = len(samples) // self.frame_length
+        frames = samples[:num_frames * self.frame_length].reshape(num_frames, self.frame_length)
+        power = np.mean(np.square(frames, dtype=np.float32), axis=1) / (32768.0 * 32768.0)
+        return 10.0 * np.log10(power + 1e-10)
+
+    def is_speech(self, samples):
+        """
+        Classify every complete frame in `samples`.
+
+        Args:
+            samples: int16 numpy array
+
+        Returns:
+            Boolean numpy array with one entry per frame
+        """
+        levels = self.frame_levels(samples)
+        if len(levels) == 0:
+            return np.zeros(0, dtype=bool)
+
+        if self.noise_floor_db is None:
+            # Never start above the fixed threshold: the first frames may
+            # already be speech, which would make later speech look quiet
+            self.noise_floor_db = min(float(levels.min()), self.threshold_db - self.noise_margin_db)
+        threshold = max(self.threshold_db, self.noise_floor_db + self.noise_margin_db)
+        speech = levels > threshold
+
+        # Track the noise floor from frames that are not speech
+        if not speech.all():
+            quiet = float(levels[~speech].mean())
+            self.noise_floor_db = 0.9 * self.noise_floor_db + 0.1 * quiet
+        return speech
+
+
+class Endpointer:
+    """
+    Decides when an utterance is over.
+
+    Feed recorded blocks to update(); it returns True once the speaker
+    has stopped for `trailing_silence_ms`, nobody started speaking within
+    `start_timeout` seconds, or `max_seconds` of audio was recorded.
+    Only audio from the start of the recording should be fed: pre-roll
+    still holds the end of the wake word and would count as speech.
+    """
+
+    def __init__(self, vad, start_timeout=3.0, trailing_silence_ms=700, max_seconds=8.0):
+        """
+        Initialize the endpointer.
+
+        Args:
+            vad: EnergyVAD used to classify frames
+            start_timeout: Seconds to wait for speech to begin
+            trailing_silence_ms: Silence after speech that ends the utterance
+            max_seconds: Hard limit on recording length
+        """
+        self.vad = vad
+        self.start_timeout = start_timeout
+        self.trailing_silence = trailing_silence_ms / 1000.0
+        self.max_seconds = max_seconds
+        self.reset()
+
+    def reset(self):
+        """Prepare for a new utterance."""
+        self.elapsed = 0.0
+        self.silence = 0.0
+        self.speech_started = False
+        self.reason = None
+
+    @property
+    def block_length(self):
+        """Samples per block to feed to update() (a whole number of VAD frames)."""
+        return self.vad.frame_length
+
+    def update(self, samples):
+        """
+        Process the next block of audio.
+
+        Args:
+            samples: int16 numpy array, ideally a multiple of the VAD frame length
+
+        Returns:
+            True when the utterance has ended (see `reason`)
+        """
+        speech = self.vad.is_speech(samples)
+        frame_seconds = self.vad.frame_length / self.vad.rate
+        self.elapsed += len(samples) / self.vad.rate
+
+        if speech.any():
+            self.speech_started = True
+            last_speech = len(speech) - 1 - int(np.argmax(speech[::-1]))
+            self.silence = (len(speech) - 1 - last_speech) * frame_seconds
+        elif self.speech_started:
+            self.silence += len(speech) * frame_seconds
+
+        if self.speech_started and self.silence >= self.trailing_silence:
+            self.reason = 'end_of_speech'
+        elif not self.speech_started and self.elapsed >= self.start_timeout:
+            self.reason = 'no_speech'
+        elif self.elapsed >= self.max_seconds:
+            self.reason = 'max_duration'
+        return self.reason is not None
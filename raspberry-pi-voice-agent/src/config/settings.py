@@ -8,9 +8,16 @@ config_file = Path(__file__).parent.parent.parent / 'config' / 'config.yaml'
 with open(config_file, 'r') as f:
     config = yaml.safe_load(f)
 
+# Board-specific STT decoding profile written by genio-tune-stt overrides the stt section
+STT_PROFILE_FILE = config_file.parent / 'stt_profile.yaml'
+if STT_PROFILE_FILE.exists():
+    with open(STT_PROFILE_FILE, 'r') as f:
+        config.setdefault('stt', {}).update((yaml.safe_load(f) or {}).get('stt', {}))
+
 # Porcupine Wake Word settings
+WAKE_WORD_ENABLED = config.get('wakeword_detection', {}).get('enabled', True)
 PORCUPINE_ACCESS_KEY = config.get('wakeword_detection', {}).get('access_key', '')
-if not PORCUPINE_ACCESS_KEY or PORCUPINE_ACCESS_KEY == "YOUR_PORCUPINE_ACCESS_KEY_HERE":
+if WAKE_WORD_ENABLED and (not PORCUPINE_ACCESS_KEY or PORCUPINE_ACCESS_KEY == "YOUR_PORCUPINE_ACCESS_KEY_HERE"):
     print("⚠️  VARNING: PORCUPINE_ACCESS_KEY är inte konfigurerad!")
     print("   Lägg till i config/config.yaml")
     print("   Skaffa gratis key: https://console.picovoice.ai/")
@@ -18,21 +25,41 @@ if not PORCUPINE_ACCESS_KEY or PORCUPINE_ACCESS_KEY == "YOUR_PORCUPINE_ACCESS_KE
 WAKE_WORD = config.get('wakeword_detection', {}).get('keyword', 'porcupine')
 WAKE_WORD_MODEL_PATH = config.get('wakeword_detection', {}).get('model_path', '')
 WAKE_WORD_SENSITIVITY = config.get('wakeword_detection', {}).get('sensitivity', 0.5)
+WAKE_WORD_DIRECT_PROCESS = config.get('wakeword_detection', {}).get('direct_process', False)
 
 # Speech-to-Text settings
+STT_ENABLED = config.get('stt', {}).get('enabled', True)
 STT_MODEL_SIZE = config.get('stt', {}).get('model_size', 'base')
 STT_LANGUAGE = config.get('stt', {}).get('language', 'sv')
 # Legacy support for model_path (if someone still uses it)
 STT_MODEL_PATH = config.get('stt', {}).get('model_path', STT_MODEL_SIZE)
 STT_MODEL = STT_MODEL_SIZE  # Alias for backward compatibility
+STT_COMPUTE_TYPE = config.get('stt', {}).get('compute_type', 'default')
+STT_CPU_THREADS = config.get('stt', {}).get('cpu_threads', 0)
+STT_NUM_WORKERS = config.get('stt', {}).get('num_workers', 1)
+STT_BEAM_SIZE = config.get('stt', {}).get('beam_size', 5)
+STT_BEST_OF = config.get('stt', {}).get('best_of', 5)
+STT_TEMPERATURE = config.get('stt', {}).get('temperature', [0.0, 0.2, 0.4, 0.6, 0.8, 1.0])
+STT_CONDITION_ON_PREVIOUS_TEXT = config.get('stt', {}).get('condition_on_previous_text', True)
+STT_STREAMING_ENABLED = config.get('stt', {}).get('streaming', {}).get('enabled', True)
+STT_STREAMING_INTERVAL = config.get('stt', {}).get('streaming', {}).get('interval', 1.0)
+STT_PARTIAL_TOPIC = config.get('stt', {}).get('streaming', {}).get('partial_topic', 'genio/transcript/partial')
 
 # Text-to-Speech settings
+TTS_ENABLED = config.get('tts', {}).get('enabled', True)
 TTS_ENGINE = config.get('tts', {}).get('engine', 'piper')
 TTS_LANGUAGE = config.get('tts', {}).get('language', 'sv')
 TTS_VOICE = config.get('tts', {}).get('voice', 'sv_SE-nst-medium')
 TTS_MODEL_PATH = config.get('tts', {}).get('model_path', 'models/sv_SE-nst-medium.onnx')
 TTS_CONFIG_PATH = config.get('tts', {}).get('config_path', 'models/sv_SE-nst-medium.onnx.json')
 TTS_MODEL = TTS_MODEL_PATH  # Alias for backward compatibility
+TTS_VOICES = config.get('tts', {}).get('voices', {}) or {}  # name -> {model_path, config_path, speaker, length_scale, ...}
+TTS_PRELOAD_VOICES = config.get('tts', {}).get('preload_voices', True)
+TTS_VOICE_TOPIC = config.get('tts', {}).get('voice_topic', 'genio/voice')
+TTS_CACHE_ENABLED = config.get('tts', {}).get('cache', {}).get('enabled', True)
+TTS_CACHE_MEMORY_MB = config.get('tts', {}).get('cache', {}).get('memory_mb', 16)
+TTS_CACHE_DIR = config.get('tts', {}).get('cache', {}).get('dir', 'cache/tts')
+TTS_CACHE_DISK_MB = config.get('tts', {}).get('cache', {}).get('disk_mb', 256)
 
 # MQTT settings
 MQTT_BROKER = config.get('mqtt', {}).get('broker', 'mqtt.example.com')
@@ -42,6 +69,9 @@ MQTT_CLIENT_ID = config.get('mqtt', {}).get('client_id', 'genio_ai')
 MQTT_USERNAME = config.get('mqtt', {}).get('username', '')
 MQTT_PASSWORD = config.get('mqtt', {}).get('password', '')
 MQTT_USE_TLS = config.get('mqtt', {}).get('use_tls', True)
+MQTT_WORKERS = config.get('mqtt', {}).get('workers', 2)
+MQTT_QUEUE_SIZE = config.get('mqtt', {}).get('queue_size', 8)
+MQTT_OVERFLOW_POLICY = config.get('mqtt', {}).get('overflow', 'drop_oldest')
 
 # Warn about placeholder values
 if MQTT_BROKER in ["YOUR_MQTT_BROKER_ADDRESS", "mqtt.example.com"]:
@@ -53,6 +83,32 @@ if MQTT_USERNAME in ["YOUR_MQTT_USERNAME", ""] or MQTT_PASSWORD in ["YOUR_MQTT_P
 
 # Audio settings
 AUDIO_RECORD_SECONDS = config.get('audio', {}).get('record_seconds', 5)
+AUDIO_PREROLL_MS = config.get('audio', {}).get('preroll_ms', 400)
+AUDIO_SOURCE = config.get('audio', {}).get('source', 'device')
+AUDIO_SINK = config.get('audio', {}).get('sink', 'device')
+VAD_ENABLED = config.get('audio', {}).get('vad', {}).get('enabled', True)
+VAD_THRESHOLD_DB = config.get('audio', {}).get('vad', {}).get('threshold_db', -45.0)
+VAD_START_TIMEOUT = config.get('audio', {}).get('vad', {}).get('start_timeout', 3.0)
+VAD_TRAILING_SILENCE_MS = config.get('audio', {}).get('vad', {}).get('trailing_silence_ms', 700)
+VAD_MAX_SECONDS = config.get('audio', {}).get('vad', {}).get('max_seconds', 8.0)
+BARGE_IN_ENABLED = config.get('audio', {}).get('barge_in', {}).get('enabled', True)
+BARGE_IN_ECHO_DELAY_MS = config.get('audio', {}).get('barge_in', {}).get('echo_delay_ms', 60)
+BARGE_IN_ECHO_SEARCH_MS = config.get('audio', {}).get('barge_in', {}).get('echo_search_ms', 20)
+EARCON_ENABLED = config.get('audio', {}).get('earcon', {}).get('enabled', True)
+EARCON_FILE = config.get('audio', {}).get('earcon', {}).get('file', '')
+EARCON_VOLUME = config.get('audio', {}).get('earcon', {}).get('volume', 0.3)
+
+# Pipeline settings
+PIPELINE_ASYNC = config.get('pipeline', {}).get('async', True)
+PIPELINE_QUEUE_SIZE = config.get('pipeline', {}).get('queue_size', 2)
+PIPELINE_STATS_INTERVAL = config.get('pipeline', {}).get('stats_interval', 30)
+
+# Latency tracing settings
+TRACING_ENABLED = config.get('tracing', {}).get('enabled', True)
+TRACING_FILE = config.get('tracing', {}).get('file', 'logs/traces.jsonl')
+TRACING_FILE_MB = config.get('tracing', {}).get('file_mb', 5)
+TRACING_MQTT_ENABLED = config.get('tracing', {}).get('mqtt', False)
+TRACING_TOPIC = config.get('tracing', {}).get('topic', 'genio/metrics')
 
 # Logging settings
 LOG_LEVEL = config.get('logging', {}).get('level', 'INFO')
@@ -1,25 +1,75 @@
-import paho.mqtt.client as mqtt
 import ssl
+import sys
+import json
+import time
+import argparse
+import threading
 from config.settings import (
+    WAKE_WORD_ENABLED, STT_ENABLED, TTS_ENABLED,
     MQTT_BROKER, MQTT_PORT, MQTT_USERNAME, MQTT_PASSWORD, MQTT_USE_TLS,
-    PORCUPINE_ACCESS_KEY, WAKE_WORD, WAKE_WORD_MODEL_PATH, WAKE_WORD_SENSITIVITY,
-    STT_MODEL_SIZE, STT_LANGUAGE, TTS_MODEL_PATH, TTS_CONFIG_PATH, TTS_LANGUAGE,
-    AUDIO_RECORD_SECONDS
+    MQTT_WORKERS, MQTT_QUEUE_SIZE, MQTT_OVERFLOW_POLICY,
+    PORCUPINE_ACCESS_KEY, WAKE_WORD, WAKE_WORD_MODEL_PATH, WAKE_WORD_SENSITIVITY, WAKE_WORD_DIRECT_PROCESS,
+    STT_MODEL_SIZE, STT_LANGUAGE, STT_COMPUTE_TYPE, STT_CPU_THREADS, STT_NUM_WORKERS,
+    STT_BEAM_SIZE, STT_BEST_OF, STT_TEMPERATURE, STT_CONDITION_ON_PREVIOUS_TEXT,
+    STT_STREAMING_ENABLED, STT_STREAMING_INTERVAL, STT_PARTIAL_TOPIC,
+    TTS_MODEL_PATH, TTS_CONFIG_PATH, TTS_LANGUAGE,
+    TTS_VOICE, TTS_VOICES, TTS_PRELOAD_VOICES, TTS_VOICE_TOPIC,
+    TTS_CACHE_ENABLED, TTS_CACHE_MEMORY_MB, TTS_CACHE_DIR, TTS_CACHE_DISK_MB,
+    AUDIO_RECORD_SECONDS, AUDIO_PREROLL_MS, AUDIO_SOURCE, AUDIO_SINK,
+    VAD_ENABLED, VAD_THRESHOLD_DB, VAD_START_TIMEOUT, VAD_TRAILING_SILENCE_MS, VAD_MAX_SECONDS,
+    BARGE_IN_ENABLED, BARGE_IN_ECHO_DELAY_MS, BARGE_IN_ECHO_SEARCH_MS,
+    EARCON_ENABLED, EARCON_FILE, EARCON_VOLUME,
+    PIPELINE_ASYNC, PIPELINE_QUEUE_SIZE, PIPELINE_STATS_INTERVAL,
+    TRACING_ENABLED, TRACING_FILE, TRACING_FILE_MB, TRACING_MQTT_ENABLED, TRACING_TOPIC
 )
+from audio.capture import AudioCapture, CaptureStopped
+from audio.earcon import Earcon
+from audio.echo import EchoCanceller
 from audio.microphone import Microphone
+from audio.vad import EnergyVAD, Endpointer
+from audio.scheduler import SpeechScheduler, parse_speech_payload
 from audio.speaker import Speaker
-from wakeword.porcupine_detector import PorcupineDetector
-from stt.faster_whisper import FasterWhisper
-from tts.tts_engine import PiperTTS
+from audio.sinks import open_sink
+from audio.sources import open_source
+from pipeline.engine import PipelineEngine
+from stt.streaming import StreamingTranscriber
+from tts.cache import AudioCache
 from utils.logger import Logger
+from utils.startup import StartupTimeline
+from utils.tracing import Tracer
+from utils.workqueue import WorkQueue
+from utils.importtime import measure_import_times, format_import_report
+
+# Heavy backends are imported when their component is initialized, so
+# components disabled in config.yaml never load them
+BACKEND_MODULES = [
+    'numpy', 'yaml', 'pyaudio', 'pvporcupine', 'faster_whisper',
+    'sounddevice', 'piper', 'paho.mqtt.client',
+]
+
+# Components the agent cannot run without; MQTT is optional
+REQUIRED_COMPONENTS = ('wakeword', 'stt', 'tts')
+
+# Replies with a fixed part; the TTS pre-renders it and only speaks the command on demand
+RECEIVED_REPLY = "Mottaget kommando: {command}"
+ECHO_REPLY = "Du sa: {command}"
 
 class GenioAI:
-    def __init__(self):
+    def __init__(self, parallel_startup=True, audio_source=None, tracer=None, use_mqtt=True):
+        """
+        Args:
+            parallel_startup: Initialize engines concurrently (default: True)
+            audio_source: Optional AudioSource replacing the one configured
+                in config.yaml, e.g. a WavSource for headless replay (see
+                bench_pipeline.py)
+            tracer: Tracer to use instead of one configured from config.yaml
+            use_mqtt: Connect to the MQTT broker when one is configured
+        """
         self.logger = Logger()
         self.logger.info("🤖 Initializing Genio AI...")
         
         # Validate Porcupine access key
-        if not PORCUPINE_ACCESS_KEY:
+        if WAKE_WORD_ENABLED and not PORCUPINE_ACCESS_KEY:
             raise ValueError(
                 "PORCUPINE_ACCESS_KEY is required! "
                 "Add it to config/config.yaml. "
@@ -27,50 +77,243 @@ class GenioAI:
             )
         
         # Validate MQTT configuration
-        if not MQTT_BROKER or MQTT_BROKER.startswith("mqtt://your") or MQTT_BROKER == "mqtt.example.com":
+        if not use_mqtt:
+            self.mqtt_enabled = False
+        elif not MQTT_BROKER or MQTT_BROKER.startswith("mqtt://your") or MQTT_BROKER == "mqtt.example.com":
             self.logger.warning("⚠️  MQTT broker not configured! MQTT features will be disabled.")
             self.logger.warning("   Configure MQTT_BROKER in config/config.yaml")
             self.mqtt_enabled = False
         else:
             self.mqtt_enabled = True
         
-        self.mqtt_client = mqtt.Client() if self.mqtt_enabled else None
-        self.microphone = Microphone(record_seconds=AUDIO_RECORD_SECONDS)
+        self.mqtt_client = None
+        self.command_queue = None
+        if self.mqtt_enabled:
+            import paho.mqtt.client as mqtt
+            self.mqtt_client = mqtt.Client()
+            # Commands are handled off paho's network thread so keepalives keep flowing.
+            # A worker is busy until its reply was spoken; with a second one a
+            # later alert reaches the speech scheduler and preempts it.
+            self.command_queue = WorkQueue(
+                self.process_command,
+                workers=max(2, MQTT_WORKERS),
+                maxsize=MQTT_QUEUE_SIZE,
+                overflow=MQTT_OVERFLOW_POLICY,
+                name='GenioCommand',
+                on_error=lambda command, e: self.logger.error(f"Error handling command '{command}': {e}")
+            )
+        self.timeline = StartupTimeline(parallel=parallel_startup)
+        self.tracer = tracer or Tracer(
+            path=TRACING_FILE or None,
+            max_file_bytes=TRACING_FILE_MB * 1024 * 1024,
+            publish=self.publish_trace if TRACING_MQTT_ENABLED else None,
+            enabled=TRACING_ENABLED
+        )
+        
+        self.capture = None
+        self.microphone = None
+        self.endpointer = None
+        self.echo_canceller = None
+        self.earcon = None
+        if WAKE_WORD_ENABLED:
+            # One capture stream shared by the wake word detector and the recorder
+            self.capture = AudioCapture(
+                rate=16000,
+                frame_length=512,
+                capacity_seconds=max(10, AUDIO_RECORD_SECONDS * 2, VAD_MAX_SECONDS * 2),
+                source=audio_source or open_source(AUDIO_SOURCE, rate=16000, frame_length=512)
+            )
+            self.capture.start()
+            
+            if BARGE_IN_ENABLED or EARCON_ENABLED:
+                # Removes our own replies and chime from what the detector and recorder hear
+                self.echo_canceller = EchoCanceller(
+                    self.capture,
+                    delay_ms=BARGE_IN_ECHO_DELAY_MS,
+                    search_ms=BARGE_IN_ECHO_SEARCH_MS
+                )
+            if EARCON_ENABLED and TTS_ENABLED:
+                if EARCON_FILE:
+                    self.earcon = Earcon.load(EARCON_FILE, volume=EARCON_VOLUME)
+                else:
+                    self.earcon = Earcon.tone(volume=EARCON_VOLUME)
+            if VAD_ENABLED:
+                self.endpointer = Endpointer(
+                    EnergyVAD(rate=self.capture.rate, threshold_db=VAD_THRESHOLD_DB),
+                    start_timeout=VAD_START_TIMEOUT,
+                    trailing_silence_ms=VAD_TRAILING_SILENCE_MS,
+                    max_seconds=VAD_MAX_SECONDS
+                )
+            self.microphone = Microphone(
+                record_seconds=AUDIO_RECORD_SECONDS,
+                capture=self.capture,
+                preroll_ms=AUDIO_PREROLL_MS,
+                endpointer=self.endpointer,
+                # Queued recordings plus the one being transcribed and the one being made
+                buffers=PIPELINE_QUEUE_SIZE + 2 if PIPELINE_ASYNC else 1,
+                echo_canceller=self.echo_canceller
+            )
+            self.microphone.tracer = self.tracer
+        
+        # Independent engines load concurrently; the Whisper load dominates on a Pi
+        self.tts_cache = None
+        self.tts = None
+        self.speaker = None
+        self.speech = None
+        self.stt = None
+        self.streaming_stt = None
+        self.porcupine_detector = None
+        self.pipeline = None
+        self.startup_error = None
+        if WAKE_WORD_ENABLED:
+            self.timeline.start('wakeword', self._init_wakeword)
+        else:
+            self.logger.info("Wake word detection disabled in config.yaml")
+        if TTS_ENABLED:
+            self.timeline.start('tts', self._init_tts)
+        else:
+            self.logger.info("Text-to-speech disabled in config.yaml")
+        if STT_ENABLED and WAKE_WORD_ENABLED:
+            self.timeline.start('stt', self._init_stt)
+        else:
+            self.logger.info("Speech-to-text disabled (needs stt and wake word enabled)")
+        if self.mqtt_enabled:
+            self.timeline.start('mqtt', self.setup_mqtt)
+        
+        self.logger.info("✅ Genio AI initialization started")
+
+    def _init_tts(self):
+        from tts.tts_engine import PiperTTS
+        from tts.voices import VoiceRegistry
         
-        # Initialize Piper TTS
         self.logger.info("Initializing Piper TTS...")
+        voices = VoiceRegistry()
+        if TTS_VOICE not in TTS_VOICES:
+            voices.add(TTS_VOICE, TTS_MODEL_PATH, TTS_CONFIG_PATH)
+        for name, options in TTS_VOICES.items():
+            try:
+                voices.add(name, **options)
+            except (FileNotFoundError, ValueError, TypeError) as e:
+                self.logger.warning(f"Skipping voice '{name}': {e}")
+        if TTS_CACHE_ENABLED:
+            self.tts_cache = AudioCache(
+                cache_dir=TTS_CACHE_DIR or None,
+                max_memory_bytes=TTS_CACHE_MEMORY_MB * 1024 * 1024,
+                max_disk_bytes=TTS_CACHE_DISK_MB * 1024 * 1024
+            )
         self.tts = PiperTTS(
             model_path=TTS_MODEL_PATH,
             config_path=TTS_CONFIG_PATH,
-            language=TTS_LANGUAGE
+            language=TTS_LANGUAGE,
+            cache=self.tts_cache,
+            sink=self._open_sink(),
+            voices=voices,
+            voice=TTS_VOICE
         )
+        self.logger.info(f"   Piper backend: {self.tts.backend} ({self.tts.sample_rate} Hz)")
+        if len(voices.names) > 1:
+            if TTS_PRELOAD_VOICES:
+                self.tts.preload()
+            self.logger.info(f"   Voices: {', '.join(voices.names)}")
+        self.tts.tracer = self.tracer
+        try:
+            self.tts.add_template('received', RECEIVED_REPLY)
+            self.tts.add_template('echo', ECHO_REPLY)
+        except Exception as e:
+            self.logger.warning(f"Could not pre-render reply templates: {e}")
+        if self.echo_canceller:
+            self.tts.on_playback = self.echo_canceller.play
         self.speaker = Speaker(self.tts)
+        # Open the output stream now rather than on the first reply
+        self.speaker.start()
+        self.speech = SpeechScheduler(self.speaker, tracer=self.tracer)
+
+    def _open_sink(self):
+        """Create the configured speech output."""
+        sink = open_sink(AUDIO_SINK)
+        if AUDIO_SINK == 'stdout':
+            # stdout now carries raw PCM; keep console messages out of it
+            sys.stdout = sys.stderr
+        return sink
+
+    def _init_wakeword(self):
+        from wakeword.porcupine_detector import PorcupineDetector
         
-        # Initialize Porcupine wake word detector
         self.logger.info(f"Initializing wake word detector for '{WAKE_WORD}'...")
         if WAKE_WORD_MODEL_PATH:
             # Use custom .ppn file
             self.porcupine_detector = PorcupineDetector(
                 access_key=PORCUPINE_ACCESS_KEY,
                 keyword_paths=[WAKE_WORD_MODEL_PATH],
-                sensitivity=WAKE_WORD_SENSITIVITY
+                sensitivity=WAKE_WORD_SENSITIVITY,
+                capture=self.capture,
+                echo_canceller=self.echo_canceller,
+                direct_process=WAKE_WORD_DIRECT_PROCESS
             )
         else:
             # Use built-in keyword
             self.porcupine_detector = PorcupineDetector(
                 access_key=PORCUPINE_ACCESS_KEY,
                 keywords=[WAKE_WORD],
-                sensitivity=WAKE_WORD_SENSITIVITY
+                sensitivity=WAKE_WORD_SENSITIVITY,
+                capture=self.capture,
+                echo_canceller=self.echo_canceller,
+                direct_process=WAKE_WORD_DIRECT_PROCESS
             )
+        self.porcupine_detector.initialize()
+
+    def _init_stt(self):
+        from stt.faster_whisper import FasterWhisper
         
-        # Initialize STT
         self.logger.info("Initializing speech-to-text...")
-        self.stt = FasterWhisper(model_size=STT_MODEL_SIZE, language=STT_LANGUAGE)
+        self.stt = FasterWhisper(
+            model_size=STT_MODEL_SIZE,
+            language=STT_LANGUAGE,
+            compute_type=STT_COMPUTE_TYPE,
+            cpu_threads=STT_CPU_THREADS,
+            num_workers=STT_NUM_WORKERS,
+            beam_size=STT_BEAM_SIZE,
+            best_of=STT_BEST_OF,
+            temperature=STT_TEMPERATURE,
+            condition_on_previous_text=STT_CONDITION_ON_PREVIOUS_TEXT
+        )
+        self.stt.tracer = self.tracer
+        if STT_STREAMING_ENABLED and self.endpointer is not None:
+            # Partial decodes need the endpointed recording from the shared capture
+            self.streaming_stt = StreamingTranscriber(
+                self.stt,
+                interval=STT_STREAMING_INTERVAL,
+                rate=self.capture.rate,
+                on_partial=self.publish_partial
+            )
 
-        if self.mqtt_enabled:
-            self.setup_mqtt()
+    def wait_until_ready(self):
+        """
+        Block until every component is initialized and log the startup timeline.
         
-        self.logger.info("✅ Genio AI initialized successfully!")
+        Raises:
+            RuntimeError: A required component (wake word, STT or TTS) failed
+        """
+        failures = self.timeline.wait_all()
+        for name, error in failures.items():
+            self.logger.error(f"❌ {name} failed to initialize: {error}")
+        required = [name for name in failures if name in REQUIRED_COMPONENTS]
+        if required:
+            for line in self.timeline.summary():
+                self.logger.info(f"   ⏱️  {line}")
+            raise RuntimeError(f"Genio AI could not start: {', '.join(required)} failed to initialize")
+        self.logger.info(f"✅ Genio AI initialized in {self.timeline.elapsed():.2f}s")
+        for line in self.timeline.summary():
+            self.logger.info(f"   ⏱️  {line}")
+
+    def _watch_startup(self):
+        """Finish startup in the background; stop listening if a required component failed."""
+        try:
+            self.wait_until_ready()
+        except Exception as e:
+            self.startup_error = e
+            if self.pipeline is not None:
+                self.pipeline.stop()
 
     def setup_mqtt(self):
         try:
@@ -99,51 +342,371 @@ class GenioAI:
     def on_connect(self, client, userdata, flags, rc):
         self.logger.info("Genio AI connected to MQTT broker")
         client.subscribe("genio/commands")
+        client.subscribe(f"{TRACING_TOPIC}/get")
+        client.subscribe(TTS_VOICE_TOPIC)
 
     def on_message(self, client, userdata, msg):
+        if msg.topic == f"{TRACING_TOPIC}/get":
+            self.publish_latency_summary()
+            return
+        if msg.topic == TTS_VOICE_TOPIC:
+            # Waits for the current utterance, so not on paho's network thread
+            threading.Thread(target=self.set_voice, args=(msg.payload.decode().strip(),), daemon=True).start()
+            return
         command = msg.payload.decode()
         self.logger.info(f"Received command: {command}")
-        self.process_command(command)
+        dropped = self.command_queue.counters['dropped']
+        if not self.command_queue.submit(command):
+            self.logger.warning(f"Command queue full, rejected: {command}")
+        elif self.command_queue.counters['dropped'] > dropped:
+            self.logger.warning("Command queue full, dropped the oldest command")
+
+    def set_voice(self, name):
+        """Switch the TTS voice; takes effect from the next utterance."""
+        if self.tts is None:
+            return
+        try:
+            self.tts.select_voice(name)
+        except KeyError as e:
+            self.logger.warning(e.args[0])
+            return
+        self.logger.info(f"🗣️  Voice: {name} ({self.tts.sample_rate} Hz)")
+
+    def publish_partial(self, text):
+        self.logger.debug(f"Partial transcript: {text}")
+        if self.mqtt_enabled and self.mqtt_client:
+            self.mqtt_client.publish(STT_PARTIAL_TOPIC, text)
+
+    def publish_trace(self, line):
+        if self.mqtt_enabled and self.mqtt_client:
+            self.mqtt_client.publish(TRACING_TOPIC, line)
+
+    def publish_latency_summary(self):
+        """Answer a genio/metrics/get request with the current percentiles."""
+        summary = json.dumps(self.tracer.summary())
+        self.mqtt_client.publish(f"{TRACING_TOPIC}/summary", summary)
+
+    def start_interaction(self, position=None):
+        """
+        Start the trace of one spoken interaction.
+        
+        The trace is back-dated to where the wake word ended in the audio,
+        so its first span is the wake word detection lag.
+        """
+        trace = self.tracer.start('interaction')
+        if trace is not None and position is not None and self.capture:
+            lag = max(0, self.capture.position - position) / self.capture.rate
+            trace.start -= lag
+            trace.add('wake_detect', trace.start, lag)
+        return trace
+
+    def _traced(self, trace, func, *args, final=False):
+        """Run func with `trace` active and finish the trace when the interaction ends."""
+        with self.tracer.activate(trace):
+            try:
+                result = func(*args)
+            except BaseException:
+                self.tracer.finish(trace)
+                raise
+        if final or result is None:
+            self.tracer.finish(trace)
+        return result
+
+    def say(self, text, priority='reply', ttl=None, wait=True, on_done=None):
+        """
+        Speak text through the speech scheduler, or only log it when TTS is disabled.
+        
+        Args:
+            text: Text to speak
+            priority: 'alert', 'reply' or 'info'
+            ttl: Seconds the text may wait for the speaker before it is dropped
+            wait: Block until the text was spoken or dropped
+            on_done: Optional callable(request) once it was spoken or dropped
+        """
+        if not TTS_ENABLED:
+            self.logger.info(f"(TTS disabled) {text}")
+            if on_done:
+                on_done(None)
+            return None
+        self.timeline.wait('tts')
+        request = self.speech.say(text, priority=priority, ttl=ttl, on_done=on_done)
+        if wait:
+            request.wait()
+            if request.error is not None:
+                raise request.error
+        return request
+
+    def interrupt_speech(self):
+        """Barge-in: stop the reply being spoken when the wake word is heard."""
+        # Alerts still waiting are spoken after the new command
+        if self.speech is not None and self.speech.interrupt(keep='alert'):
+            self.logger.info("✋ Barge-in: stopping playback")
+        if self.echo_canceller:
+            self.echo_canceller.cancel()
+
+    def acknowledge(self, position=None):
+        """Play the earcon the moment the wake word is heard, without delaying recording."""
+        if self.earcon is None or not self.timeline.is_ready('tts'):
+            return
+        latency = self.speaker.acknowledge(self.earcon)
+        if latency is not None and self.echo_canceller:
+            # Keep the chime out of the recorded command
+            self.echo_canceller.play(self.earcon.samples, self.earcon.rate, latency)
 
     def process_command(self, command):
-        # Process the command and respond accordingly
-        self.logger.info(f"Processing command: {command}")
+        # Plain text, or JSON with "text" plus optional "priority" and "ttl"
+        try:
+            text, priority, ttl = parse_speech_payload(command)
+        except ValueError as e:
+            self.logger.warning(f"Ignoring command: {e}")
+            return
+        self.logger.info(f"Processing command: {text} ({priority})")
         # Echo the command back to confirm receipt
-        response = f"Mottaget kommando: {command}"
-        self.speaker.speak(response)
+        response = RECEIVED_REPLY.format(command=text)
+        trace = self.tracer.start('mqtt_command')
+        with self.tracer.activate(trace):
+            # Awaited, so the command queue's overflow policy and latency cover speech
+            self.say(response, priority=priority, ttl=ttl,
+                     on_done=lambda request: self._speech_done(request, trace))
+
+    def _speech_done(self, request, trace):
+        # Failures are raised to the command queue, which logs them
+        if request is not None and request.status not in ('spoken', 'preempted', 'interrupted', 'failed'):
+            self.logger.warning(f"Speech {request.status}: {request.text}")
+        self.tracer.finish(trace)
+
+    def record_command(self, position=None):
+        """
+        Record a command, starting where the wake word ended.
+        
+        Args:
+            position: Capture position where the wake word ended
+            
+        Returns:
+            (audio, streaming state) or None if no speech was detected
+        """
+        # Record from where the wake word ended, not from when listen() runs
+        self.microphone.mark_start(position)
+        # Partial decodes only once STT has finished loading
+        streaming_stt = self.streaming_stt
+        if streaming_stt:
+            streaming_stt.start(self.microphone.current_recording)
+        audio = self.microphone.listen()
+        state = streaming_stt.stop() if streaming_stt else None
+        if len(audio) == 0:
+            self.logger.info("No speech detected after wake word")
+            return None
+        return audio, state
+
+    def transcribe_command(self, audio, state=None):
+        """Transcribe a recorded command, reusing committed streaming results."""
+        self.logger.info("Transcribing audio...")
+        self.timeline.wait('stt')
+        with self.tracer.span('transcribe'):
+            if self.streaming_stt:
+                command = self.streaming_stt.finish(audio, state)
+            else:
+                command = self.stt.transcribe(audio)
+        self.logger.info(f"Transcribed command: {command}")
+        return command
+
+    def handle_command(self, command):
+        """
+        Dispatch a transcribed command.
+        
+        Returns:
+            Text to speak locally, or None if the command went to MQTT
+        """
+        if self.mqtt_enabled and self.mqtt_client:
+            with self.tracer.span('mqtt_publish'):
+                self.mqtt_client.publish("genio/commands", command)
+            return None
+        self.logger.info(f"Command (no MQTT): {command}")
+        # Process locally without MQTT
+        return ECHO_REPLY.format(command=command)
 
     def listen_for_wake_word(self):
         try:
-            while True:
+            # Start listening as soon as Porcupine is ready; STT may still be loading
+            self.timeline.wait('wakeword')
+            if STT_ENABLED and not self.timeline.is_ready('stt'):
+                self.logger.info("👂 Listening for wake word while speech-to-text finishes loading...")
+            threading.Thread(target=self._watch_startup, name='GenioStartup', daemon=True).start()
+            
+            while self.startup_error is None:
                 if self.porcupine_detector.detect():
                     self.logger.info("Wake word detected!")
+                    if BARGE_IN_ENABLED:
+                        # Speech started from an MQTT message may still be playing
+                        self.interrupt_speech()
+                    self.acknowledge()
+                    position = self.porcupine_detector.detection_position
+                    trace = self.start_interaction(position)
                     try:
-                        audio = self.microphone.listen()
-                        self.logger.info("Transcribing audio...")
-                        command = self.stt.transcribe(audio)
-                        self.logger.info(f"Transcribed command: {command}")
-                        
-                        if self.mqtt_enabled and self.mqtt_client:
-                            self.mqtt_client.publish("genio/commands", command)
-                        else:
-                            self.logger.info(f"Command (no MQTT): {command}")
-                            # Process locally without MQTT
-                            self.speaker.speak(f"Du sa: {command}")
-                    except KeyboardInterrupt:
+                        with self.tracer.activate(trace):
+                            recording = self.record_command(position)
+                            if recording is None:
+                                continue
+                            if not STT_ENABLED:
+                                self.logger.info("Speech-to-text disabled, ignoring recording")
+                                continue
+                            command = self.transcribe_command(*recording)
+                            reply = self.handle_command(command)
+                            if reply:
+                                self.say(reply)
+                    except (KeyboardInterrupt, CaptureStopped):
                         raise  # Re-raise to be caught by outer handler
                     except Exception as e:
                         self.logger.error(f"Error processing command: {e}")
-                        self.speaker.speak("Ursäkta, jag kunde inte förstå det.")
+                        try:
+                            self.say("Ursäkta, jag kunde inte förstå det.")
+                        except Exception as e:
+                            self.logger.error(f"Could not speak the apology: {e}")
+                    finally:
+                        self.tracer.finish(trace)
+        except KeyboardInterrupt:
+            self.logger.info("🛑 Genio AI stopped by user")
+            self.shutdown()
+        except CaptureStopped as e:
+            self.logger.info(f"🔚 Audio input ended: {e}")
+            self.shutdown()
+        except RuntimeError as e:
+            # The detector gave up after repeated errors; release the devices first
+            self.logger.error(f"❌ Wake word detection failed: {e}")
+            self.shutdown()
+            raise
+        else:
+            # The loop only ends by itself when a required component failed to start
+            self.shutdown()
+            raise self.startup_error
+
+    def run_pipeline(self):
+        """Run wake word, recording, STT, dispatch and TTS as concurrent stages."""
+        self.timeline.wait('wakeword')
+        if STT_ENABLED and not self.timeline.is_ready('stt'):
+            self.logger.info("👂 Listening for wake word while speech-to-text finishes loading...")
+
+        # Each stage item carries the interaction's trace to the next stage's thread
+        def record(position):
+            self.logger.info("Wake word detected!")
+            trace = self.start_interaction(position)
+            recording = self._traced(trace, self.record_command, position)
+            if recording is None:
+                return None
+            if not STT_ENABLED:
+                self.tracer.finish(trace)
+                return None
+            audio, state = recording
+            # The microphone rotates enough buffers for every queued recording
+            return audio, state, trace
+
+        def transcribe(audio, state, trace):
+            return self._traced(trace, self.transcribe_command, audio, state), trace
+
+        def dispatch(item):
+            command, trace = item
+            reply = self._traced(trace, self.handle_command, command)
+            return (reply, trace) if reply else None
+
+        def speak(item):
+            # Error apologies from the engine arrive as plain text
+            reply, trace = (item, None) if isinstance(item, str) else item
+            self._traced(trace, self.say, reply, final=True)
+
+        self.pipeline = PipelineEngine(
+            self.porcupine_detector,
+            record=record,
+            transcribe=transcribe,
+            dispatch=dispatch,
+            speak=speak,
+            on_error=lambda error: "Ursäkta, jag kunde inte förstå det.",
+            barge_in=self.interrupt_speech if BARGE_IN_ENABLED else None,
+            on_wake=self.acknowledge,
+            queue_size=PIPELINE_QUEUE_SIZE,
+            stats_interval=PIPELINE_STATS_INTERVAL,
+            logger=self.logger
+        )
+        threading.Thread(target=self._watch_startup, name='GenioStartup', daemon=True).start()
+        try:
+            self.pipeline.run()
+        except (KeyboardInterrupt, CaptureStopped) as e:
+            if isinstance(e, CaptureStopped):
+                self.logger.info(f"🔚 Audio input ended: {e}")
+            else:
+                self.logger.info("🛑 Genio AI stopped by user")
+            self.pipeline.stop()
+            self.logger.info(f"Pipeline: {self.pipeline.stats()}")
+            self.shutdown()
+        except RuntimeError as e:
+            # The detector gave up after repeated errors; release the devices first
+            self.logger.error(f"❌ Wake word detection failed: {e}")
+            self.pipeline.stop()
+            self.shutdown()
+            raise
+        else:
+            if self.startup_error is not None:
+                self.shutdown()
+                raise self.startup_error
+
+    def wait_for_commands(self):
+        """Serve MQTT commands only, when wake word detection is disabled."""
+        self.wait_until_ready()
+        self.logger.info("Waiting for MQTT commands (wake word detection disabled)...")
+        try:
+            while True:
+                time.sleep(1)
         except KeyboardInterrupt:
             self.logger.info("🛑 Genio AI stopped by user")
-            if self.porcupine_detector:
-                self.porcupine_detector.cleanup()
-            if self.microphone:
-                self.microphone.stop()
+            self.shutdown()
+
+    def shutdown(self):
+        summary = self.tracer.format_summary()
+        if summary:
+            self.logger.info("⏱️  Latency (p50/p95/p99):")
+            for line in summary:
+                self.logger.info(f"   {line}")
+        if self.mqtt_client:
+            # No new commands; also ends paho's network thread
+            self.mqtt_client.loop_stop()
+            self.mqtt_client.disconnect()
+        if self.command_queue:
+            self.command_queue.stop()
+            self.logger.info(f"MQTT command queue: {self.command_queue.metrics()}")
+        if self.tts_cache:
+            self.logger.info(f"TTS cache: {self.tts_cache.get_stats()}")
+        if self.speech:
+            self.speech.stop()
+            self.logger.info(f"Speech: {self.speech.counters}")
+        if self.speaker:
+            self.logger.info(f"Playback: {self.speaker.stats()}")
+            self.speaker.close()
+        if self.porcupine_detector:
+            self.porcupine_detector.cleanup()
+        if self.microphone:
+            self.microphone.stop()
+        if self.capture:
+            self.capture.stop()
 
     def run(self):
-        self.listen_for_wake_word()
+        if WAKE_WORD_ENABLED and PIPELINE_ASYNC:
+            self.run_pipeline()
+        elif WAKE_WORD_ENABLED:
+            self.listen_for_wake_word()
+        else:
+            self.wait_for_commands()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Genio AI voice agent")
+    parser.add_argument('--import-time', action='store_true',
+                        help="Report how long each backend takes to import and exit")
+    return parser.parse_args(argv)
+
 
 if __name__ == "__main__":
+    args = parse_args()
+    if args.import_time:
+        print(format_import_report(measure_import_times(BACKEND_MODULES)))
+        sys.exit(0)
     agent = GenioAI()
     agent.run()
\ No newline at end of file
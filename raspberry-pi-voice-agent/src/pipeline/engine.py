@@ -0,0 +1,207 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Stage:
+    """
+    One step of the voice pipeline.
+
+    Takes items from a bounded inbox, runs a blocking handler on an
+    executor thread and puts non-None results into the next stage's
+    inbox. A full outbox makes put() wait, which pauses this stage
+    until the next one catches up (backpressure).
+    """
+
+    def __init__(self, name, handler, inbox, outbox=None, on_error=None):
+        """
+        Args:
+            name: Stage name used in stats
+            handler: Blocking callable taking one item, returning the next item or None
+            inbox: asyncio.Queue to read from
+            outbox: asyncio.Queue for results (default: results are dropped)
+            on_error: Optional blocking callable invoked with (item, exception)
+        """
+        self.name = name
+        self.handler = handler
+        self.inbox = inbox
+        self.outbox = outbox
+        self.on_error = on_error
+        self.processed = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+
+    async def run(self, loop, executor):
+        while True:
+            item = await self.inbox.get()
+            start = time.monotonic()
+            try:
+                result = await loop.run_in_executor(executor, self.handler, item)
+                self.processed += 1
+            except Exception as e:
+                self.errors += 1
+                result = None
+                if self.on_error:
+                    await loop.run_in_executor(executor, self.on_error, item, e)
+            finally:
+                self.busy_seconds += time.monotonic() - start
+                self.inbox.task_done()
+            if result is not None and self.outbox is not None:
+                await self.outbox.put(result)
+
+    def stats(self):
+        return {
+            'queue_depth': self.inbox.qsize(),
+            'queue_size': self.inbox.maxsize,
+            'processed': self.processed,
+            'errors': self.errors,
+            'busy_seconds': round(self.busy_seconds, 3),
+        }
+
+
+class PipelineEngine:
+    """
+    Event-driven voice pipeline built from explicit stages.
+
+        capture -> wake word -> record -> STT -> dispatch -> TTS
+
+    Capture runs on the AudioCapture thread and wake word detection on
+    its own executor thread with its own ring buffer reader, so detection
+    keeps running while earlier commands are transcribed or spoken.
+    The remaining stages are connected by bounded asyncio queues.
+    """
+
+    def __init__(self, detector, record, transcribe, dispatch, speak, on_error=None,
+                 barge_in=None, on_wake=None, queue_size=2, stats_interval=30.0, logger=None):
+        """
+        Args:
+            detector: Initialized PorcupineDetector (detect(), detection_position)
+            record: Callable(position) -> recording or None
+            transcribe: Callable(recording) -> command text
+            dispatch: Callable(command) -> text to speak or None
+            speak: Callable(text) that plays speech
+            on_error: Callable(exception) -> text to speak, for record/STT/dispatch failures
+            barge_in: Callable() that stops speech in progress; called on the
+                detector thread at every wake word, which also drops queued replies
+            on_wake: Callable(position) called on the detector thread right
+                after every detection, before the recording is queued
+            queue_size: Capacity of every inter-stage queue (default: 2)
+            stats_interval: Seconds between queue depth log lines, 0 to disable
+            logger: Logger for stats and dropped wake events
+        """
+        self.detector = detector
+        self.queue_size = queue_size
+        self.stats_interval = stats_interval
+        self.logger = logger
+        self.on_error = on_error
+        self.barge_in = barge_in
+        self.on_wake = on_wake
+        self.dropped_wake_events = 0
+        self.dropped_replies = 0
+        self._running = False
+        self._stop_requested = False
+        self._handlers = (record, transcribe, dispatch, speak)
+        self.stages = []
+
+    def _build(self):
+        record, transcribe, dispatch, speak = self._handlers
+        triggers = asyncio.Queue(self.queue_size)
+        recordings = asyncio.Queue(self.queue_size)
+        commands = asyncio.Queue(self.queue_size)
+        replies = asyncio.Queue(self.queue_size)
+        self.triggers = triggers
+        self.replies = replies
+
+        def report(item, error):
+            if self.logger:
+                self.logger.error(f"Error processing command: {error}")
+            if self.on_error:
+                text = self.on_error(error)
+                if text:
+                    self._loop.call_soon_threadsafe(self._offer, replies, text)
+
+        self.stages = [
+            Stage('record', record, triggers, recordings, on_error=report),
+            Stage('stt', lambda recording: transcribe(*recording), recordings, commands, on_error=report),
+            Stage('dispatch', dispatch, commands, replies, on_error=report),
+            Stage('tts', speak, replies),
+        ]
+
+    def _offer(self, queue, item):
+        """Put without waiting; wake events and error replies are dropped when full."""
+        try:
+            queue.put_nowait(item)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    def _detect_loop(self):
+        """Runs on its own thread: feed wake word detections into the pipeline."""
+        while self._running:
+            if self.detector.detect():
+                position = self.detector.detection_position
+                if self.barge_in is not None:
+                    self.barge_in()
+                if self.on_wake is not None:
+                    self.on_wake(position)
+                future = asyncio.run_coroutine_threadsafe(self._trigger(position), self._loop)
+                if not future.result():
+                    self.dropped_wake_events += 1
+
+    async def _trigger(self, position):
+        if self.barge_in is not None:
+            # Replies to earlier commands are stale once the user speaks again
+            while not self.replies.empty():
+                self.replies.get_nowait()
+                self.replies.task_done()
+                self.dropped_replies += 1
+        accepted = self._offer(self.triggers, position)
+        if not accepted and self.logger:
+            self.logger.warning("Wake word ignored: still busy recording")
+        return accepted
+
+    def queue_depths(self):
+        """Current depth of every stage's inbox."""
+        return {stage.name: stage.inbox.qsize() for stage in self.stages}
+
+    def stats(self):
+        """Per-stage counters plus dropped wake events and barged-in replies."""
+        stats = {stage.name: stage.stats() for stage in self.stages}
+        stats['wakeword'] = {
+            'dropped_wake_events': self.dropped_wake_events,
+            'dropped_replies': self.dropped_replies,
+        }
+        return stats
+
+    async def _report_stats(self):
+        while True:
+            await asyncio.sleep(self.stats_interval)
+            if self.logger:
+                self.logger.info(f"📊 Pipeline queue depths: {self.queue_depths()}")
+
+    async def run_async(self):
+        self._loop = asyncio.get_running_loop()
+        self._build()
+        # stop() may already have been called from another thread
+        self._running = not self._stop_requested
+        # One thread per stage plus the detector, so a slow stage never starves another
+        executor = ThreadPoolExecutor(max_workers=len(self.stages) + 1, thread_name_prefix='GenioStage')
+        tasks = [asyncio.ensure_future(stage.run(self._loop, executor)) for stage in self.stages]
+        if self.stats_interval:
+            tasks.append(asyncio.ensure_future(self._report_stats()))
+        try:
+            await self._loop.run_in_executor(executor, self._detect_loop)
+        finally:
+            self._running = False
+            for task in tasks:
+                task.cancel()
+            executor.shutdown(wait=False)
+
+    def stop(self):
+        """Ask the detector loop to exit; run() returns after the current frame."""
+        self._stop_requested = True
+        self._running = False
+
+    def run(self):
+        """Run the pipeline until stop() is called or KeyboardInterrupt."""
+        asyncio.run(self.run_async())
@@ -1,39 +1,80 @@
+from contextlib import nullcontext
 from faster_whisper import WhisperModel
 import numpy as np
 
+# Default temperature fallback schedule used by faster-whisper
+DEFAULT_TEMPERATURE = [0.0, 0.2, 0.4, 0.6, 0.8, 1.0]
+# 16-bit PCM to the [-1, 1) float32 range Whisper expects
+PCM_SCALE = np.float32(1.0 / 32768.0)
+
+
 class FasterWhisperSTT:
-    def __init__(self, model_size="base", language="sv"):
+    def __init__(self, model_size="base", language="sv", compute_type="default", cpu_threads=0,
+                 num_workers=1, beam_size=5, best_of=5, temperature=None,
+                 condition_on_previous_text=True):
+        """
+        Args:
+            model_size: Whisper model size or path
+            language: Language code
+            compute_type: CTranslate2 compute type (default, int8, int8_float32, float32)
+            cpu_threads: Threads per decode, 0 lets CTranslate2 decide
+            num_workers: Parallel decodes the model can serve
+            beam_size: Beam size for decoding
+            best_of: Candidates when sampling with non-zero temperature
+            temperature: Temperature or list of fallback temperatures
+            condition_on_previous_text: Prompt each window with the previous text
+        """
         self.language = language
-        self.model = WhisperModel(model_size, device="cuda" if self._is_cuda_available() else "cpu")
+        self.compute_type = compute_type
+        self.cpu_threads = cpu_threads
+        self.num_workers = num_workers
+        self.decode_options = {
+            "beam_size": beam_size,
+            "best_of": best_of,
+            "temperature": DEFAULT_TEMPERATURE if temperature is None else temperature,
+            "condition_on_previous_text": condition_on_previous_text,
+        }
+        self.tracer = None  # Optional utils.tracing.Tracer for latency spans
+        self.model = WhisperModel(
+            model_size,
+            device="cuda" if self._is_cuda_available() else "cpu",
+            compute_type=compute_type,
+            cpu_threads=cpu_threads,
+            num_workers=num_workers
+        )
 
     def _is_cuda_available(self):
+        # ctranslate2 ships with faster-whisper; no need to import torch for this
         try:
-            import torch
-            return torch.cuda.is_available()
-        except ImportError:
+            import ctranslate2
+            return ctranslate2.get_cuda_device_count() > 0
+        except (ImportError, RuntimeError):
             return False
 
+    def _span(self, name):
+        return self.tracer.span(name) if self.tracer else nullcontext()
+
     def transcribe(self, audio_file):
-        # Convert raw audio bytes to numpy array if needed
-        audio_input = audio_file
-        if isinstance(audio_file, bytes):
-            # Convert 16-bit PCM audio bytes to float32 numpy array
-            audio_int16 = np.frombuffer(audio_file, dtype=np.int16)
-            audio_input = audio_int16.astype(np.float32) / 32768.0
+        with self._span('audio_convert'):
+            # Convert raw audio bytes to numpy array if needed
+            audio_input = audio_file
+            if isinstance(audio_file, bytes):
+                # Convert 16-bit PCM audio bytes to float32 numpy array
+                audio_int16 = np.frombuffer(audio_file, dtype=np.int16)
+                audio_input = np.multiply(audio_int16, PCM_SCALE, dtype=np.float32)
+            elif isinstance(audio_file, np.ndarray) and audio_file.dtype == np.int16:
+                # One allocation, no float64 or unscaled temporary
+                audio_input = np.multiply(audio_file, PCM_SCALE, dtype=np.float32)
+            # float32 recordings from Microphone are already normalized and used as is
         
-        segments, _ = self.model.transcribe(audio_input, beam_size=5, language=self.language)
-        return " ".join(segment.text for segment in segments)
+        # Segments are decoded lazily, so the span covers consuming them
+        with self._span('whisper_decode'):
+            segments, _ = self.model.transcribe(audio_input, language=self.language, **self.decode_options)
+            return " ".join(segment.text for segment in segments)
 
     def transcribe_from_stream(self, audio_stream):
-        # Convert raw audio bytes to numpy array if needed
-        audio_input = audio_stream
-        if isinstance(audio_stream, bytes):
-            # Convert 16-bit PCM audio bytes to float32 numpy array
-            audio_int16 = np.frombuffer(audio_stream, dtype=np.int16)
-            audio_input = audio_int16.astype(np.float32) / 32768.0
-        
-        segments, _ = self.model.transcribe(audio_input, beam_size=5, language=self.language)
-        return " ".join(segment.text for segment in segments)
+        # Same input handling and decoding as transcribe()
+        return self.transcribe(audio_stream)
 
 # Alias för backward compatibility
-FasterWhisper = FasterWhisperSTT
\ No newline at end of file
+FasterWhisper = FasterWhisperSTT
@@ -0,0 +1,151 @@
+import re
+import threading
+import numpy as np
+
+
+def _normalize(word):
+    """Compare words without case or punctuation."""
+    return re.sub(r'[^\w]', '', word.lower())
+
+
+class StreamingTranscriber:
+    """
+    Incremental transcription while audio is still being recorded.
+
+    A background thread re-decodes the growing, not yet committed part of
+    the recording at a fixed interval. Words that two consecutive decodes
+    agree on are committed (local agreement), and the audio behind them
+    is never decoded again. When the utterance ends only the uncommitted
+    tail still needs a final decode.
+    """
+
+    def __init__(self, stt, interval=1.0, rate=16000, on_partial=None):
+        """
+        Initialize the streaming transcriber.
+
+        Args:
+            stt: FasterWhisperSTT instance whose model is used for decoding
+            interval: Seconds between re-decodes (default: 1.0)
+            rate: Sample rate of the recording in Hz
+            on_partial: Optional callback called with each partial transcript
+        """
+        self.stt = stt
+        self.interval = interval
+        self.rate = rate
+        self.on_partial = on_partial
+        self._thread = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.committed_words = []
+        self.committed_samples = 0
+        self.hypothesis = []
+        self.decodes = 0
+
+    def _decode_words(self, audio):
+        """Decode float32 (or int16) audio and return a list of (word, end_seconds)."""
+        window = audio if audio.dtype == np.float32 else np.multiply(audio, 1.0 / 32768.0, dtype=np.float32)
+        segments, _ = self.stt.model.transcribe(
+            window,
+            beam_size=1,
+            language=self.stt.language,
+            word_timestamps=True,
+            condition_on_previous_text=False,
+            initial_prompt=" ".join(self.committed_words) or None
+        )
+        words = []
+        for segment in segments:
+            for word in segment.words or []:
+                words.append((word.word.strip(), word.end))
+        self.decodes += 1
+        return words
+
+    def _update(self, audio):
+        """Re-decode the uncommitted tail and commit the stable prefix."""
+        with self._lock:
+            words = self._decode_words(audio[self.committed_samples:])
+
+            agreed = 0
+            for (word, _), previous in zip(words, self.hypothesis):
+                if _normalize(word) != _normalize(previous):
+                    break
+                agreed += 1
+
+            if agreed:
+                self.committed_words.extend(word for word, _ in words[:agreed])
+                self.committed_samples += int(words[agreed - 1][1] * self.rate)
+            self.hypothesis = [word for word, _ in words[agreed:]]
+            partial = " ".join(self.committed_words + self.hypothesis)
+
+        if self.on_partial and partial:
+            self.on_partial(partial)
+
+    def _run(self, get_audio):
+        decoded_samples = 0
+        while not self._stop.wait(self.interval):
+            audio = get_audio()
+            # Only re-decode once at least half a second of new audio arrived
+            if audio is None or len(audio) - decoded_samples < self.rate // 2:
+                continue
+            decoded_samples = len(audio)
+            self._update(audio)
+
+    def start(self, get_audio):
+        """
+        Start decoding in the background.
+
+        Args:
+            get_audio: Callable returning the audio recorded so far,
+                or None if recording has not started yet
+        """
+        self.cancel()
+        self._reset()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(get_audio,),
+                                        name='StreamingSTT', daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        """Stop the background thread without a final decode."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def stop(self):
+        """
+        Stop the background thread and hand over what was committed.
+
+        Returns:
+            (committed words, committed samples) to pass to finish(), so the
+            next utterance can start streaming before this one is finished
+        """
+        self.cancel()
+        with self._lock:
+            return list(self.committed_words), self.committed_samples
+
+    def finish(self, audio, state=None):
+        """
+        Stop streaming and return the full transcript.
+
+        Args:
+            audio: Complete recording of the utterance (float32 as recorded
+                by Microphone, int16 or bytes)
+            state: Result of stop() for this utterance (default: stop now)
+
+        Returns:
+            Transcribed text
+        """
+        if state is None:
+            state = self.stop()
+        committed_words, committed_samples = state
+        if isinstance(audio, bytes):
+            audio = np.frombuffer(audio, dtype=np.int16)
+        tail = audio[committed_samples:]
+        if len(tail) > 0:
+            tail_words = self.stt.transcribe(tail).split()
+        else:
+            tail_words = []
+        return " ".join(committed_words + tail_words)
@@ -0,0 +1,140 @@
+import os
+import re
+import time
+import wave
+import itertools
+import numpy as np
+import yaml
+from pathlib import Path
+
+COMPUTE_TYPES = ["int8", "int8_float32", "float32"]
+BEAM_SIZES = [1, 2, 5]
+
+
+def normalize_words(text):
+    """Lowercase and strip punctuation for WER scoring."""
+    return re.sub(r"[^\w\s]", " ", text.lower()).split()
+
+
+def word_error_rate(reference, hypothesis):
+    """
+    Compute word error rate with a word-level Levenshtein distance.
+
+    Args:
+        reference: Expected transcript
+        hypothesis: Transcribed text
+
+    Returns:
+        (substitutions + deletions + insertions) / reference word count
+    """
+    ref = normalize_words(reference)
+    hyp = normalize_words(hypothesis)
+    if not ref:
+        return 0.0 if not hyp else 1.0
+
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i] + [0] * len(hyp)
+        for j, hyp_word in enumerate(hyp, 1):
+            current[j] = min(
+                previous[j] + 1,       # deletion
+                current[j - 1] + 1,    # insertion
+                previous[j - 1] + (ref_word != hyp_word)  # substitution
+            )
+        previous = current
+    return previous[-1] / len(ref)
+
+
+def load_fixtures(fixtures_dir):
+    """
+    Load WAV fixtures with reference transcripts.
+
+    Each `name.wav` (16 kHz mono 16-bit) needs a `name.txt` next to it
+    holding the expected transcript.
+
+    Returns:
+        List of (name, int16 audio, reference text)
+    """
+    fixtures = []
+    for wav_path in sorted(Path(fixtures_dir).glob("*.wav")):
+        txt_path = wav_path.with_suffix(".txt")
+        if not txt_path.exists():
+            print(f"⚠️  Skipping {wav_path.name}: no {txt_path.name} reference")
+            continue
+        with wave.open(str(wav_path), "rb") as wf:
+            if wf.getframerate() != 16000 or wf.getnchannels() != 1 or wf.getsampwidth() != 2:
+                raise ValueError(f"{wav_path.name} must be 16 kHz mono 16-bit PCM")
+            audio = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+        fixtures.append((wav_path.stem, audio, txt_path.read_text(encoding="utf-8").strip()))
+    return fixtures
+
+
+def candidate_profiles(quick=False):
+    """
+    Build the grid of decoding profiles to try.
+
+    Args:
+        quick: Only try greedy decoding with every compute type
+
+    Returns:
+        List of profile dicts accepted by FasterWhisperSTT
+    """
+    cores = os.cpu_count() or 4
+    thread_counts = sorted({cores, max(1, cores // 2)})
+    beam_sizes = [1] if quick else BEAM_SIZES
+    profiles = []
+    for compute_type, cpu_threads, beam_size in itertools.product(COMPUTE_TYPES, thread_counts, beam_sizes):
+        profiles.append({
+            "compute_type": compute_type,
+            "cpu_threads": cpu_threads,
+            "num_workers": 1,
+            "beam_size": beam_size,
+            "best_of": beam_size,
+            "temperature": 0.0 if beam_size == 1 else [0.0, 0.2, 0.4, 0.6, 0.8, 1.0],
+            "condition_on_previous_text": False,
+        })
+    return profiles
+
+
+def evaluate(stt, fixtures):
+    """
+    Transcribe every fixture and score speed and accuracy.
+
+    Returns:
+        Dict with real-time factor (decode time / audio time) and mean WER
+    """
+    decode_seconds = 0.0
+    audio_seconds = 0.0
+    errors = []
+    for _, audio, reference in fixtures:
+        start = time.perf_counter()
+        text = stt.transcribe(audio)
+        decode_seconds += time.perf_counter() - start
+        audio_seconds += len(audio) / 16000
+        errors.append(word_error_rate(reference, text))
+    return {
+        "rtf": decode_seconds / audio_seconds if audio_seconds else 0.0,
+        "wer": sum(errors) / len(errors) if errors else 0.0,
+    }
+
+
+def choose_best(results, wer_tolerance=0.02):
+    """
+    Pick the fastest profile whose WER is within `wer_tolerance` of the best WER.
+
+    Args:
+        results: List of (profile, scores) tuples
+
+    Returns:
+        The selected (profile, scores) tuple
+    """
+    best_wer = min(scores["wer"] for _, scores in results)
+    eligible = [item for item in results if item[1]["wer"] <= best_wer + wer_tolerance]
+    return min(eligible, key=lambda item: item[1]["rtf"])
+
+
+def write_profile(profile, path):
+    """Write the chosen profile as an `stt:` override read by config/settings.py."""
+    with open(path, "w") as f:
+        f.write("# Generated by genio-tune-stt for this board. Delete to use config.yaml values.\n")
+        yaml.safe_dump({"stt": profile}, f, sort_keys=False)
@@ -0,0 +1,238 @@
+import os
+import re
+import csv
+import json
+import time
+import wave
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from .cache import cache_key
+
+MANIFEST_NAME = 'manifest.json'
+FORMATS = ('wav', 'pcm')
+
+# The voice each pool worker loads once and keeps for all of its phrases
+_worker_tts = None
+
+
+def phrase_id(text):
+    """Derive a file-name friendly id from phrase text."""
+    slug = re.sub(r'[^\w]+', '_', text.lower()).strip('_')
+    return slug[:48].rstrip('_') or 'phrase'
+
+
+def load_phrases(path):
+    """
+    Read a phrase list.
+
+    Supported formats:
+        .txt   One phrase per line; blank lines and lines starting with # are skipped
+        .csv   A "text" column and an optional "id" column (without a header
+               row, the first column is the text)
+        .yaml  A list of phrases or of {id, text} mappings, or an id -> text mapping
+
+    Phrases without an id get one derived from their text; repeated ids
+    are numbered.
+
+    Returns:
+        List of (id, text)
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix in ('.yaml', '.yml'):
+        import yaml
+        data = yaml.safe_load(path.read_text(encoding='utf-8')) or []
+        if isinstance(data, dict):
+            entries = [(str(key), value) for key, value in data.items()]
+        else:
+            entries = [(item.get('id'), item.get('text')) if isinstance(item, dict) else (None, item)
+                       for item in data]
+    elif suffix == '.csv':
+        with open(path, newline='', encoding='utf-8') as f:
+            rows = [row for row in csv.reader(f) if row]
+        if rows and 'text' in [cell.strip().lower() for cell in rows[0]]:
+            header = [cell.strip().lower() for cell in rows.pop(0)]
+            text_column = header.index('text')
+            id_column = header.index('id') if 'id' in header else None
+            entries = [(row[id_column] if id_column is not None else None, row[text_column])
+                       for row in rows]
+        else:
+            entries = [(None, row[0]) for row in rows]
+    else:
+        lines = path.read_text(encoding='utf-8').splitlines()
+        entries = [(None, line) for line in lines if line.strip() and not line.lstrip().startswith('#')]
+
+    phrases = []
+    seen = {}
+    for name, text in entries:
+        text = str(text or '').strip()
+        if not text:
+            continue
+        name = str(name).strip() if name else phrase_id(text)
+        seen[name] = seen.get(name, 0) + 1
+        if seen[name] > 1:
+            name = f"{name}_{seen[name]}"
+        phrases.append((name, text))
+    return phrases
+
+
+def load_manifest(output_dir):
+    """Return the manifest in output_dir, or an empty one."""
+    path = Path(output_dir) / MANIFEST_NAME
+    if not path.exists():
+        return {'entries': {}}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_manifest(output_dir, manifest):
+    """Replace the manifest atomically, so an interrupted run never leaves half a file."""
+    fd, tmp_path = tempfile.mkstemp(dir=output_dir, suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+    os.replace(tmp_path, Path(output_dir) / MANIFEST_NAME)
+
+
+def plan(phrases, manifest, voice_id, output_dir, fmt='wav', force=False):
+    """
+    Split phrases into those to render and those already rendered.
+
+    A phrase is skipped when the manifest has an entry for its id with the
+    same text+voice hash and the same format, and the file is still there.
+
+    Returns:
+        (jobs, skipped): jobs are (id, text, hash, file name) tuples,
+        skipped are ids
+    """
+    entries = manifest.get('entries', {})
+    jobs, skipped = [], []
+    for name, text in phrases:
+        digest = cache_key(voice_id, text)
+        filename = f"{name}.{fmt}"
+        entry = entries.get(name)
+        if (not force and entry is not None and entry.get('hash') == digest
+                and entry.get('file') == filename and (Path(output_dir) / filename).exists()):
+            skipped.append(name)
+        else:
+            jobs.append((name, text, digest, filename))
+    return jobs, skipped
+
+
+def write_audio(path, audio, sample_rate, fmt='wav'):
+    """Write int16 audio as a mono WAV file or as raw little-endian PCM."""
+    path = Path(path)
+    tmp_path = path.with_name(path.name + '.tmp')
+    if fmt == 'wav':
+        with wave.open(str(tmp_path), 'wb') as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(sample_rate)
+            wav_file.writeframes(audio.astype('<i2', copy=False).tobytes())
+    elif fmt == 'pcm':
+        tmp_path.write_bytes(audio.astype('<i2', copy=False).tobytes())
+    else:
+        raise ValueError(f"Unknown output format '{fmt}'")
+    os.replace(tmp_path, path)
+
+
+def _open_voice(model_path, config_path, use_python_api=True):
+    """Create a PiperTTS that never plays anything."""
+    from .tts_engine import PiperTTS
+    try:
+        from audio.sinks import NullSink
+    except ImportError:
+        # Imported as src.tts
+        from ..audio.sinks import NullSink
+    return PiperTTS(model_path, config_path=config_path, use_python_api=use_python_api, sink=NullSink())
+
+
+def _init_worker(model_path, config_path):
+    """Pool initializer: load the voice once per worker process."""
+    global _worker_tts
+    _worker_tts = _open_voice(model_path, config_path)
+
+
+def _render(text, path, fmt):
+    """Synthesize one phrase in a worker and write it to path."""
+    start = time.perf_counter()
+    audio, sample_rate = _worker_tts.synthesize(text)
+    write_audio(path, audio, sample_rate, fmt)
+    return {
+        'sample_rate': sample_rate,
+        'samples': len(audio),
+        'synthesis_seconds': round(time.perf_counter() - start, 3),
+    }
+
+
+def render_batch(phrases, output_dir, model_path, config_path=None, fmt='wav',
+                 workers=None, force=False, progress=None):
+    """
+    Render phrases to audio files with a pool of Piper worker processes.
+
+    Every worker loads the voice once and synthesizes phrases until the
+    list is done, so the model load is paid once per core rather than once
+    per phrase. Phrases already in the manifest with the same text and
+    voice are skipped. The manifest is rewritten after every finished
+    phrase, so an interrupted run resumes where it stopped.
+
+    Args:
+        phrases: List of (id, text), see load_phrases()
+        output_dir: Directory for the audio files and manifest.json
+        model_path: Piper ONNX model
+        config_path: Piper model config JSON (optional)
+        fmt: 'wav' or 'pcm' (raw 16-bit mono, rate in the manifest)
+        workers: Worker processes (default: one per CPU core)
+        force: Render every phrase even if it is up to date
+        progress: Optional callable(id, status, detail) with status
+            'skipped', 'rendered' or 'failed'
+
+    Returns:
+        Summary dict with rendered/skipped/failed counts and timings
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown output format '{fmt}'")
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    # Only fingerprints the model; the voice is loaded by the workers
+    voice_id = _open_voice(model_path, config_path, use_python_api=False).voice_id
+    manifest = load_manifest(output_dir)
+    manifest['voice_id'] = voice_id
+    manifest['model'] = Path(model_path).name
+    entries = manifest.setdefault('entries', {})
+
+    jobs, skipped = plan(phrases, manifest, voice_id, output_dir, fmt, force)
+    for name in skipped:
+        if progress:
+            progress(name, 'skipped', None)
+
+    summary = {'rendered': 0, 'skipped': len(skipped), 'failed': 0, 'audio_seconds': 0.0}
+    start = time.perf_counter()
+    if jobs:
+        workers = min(workers or os.cpu_count() or 1, len(jobs))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(str(model_path), str(config_path) if config_path else None)) as pool:
+            futures = {
+                pool.submit(_render, text, str(output_dir / filename), fmt): (name, text, digest, filename)
+                for name, text, digest, filename in jobs
+            }
+            for future in as_completed(futures):
+                name, text, digest, filename = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    summary['failed'] += 1
+                    if progress:
+                        progress(name, 'failed', e)
+                    continue
+                entries[name] = dict(result, text=text, hash=digest, file=filename, format=fmt)
+                write_manifest(output_dir, manifest)
+                summary['rendered'] += 1
+                summary['audio_seconds'] += result['samples'] / result['sample_rate']
+                if progress:
+                    progress(name, 'rendered', result)
+    write_manifest(output_dir, manifest)
+    summary['seconds'] = round(time.perf_counter() - start, 2)
+    summary['audio_seconds'] = round(summary['audio_seconds'], 2)
+    summary['workers'] = workers if jobs else 0
+    return summary
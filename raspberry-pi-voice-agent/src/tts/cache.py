@@ -0,0 +1,187 @@
+import os
+import hashlib
+import threading
+import tempfile
+import numpy as np
+from collections import OrderedDict
+from pathlib import Path
+
+
+def cache_key(voice_id, text):
+    """
+    Build a cache key for synthesized audio.
+    
+    Args:
+        voice_id: Fingerprint of the voice model and its configuration
+        text: Text that was synthesized
+        
+    Returns:
+        Hex digest identifying the (voice, config, text) combination
+    """
+    digest = hashlib.sha256()
+    digest.update(voice_id.encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(text.encode('utf-8'))
+    return digest.hexdigest()
+
+
+class AudioCache:
+    """
+    Two-tier cache for synthesized int16 audio.
+    
+    The memory tier is an LRU limited by a byte budget. The optional disk
+    tier stores raw PCM files that are memory-mapped on lookup, so cached
+    phrases survive restarts without being read into memory up front. It
+    has its own byte budget; beyond it the files least recently written
+    or read from disk (oldest mtime) are deleted.
+    """
+    
+    def __init__(self, cache_dir=None, max_memory_bytes=16 * 1024 * 1024,
+                 max_disk_bytes=256 * 1024 * 1024):
+        """
+        Initialize the audio cache.
+        
+        Args:
+            cache_dir: Directory for the disk tier (None disables it)
+            max_memory_bytes: Byte budget for the in-memory LRU (default: 16 MB)
+            max_disk_bytes: Byte budget for the disk tier (default: 256 MB)
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.memory_bytes = 0
+        self.disk_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'disk_evictions': 0,
+            'stores': 0,
+        }
+        
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self.disk_bytes = sum(path.stat().st_size for path in self.cache_dir.glob('*.pcm'))
+            # Apply a budget lowered since the last run
+            self._evict_disk()
+    
+    def _disk_path(self, key):
+        return self.cache_dir / f"{key}.pcm"
+    
+    def _remember(self, key, audio):
+        """Insert into the memory tier and evict least recently used entries."""
+        if audio.nbytes > self.max_memory_bytes:
+            return
+        if key in self._entries:
+            self.memory_bytes -= self._entries.pop(key).nbytes
+        self._entries[key] = audio
+        self.memory_bytes += audio.nbytes
+        while self.memory_bytes > self.max_memory_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.memory_bytes -= evicted.nbytes
+            self.stats['evictions'] += 1
+    
+    def _evict_disk(self):
+        """Delete the oldest disk entries until the disk tier fits its budget."""
+        if self.disk_bytes <= self.max_disk_bytes:
+            return
+        entries = []
+        for path in self.cache_dir.glob('*.pcm'):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        for _, size, path in entries:
+            if self.disk_bytes <= self.max_disk_bytes:
+                break
+            # Arrays already mapped from it stay valid after the unlink
+            path.unlink(missing_ok=True)
+            self.disk_bytes -= size
+            self.stats['disk_evictions'] += 1
+    
+    def get(self, key):
+        """
+        Look up cached audio.
+        
+        Args:
+            key: Cache key from cache_key()
+            
+        Returns:
+            Read-only int16 numpy array, or None on a miss
+        """
+        with self._lock:
+            audio = self._entries.get(key)
+            if audio is not None:
+                self._entries.move_to_end(key)
+                self.stats['memory_hits'] += 1
+                return audio
+            
+            if self.cache_dir is not None:
+                path = self._disk_path(key)
+                if path.exists() and path.stat().st_size > 0:
+                    audio = np.memmap(path, dtype=np.int16, mode='r')
+                    os.utime(path)  # Recently used, evict it last
+                    self._remember(key, audio)
+                    self.stats['disk_hits'] += 1
+                    return audio
+            
+            self.stats['misses'] += 1
+            return None
+    
+    def put(self, key, audio):
+        """
+        Store synthesized audio in both tiers.
+        
+        Args:
+            key: Cache key from cache_key()
+            audio: int16 numpy array
+        """
+        audio = np.ascontiguousarray(audio, dtype=np.int16)
+        if audio.size == 0:
+            return
+        audio.flags.writeable = False
+        
+        with self._lock:
+            self._remember(key, audio)
+            self.stats['stores'] += 1
+            
+            if self.cache_dir is not None:
+                path = self._disk_path(key)
+                if not path.exists() and audio.nbytes <= self.max_disk_bytes:
+                    # Write atomically so a crash never leaves a truncated entry
+                    fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+                    with os.fdopen(fd, 'wb') as f:
+                        f.write(audio.tobytes())
+                    os.replace(tmp_path, path)
+                    self.disk_bytes += audio.nbytes
+                    self._evict_disk()
+    
+    def clear(self, disk=False):
+        """
+        Empty the memory tier, and optionally delete the disk tier.
+        
+        Args:
+            disk: Also remove cached PCM files (default: False)
+        """
+        with self._lock:
+            self._entries.clear()
+            self.memory_bytes = 0
+            if disk and self.cache_dir is not None:
+                for path in self.cache_dir.glob('*.pcm'):
+                    path.unlink()
+                self.disk_bytes = 0
+    
+    def get_stats(self):
+        """Return a snapshot of hit/miss/eviction counters and memory use."""
+        with self._lock:
+            stats = dict(self.stats)
+            stats['hits'] = stats['memory_hits'] + stats['disk_hits']
+            stats['entries'] = len(self._entries)
+            stats['memory_bytes'] = self.memory_bytes
+            stats['disk_bytes'] = self.disk_bytes
+            return stats
@@ -0,0 +1,108 @@
+import re
+from string import Formatter
+import numpy as np
+
+
+class SpeechTemplate:
+    """
+    A phrase made of fixed text and {slots}, e.g. "Du sa: {command}".
+
+    The fixed fragments are synthesized once and reused; only the slot
+    values need synthesis when the phrase is spoken. match() recognizes
+    the filled-in phrase, so callers can keep passing plain text.
+    """
+
+    def __init__(self, name, template):
+        """
+        Args:
+            name: Name the template is registered under
+            template: str.format-style text with named slots
+        """
+        self.name = name
+        self.template = template
+        self.parts = []  # ('text', fragment) and ('slot', name) in speaking order
+        pattern = ''
+        for literal, field, _, _ in Formatter().parse(template):
+            if literal:
+                pattern += re.escape(literal)
+                if literal.strip():
+                    self.parts.append(('text', literal.strip()))
+            if field is not None:
+                if not field.isidentifier():
+                    raise ValueError(f"Template slots must be named: {template!r}")
+                pattern += f'(?P<{field}>.+?)'
+                self.parts.append(('slot', field))
+        self._pattern = re.compile(pattern + r'\Z', re.DOTALL)
+
+    @property
+    def fragments(self):
+        """Fixed texts to pre-render."""
+        return [value for kind, value in self.parts if kind == 'text']
+
+    def match(self, text):
+        """
+        Return the slot values if `text` is this template filled in, else None.
+        """
+        match = self._pattern.match(text.strip())
+        if match is None or not all(value.strip() for value in match.groupdict().values()):
+            return None
+        return {name: value.strip() for name, value in match.groupdict().items()}
+
+
+def trim_silence(audio, threshold=300, keep=0):
+    """
+    Cut leading and trailing near-silence from int16 audio.
+
+    Args:
+        audio: int16 numpy array
+        threshold: Absolute sample level counted as sound (300 is about -40 dBFS)
+        keep: Samples of silence to leave on each side
+
+    Returns:
+        A view into `audio`
+    """
+    loud = np.flatnonzero(np.abs(audio.astype(np.int32)) > threshold)
+    if len(loud) == 0:
+        return audio[:0]
+    return audio[max(0, loud[0] - keep):loud[-1] + 1 + keep]
+
+
+def crossfade_blocks(segments, fade, block_frames=1024):
+    """
+    Join audio segments with linear crossfades and yield playback blocks.
+
+    Each segment is yielded as soon as it is available, except for its
+    last `fade` samples, which are held back to blend into the next one.
+    Segments may be callables that return the audio (e.g. a pending
+    synthesis), so later pieces can still be rendering while the first
+    one plays.
+
+    Args:
+        segments: int16 numpy arrays, or callables returning them
+        fade: Crossfade length in samples
+        block_frames: Maximum samples per yielded block
+
+    Yields:
+        int16 numpy arrays
+    """
+    def blocks(audio):
+        for start in range(0, len(audio), block_frames):
+            yield audio[start:start + block_frames]
+
+    pending = None
+    for segment in segments:
+        audio = segment() if callable(segment) else segment
+        if pending is not None and len(pending) and len(audio):
+            n = min(len(pending), len(audio))
+            ramp = np.linspace(0.0, 1.0, n, dtype=np.float32)
+            joined = pending[len(pending) - n:] * (1.0 - ramp) + audio[:n] * ramp
+            yield from blocks(pending[:len(pending) - n])
+            yield np.clip(np.rint(joined), -32768, 32767).astype(np.int16)
+            audio = audio[n:]
+        elif pending is not None:
+            yield from blocks(pending)
+        cut = max(0, len(audio) - fade)
+        yield from blocks(audio[:cut])
+        pending = audio[cut:]
+    if pending is not None:
+        yield from blocks(pending)
@@ -0,0 +1,31 @@
+import re
+
+# Sentence boundaries, and clause boundaries used to break up long sentences
+_SENTENCE_END = re.compile(r'(?<=[.!?…])\s+')
+_CLAUSE_END = re.compile(r'(?<=[,;:])\s+')
+
+
+def split_sentences(text, max_chars=120):
+    """
+    Split text into sentences for pipelined synthesis.
+    
+    Sentences longer than max_chars are further split at clause
+    boundaries (comma, semicolon, colon) so the first chunk stays short.
+    
+    Args:
+        text: Text to split
+        max_chars: Maximum sentence length before clause splitting
+        
+    Returns:
+        List of non-empty text chunks in speaking order
+    """
+    chunks = []
+    for sentence in _SENTENCE_END.split(text.strip()):
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        if len(sentence) > max_chars:
+            chunks.extend(clause.strip() for clause in _CLAUSE_END.split(sentence) if clause.strip())
+        else:
+            chunks.append(sentence)
+    return chunks
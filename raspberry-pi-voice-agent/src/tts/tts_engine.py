@@ -1,15 +1,34 @@
 import subprocess
 import wave
 import io
-import sounddevice as sd
+import queue
+import threading
+import time
+from contextlib import nullcontext
 import numpy as np
 from pathlib import Path
+from .text import split_sentences
+from .cache import cache_key
+from .templates import SpeechTemplate, trim_silence, crossfade_blocks
+from .voices import VoiceRegistry
+
+try:
+    from piper.voice import PiperVoice
+except ImportError:
+    PiperVoice = None
+
+try:
+    # piper-tts 1.3+
+    from piper import SynthesisConfig
+except ImportError:
+    SynthesisConfig = None
 
 
 class PiperTTS:
     """Piper TTS engine for high-quality local text-to-speech synthesis."""
     
-    def __init__(self, model_path, config_path=None, language='sv'):
+    def __init__(self, model_path, config_path=None, language='sv', use_python_api=True, cache=None, sink=None,
+                 voices=None, voice=None):
         """
         Initialize Piper TTS engine.
         
@@ -17,14 +36,254 @@ class PiperTTS:
             model_path: Path to the Piper ONNX model file
             config_path: Path to the model config JSON file (optional)
             language: Language code (default: 'sv' for Swedish)
+            use_python_api: Load the voice once in-process with piper-tts
+                (default: True). Falls back to the piper binary if the
+                piper-tts package is not installed.
+            sink: audio.sinks.AudioSink to play speech on (default: the
+                sound card through sounddevice)
+            voices: tts.voices.VoiceRegistry with further voices to
+                switch to with select_voice()
+            voice: Name of the voice to start with; model_path and
+                config_path are registered under this name unless the
+                registry already has it (default: the model file name)
         """
-        self.model_path = Path(model_path)
-        self.config_path = Path(config_path) if config_path else None
         self.language = language
-        self.sample_rate = 22050  # Default Piper sample rate
+        self.voices = voices if voices is not None else VoiceRegistry()
+        name = voice or Path(model_path).name.split('.')[0]
+        if name not in self.voices:
+            self.voices.add(name, model_path, config_path)
+        self.use_python_api = use_python_api and PiperVoice is not None
+        self.voice = None
+        self.cache = cache
+        if sink is None:
+            try:
+                from audio.sinks import SoundDeviceSink
+            except ImportError:
+                # Imported as src.tts
+                from ..audio.sinks import SoundDeviceSink
+            # Does not touch the sound card until the first utterance
+            sink = SoundDeviceSink()
+        self.sink = sink
+        self.on_playback = None  # Called with (samples, sample_rate, latency) before audio is played
+        self.is_speaking = False
+        self.tracer = None  # Optional utils.tracing.Tracer for latency spans
+        self._interrupted = threading.Event()
+        self._speak_started = None
+        self.templates = {}  # name -> (SpeechTemplate, pre-rendered fragments, crossfade samples)
+        self._voice_lock = threading.Lock()  # Held while speaking, so voices switch between utterances
+        
+        self._activate(self.voices.get(name))
+        
+        if self.use_python_api:
+            self.load()
+    
+    def _activate(self, voice):
+        """Make `voice` the one used for synthesis."""
+        self.active_voice = voice
+        self.model_path = voice.model_path
+        self.config_path = voice.config_path
+        self.sample_rate = voice.sample_rate
+        self.voice_id = voice.fingerprint
+        self.voice = voice.model
+    
+    def _load_model(self, voice):
+        """Load a voice's ONNX model unless it is already in memory."""
+        with voice.lock:
+            if voice.model is None:
+                config_path = str(voice.config_path) if voice.config_path else None
+                voice.model = PiperVoice.load(str(voice.model_path), config_path=config_path)
+        return voice.model
+    
+    def load(self):
+        """
+        Load the Piper voice into memory.
+        
+        The ONNX session is created once and reused for every utterance,
+        so only the first call pays the model load time.
+        
+        Returns:
+            The loaded PiperVoice instance
+        """
+        if self.voice is None:
+            self.voice = self._load_model(self.active_voice)
+        return self.voice
+    
+    def preload(self):
+        """Load every registered voice, so select_voice() does not wait for a model load."""
+        if self.use_python_api:
+            for voice in self.voices:
+                self._load_model(voice)
+    
+    def select_voice(self, name):
+        """
+        Switch to another registered voice.
+        
+        Waits for the utterance being spoken to finish. Template fragments
+        are rendered again in the new voice.
+        
+        Args:
+            name: Voice name in the registry
+        """
+        voice = self.voices.get(name)
+        with self._voice_lock:
+            if voice is self.active_voice:
+                return
+            previous_rate = self.sample_rate
+            self._activate(voice)
+            if self.use_python_api:
+                self.load()
+            for template_name, (template, _, fade) in list(self.templates.items()):
+                fragments = {text: self._render_fragment(text) for text in template.fragments}
+                self.templates[template_name] = (template, fragments, fade * self.sample_rate // previous_rate)
+    
+    def _synthesis_options(self):
+        """Speaker and inference settings of the active voice."""
+        voice = self.active_voice
+        return {
+            'speaker_id': voice.speaker_id,
+            'length_scale': voice.length_scale,
+            'noise_scale': voice.noise_scale,
+            'noise_w': voice.noise_w,
+        }
+    
+    @property
+    def backend(self):
+        """Name of the active synthesis backend ('python' or 'subprocess')."""
+        return 'python' if self.voice is not None else 'subprocess'
+    
+    def _synthesize_voice(self, text):
+        """Yield raw 16-bit PCM chunks from the in-process voice."""
+        options = self._synthesis_options()
+        if hasattr(self.voice, 'synthesize_stream_raw'):
+            # piper-tts 1.2.x
+            yield from self.voice.synthesize_stream_raw(text, **options)
+        else:
+            # piper-tts 1.3+ yields AudioChunk objects
+            options['noise_w_scale'] = options.pop('noise_w')
+            syn_config = SynthesisConfig(**options) if SynthesisConfig is not None else None
+            for chunk in self.voice.synthesize(text, syn_config=syn_config):
+                yield chunk.audio_int16_bytes
+    
+    def _piper_command(self):
+        """Build the piper command line for raw 16-bit PCM output."""
+        cmd = ['piper', '--model', str(self.model_path), '--output-raw']
+        
+        if self.config_path and self.config_path.exists():
+            cmd.extend(['--config', str(self.config_path)])
+        
+        options = self._synthesis_options()
+        if options['speaker_id'] is not None:
+            cmd.extend(['--speaker', str(options['speaker_id'])])
+        cmd.extend([
+            '--length_scale', str(options['length_scale']),
+            '--noise_scale', str(options['noise_scale']),
+            '--noise_w', str(options['noise_w']),
+        ])
         
-        if not self.model_path.exists():
-            raise FileNotFoundError(f"Piper model not found at {self.model_path}")
+        return cmd
+    
+    def _synthesize_subprocess(self, text):
+        """Run the piper binary once for the given text and return raw PCM bytes."""
+        # Run Piper and capture output
+        process = subprocess.Popen(
+            self._piper_command(),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+        
+        # Send text and get audio output
+        audio_data, error = process.communicate(input=text.encode('utf-8'))
+        
+        if process.returncode != 0:
+            raise RuntimeError(f"Piper TTS error: {error.decode('utf-8')}")
+        
+        return audio_data
+    
+    def _stream_subprocess(self, text, block_bytes):
+        """Yield raw PCM blocks from piper's stdout as they are written."""
+        process = subprocess.Popen(
+            self._piper_command(),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+        try:
+            process.stdin.write(text.encode('utf-8'))
+            process.stdin.close()
+            
+            while True:
+                block = process.stdout.read(block_bytes)
+                if not block:
+                    break
+                yield block
+            
+            process.wait()
+            if process.returncode != 0:
+                raise RuntimeError(f"Piper TTS error: {process.stderr.read().decode('utf-8')}")
+        finally:
+            # Consumer stopped early or synthesis failed
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            process.stdout.close()
+            process.stderr.close()
+    
+    def stream(self, text, block_frames=1024):
+        """
+        Synthesize text and yield audio blocks as soon as Piper produces them.
+        
+        Memory use stays bounded by the block size regardless of text length
+        when the piper binary is used; the in-process voice yields one
+        sentence at a time, sliced into blocks without copying. Cached
+        phrases are served straight from the cache.
+        
+        Args:
+            text: Text to synthesize
+            block_frames: Samples per yielded block (default: 1024)
+            
+        Yields:
+            int16 numpy arrays of at most block_frames samples
+        """
+        key = None
+        if self.cache is not None:
+            key = cache_key(self.voice_id, text)
+            cached = self.cache.get(key)
+            if cached is not None:
+                yield from self._blocks(cached, block_frames)
+                return
+        
+        # Blocks are only kept for the cache; completed streams are stored
+        rendered = [] if key is not None else None
+        for block in self._stream_blocks(text, block_frames):
+            if rendered is not None:
+                rendered.append(block)
+            yield block
+        
+        if rendered:
+            self.cache.put(key, np.concatenate(rendered))
+    
+    @staticmethod
+    def _blocks(audio, block_frames):
+        """Slice audio into views of at most block_frames samples."""
+        for start in range(0, len(audio), block_frames):
+            yield audio[start:start + block_frames]
+    
+    def _stream_blocks(self, text, block_frames):
+        """Yield freshly synthesized int16 blocks from the active backend."""
+        block_bytes = block_frames * 2
+        if self.voice is not None:
+            for chunk in self._synthesize_voice(text):
+                yield from self._blocks(np.frombuffer(chunk, dtype=np.int16), block_frames)
+        else:
+            pending = b''
+            for block in self._stream_subprocess(text, block_bytes):
+                # A pipe read can end on an odd byte; carry it to the next block
+                block = pending + block
+                usable = len(block) - (len(block) % 2)
+                pending = block[usable:]
+                if usable:
+                    yield np.frombuffer(block[:usable], dtype=np.int16)
     
     def synthesize(self, text):
         """
@@ -36,47 +295,227 @@ class PiperTTS:
         Returns:
             Tuple of (audio_data, sample_rate)
         """
+        key = None
+        if self.cache is not None:
+            key = cache_key(self.voice_id, text)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached, self.sample_rate
+        
         try:
-            # Build Piper command
-            cmd = ['piper', '--model', str(self.model_path), '--output-raw']
-            
-            if self.config_path and self.config_path.exists():
-                cmd.extend(['--config', str(self.config_path)])
-            
-            # Run Piper and capture output
-            process = subprocess.Popen(
-                cmd,
-                stdin=subprocess.PIPE,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE
-            )
-            
-            # Send text and get audio output
-            audio_data, error = process.communicate(input=text.encode('utf-8'))
-            
-            if process.returncode != 0:
-                raise RuntimeError(f"Piper TTS error: {error.decode('utf-8')}")
+            if self.voice is not None:
+                audio_data = b''.join(self._synthesize_voice(text))
+            else:
+                audio_data = self._synthesize_subprocess(text)
             
             # Convert raw audio to numpy array
             audio_array = np.frombuffer(audio_data, dtype=np.int16)
             
+            if key is not None:
+                self.cache.put(key, audio_array)
+            
             return audio_array, self.sample_rate
             
         except Exception as e:
             raise RuntimeError(f"Failed to synthesize speech: {str(e)}")
     
-    def speak(self, text):
+    def speak(self, text, stream=False):
         """
         Synthesize and play text to speech.
         
         Args:
             text: Text to speak
+            stream: Pipeline synthesis sentence by sentence (default: False)
         """
-        audio_data, sample_rate = self.synthesize(text)
+        with self._voice_lock:
+            self.is_speaking = True
+            self._speak_started = time.monotonic()
+            try:
+                with self.tracer.span('tts_total') if self.tracer else nullcontext():
+                    for template, fragments, fade in self.templates.values():
+                        values = template.match(text)
+                        if values is not None:
+                            self._speak_template(template, fragments, fade, values)
+                            return
+                    if stream:
+                        self.speak_streaming(text)
+                        return
+                    
+                    audio_data, sample_rate = self.synthesize(text)
+                    self._play(self._blocks(audio_data, 1024), sample_rate)
+            finally:
+                self.is_speaking = False
+                self._speak_started = None
+    
+    def add_template(self, name, template, crossfade_ms=15):
+        """
+        Register a phrase template and pre-render its fixed fragments.
+        
+        speak() then recognizes the filled-in phrase and only synthesizes
+        the slot values; the cached prefix starts playing right away.
+        
+        Args:
+            name: Template name
+            template: Text with named slots, e.g. "Du sa: {command}"
+            crossfade_ms: Length of the crossfade between fragments
+        """
+        template = SpeechTemplate(name, template)
+        fragments = {text: self._render_fragment(text) for text in template.fragments}
+        self.templates[name] = (template, fragments, int(self.sample_rate * crossfade_ms / 1000))
+        return template
+    
+    def speak_template(self, name, **values):
+        """Speak a registered template with its slots filled in."""
+        self.speak(self.templates[name][0].template.format(**values))
+    
+    def _render_fragment(self, text):
+        """Synthesize a template piece without the silence Piper pads it with."""
+        audio, _ = self.synthesize(text)
+        # Keep a breath of silence so words at the seams are not clipped
+        return trim_silence(audio, keep=int(self.sample_rate * 0.02))
+    
+    def _render_slots(self, texts):
+        """
+        Synthesize slot values in order on a background thread.
+        
+        Returns:
+            One callable per text that waits for its audio
+        """
+        results = [None] * len(texts)
+        done = [threading.Event() for _ in texts]
+        
+        def render():
+            for i, text in enumerate(texts):
+                try:
+                    results[i] = self._render_fragment(text)
+                except Exception as e:
+                    results[i] = e
+                done[i].set()
+        
+        threading.Thread(target=render, name='PiperSlots', daemon=True).start()
+        
+        def waiter(i):
+            def wait():
+                done[i].wait()
+                if isinstance(results[i], Exception):
+                    raise results[i]
+                return results[i]
+            return wait
+        return [waiter(i) for i in range(len(texts))]
+    
+    def _speak_template(self, template, fragments, fade, values):
+        """Play cached fragments while the slot values are synthesized, crossfading the seams."""
+        slots = iter(self._render_slots([values[value] for kind, value in template.parts if kind == 'slot']))
+        segments = [fragments[value] if kind == 'text' else next(slots) for kind, value in template.parts]
+        self._play(crossfade_blocks(segments, fade), self.sample_rate)
+    
+    def _first_audio(self):
+        """Record time to first audio for the utterance being spoken."""
+        started = self._speak_started
+        if self.tracer and started is not None:
+            self.tracer.record('tts_first_audio', time.monotonic() - started, start=started)
+            self._speak_started = None
+    
+    def _play(self, blocks, sample_rate):
+        """
+        Play int16 blocks on the sink until they run out or speech is interrupted.
         
-        # Play audio using sounddevice
-        sd.play(audio_data, sample_rate)
-        sd.wait()  # Wait until audio is finished playing
+        Args:
+            blocks: Iterable of int16 numpy arrays
+            sample_rate: Sample rate of the blocks in Hz
+        """
+        sink = self.sink
+        sink.open(sample_rate)
+        try:
+            for block in blocks:
+                if self._interrupted.is_set():
+                    # Barge-in: drop what is still buffered in the sink
+                    sink.abort()
+                    return
+                if self.on_playback:
+                    self.on_playback(block, sample_rate, sink.latency)
+                sink.write(block)
+                self._first_audio()
+        finally:
+            sink.close()
+    
+    def interrupt(self):
+        """
+        Stop speech in progress from another thread.
+        
+        Audio already queued in the sink is dropped, playback stops before
+        the next block and the sentences not yet synthesized are dropped.
+        """
+        self._interrupted.set()
+        if self.is_speaking:
+            self.sink.abort()
+    
+    def clear_interrupt(self):
+        """
+        Allow speech again after interrupt().
+        
+        speak() does not clear the interrupt itself: one that arrives
+        between picking an utterance and starting it must still stop it.
+        """
+        self._interrupted.clear()
+    
+    def speak_streaming(self, text, max_queued=16, block_frames=1024):
+        """
+        Speak text while synthesizing it sentence by sentence.
+        
+        A background worker renders sentence N+1 while sentence N plays and
+        hands over audio block by block, so time to first audio is the time
+        of Piper's first block rather than the whole synthesis.
+        
+        Args:
+            text: Text to speak
+            max_queued: Maximum number of audio blocks waiting for playback
+            block_frames: Samples per audio block (default: 1024)
+        """
+        sentences = split_sentences(text)
+        if not sentences:
+            return
+        
+        chunks = queue.Queue(maxsize=max_queued)
+        stop = threading.Event()
+        interrupted = self._interrupted
+        
+        def render():
+            try:
+                for sentence in sentences:
+                    if stop.is_set() or interrupted.is_set():
+                        break
+                    for block in self.stream(sentence, block_frames):
+                        if stop.is_set() or interrupted.is_set():
+                            break
+                        chunks.put(block)
+            except Exception as e:
+                chunks.put(e)
+            finally:
+                chunks.put(None)
+        
+        def rendered():
+            while True:
+                item = chunks.get()
+                if item is None:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        
+        worker = threading.Thread(target=render, name='PiperSynthesis', daemon=True)
+        worker.start()
+        
+        try:
+            self._play(rendered(), self.sample_rate)
+        finally:
+            # Unblock the worker if playback stopped early
+            stop.set()
+            while worker.is_alive():
+                try:
+                    chunks.get_nowait()
+                except queue.Empty:
+                    worker.join(timeout=0.05)
     
     def save_to_file(self, text, filename):
         """
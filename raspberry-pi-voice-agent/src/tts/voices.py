@@ -0,0 +1,131 @@
+import json
+import hashlib
+import threading
+from pathlib import Path
+
+DEFAULT_SAMPLE_RATE = 22050
+
+
+class Voice:
+    """
+    One Piper voice: model files plus the settings from its .onnx.json.
+
+    The JSON is parsed once when the voice is registered. Speaker,
+    length_scale, noise_scale and noise_w can be overridden per voice, e.g.
+    a slightly faster variant of the same model.
+    """
+
+    def __init__(self, name, model_path, config_path=None, speaker=None,
+                 length_scale=None, noise_scale=None, noise_w=None):
+        """
+        Args:
+            name: Name the voice is selected by
+            model_path: Piper ONNX model
+            config_path: Model config JSON (default: model_path + '.json')
+            speaker: Speaker name or id for multi-speaker voices
+            length_scale: Speaking rate; > 1.0 is slower (default: from the config)
+            noise_scale: Phoneme noise (default: from the config)
+            noise_w: Phoneme width noise (default: from the config)
+        """
+        self.name = name
+        self.model_path = Path(model_path)
+        if not self.model_path.exists():
+            raise FileNotFoundError(f"Piper model not found at {self.model_path}")
+        self.config_path = Path(config_path) if config_path else \
+            self.model_path.with_name(self.model_path.name + '.json')
+        data = {}
+        if self.config_path.exists():
+            data = json.loads(self.config_path.read_text(encoding='utf-8'))
+        else:
+            self.config_path = None
+
+        audio = data.get('audio', {})
+        inference = data.get('inference', {})
+        self.sample_rate = int(audio.get('sample_rate', DEFAULT_SAMPLE_RATE))
+        self.quality = audio.get('quality')
+        self.language = data.get('language', {}).get('code') or data.get('espeak', {}).get('voice')
+        self.speaker_ids = dict(data.get('speaker_id_map') or {})
+        self.num_speakers = int(data.get('num_speakers', max(1, len(self.speaker_ids))))
+        self.length_scale = float(length_scale if length_scale is not None else inference.get('length_scale', 1.0))
+        self.noise_scale = float(noise_scale if noise_scale is not None else inference.get('noise_scale', 0.667))
+        self.noise_w = float(noise_w if noise_w is not None else inference.get('noise_w', 0.8))
+        self.speaker_id = self.resolve_speaker(speaker)
+        self.fingerprint = self._fingerprint()
+        self.model = None  # Loaded PiperVoice, see PiperTTS.load()
+        self.lock = threading.Lock()
+
+    def resolve_speaker(self, speaker):
+        """
+        Turn a speaker name or id into a speaker id.
+
+        Returns:
+            Integer id, or None for single-speaker voices and no speaker
+        """
+        if speaker is None or speaker == '':
+            return None
+        if isinstance(speaker, int) or str(speaker).isdigit():
+            speaker_id = int(speaker)
+            if not 0 <= speaker_id < self.num_speakers:
+                raise ValueError(f"Voice '{self.name}' has no speaker {speaker_id}")
+            return speaker_id
+        if speaker not in self.speaker_ids:
+            raise ValueError(f"Voice '{self.name}' has no speaker '{speaker}'")
+        return self.speaker_ids[speaker]
+
+    def _fingerprint(self):
+        """Identify the model, its config and the overrides for cache keys."""
+        digest = hashlib.sha256()
+        stat = self.model_path.stat()
+        digest.update(f"{self.model_path.name}:{stat.st_size}:{stat.st_mtime_ns}".encode('utf-8'))
+        if self.config_path is not None:
+            digest.update(self.config_path.read_bytes())
+        digest.update(f"{self.speaker_id}:{self.length_scale}:{self.noise_scale}:{self.noise_w}".encode('utf-8'))
+        return digest.hexdigest()
+
+    def __repr__(self):
+        return f"Voice({self.name!r}, {self.model_path.name}, {self.sample_rate} Hz)"
+
+
+class VoiceRegistry:
+    """Voices by name; each config is read once, models are loaded by PiperTTS."""
+
+    def __init__(self):
+        self._voices = {}
+        self._lock = threading.Lock()
+
+    def add(self, name, model_path, config_path=None, **settings):
+        """
+        Register (or replace) a voice.
+
+        Args:
+            name: Voice name
+            model_path: Piper ONNX model
+            config_path: Model config JSON (default: model_path + '.json')
+            **settings: speaker, length_scale, noise_scale and/or noise_w
+
+        Returns:
+            The Voice
+        """
+        voice = Voice(name, model_path, config_path, **settings)
+        with self._lock:
+            self._voices[name] = voice
+        return voice
+
+    def get(self, name):
+        with self._lock:
+            if name not in self._voices:
+                raise KeyError(f"Unknown voice '{name}' (available: {', '.join(self._voices) or 'none'})")
+            return self._voices[name]
+
+    def __contains__(self, name):
+        with self._lock:
+            return name in self._voices
+
+    def __iter__(self):
+        with self._lock:
+            return iter(list(self._voices.values()))
+
+    @property
+    def names(self):
+        with self._lock:
+            return list(self._voices)
@@ -0,0 +1,57 @@
+import re
+import subprocess
+import sys
+
+# Matches lines printed by `python -X importtime`:
+# "import time:       123 |        456 |   package.module"
+_IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+
+def measure_import_times(modules, python=sys.executable):
+    """
+    Import modules in a fresh interpreter under `-X importtime`.
+
+    Each module is imported separately in the order given, so a module
+    only gets charged for dependencies that earlier modules did not
+    already load. Missing modules are reported instead of failing.
+
+    Args:
+        modules: Module names to import
+        python: Interpreter to run (default: the current one)
+
+    Returns:
+        List of (module, cumulative microseconds or None if not installed)
+    """
+    script = "\n".join(
+        f"try:\n    import {name}\nexcept ImportError:\n    print('missing:{name}')"
+        for name in modules
+    )
+    result = subprocess.run(
+        [python, '-X', 'importtime', '-c', script],
+        capture_output=True,
+        text=True
+    )
+    missing = {line.split(':', 1)[1] for line in result.stdout.splitlines() if line.startswith('missing:')}
+
+    # Top-level entries (no nesting indent) carry the cumulative time of each import
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match and len(match.group(3)) <= 1:
+            cumulative[match.group(4)] = int(match.group(2))
+
+    return [(name, None if name in missing else cumulative.get(name, 0)) for name in modules]
+
+
+def format_import_report(times):
+    """Format measure_import_times() output as a table, slowest first."""
+    lines = [f"{'module':<22}{'import time':>14}"]
+    installed = [(name, us) for name, us in times if us is not None]
+    for name, us in sorted(installed, key=lambda item: item[1], reverse=True):
+        lines.append(f"{name:<22}{us / 1000:>11.1f} ms")
+    for name, us in times:
+        if us is None:
+            lines.append(f"{name:<22}{'not installed':>14}")
+    total = sum(us for _, us in installed)
+    lines.append(f"{'total':<22}{total / 1000:>11.1f} ms")
+    return "\n".join(lines)
@@ -0,0 +1,97 @@
+import time
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+class StartupTimeline:
+    """
+    Runs component initializers, optionally in parallel, and records when
+    each one started and how long it took relative to process startup.
+    """
+
+    def __init__(self, parallel=True, max_workers=4):
+        """
+        Args:
+            parallel: Run initializers concurrently on a thread pool (default: True)
+            max_workers: Maximum number of concurrent initializers
+        """
+        self.parallel = parallel
+        self.t0 = time.monotonic()
+        self.entries = {}  # name -> (start offset, duration) in seconds
+        self.failures = {}  # name -> exception raised by the initializer
+        self.futures = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='GenioInit') if parallel else None
+
+    def _timed(self, name, func):
+        start = time.monotonic()
+        try:
+            return func()
+        except Exception as e:
+            with self._lock:
+                self.failures[name] = e
+            raise
+        finally:
+            with self._lock:
+                self.entries[name] = (start - self.t0, time.monotonic() - start)
+
+    def start(self, name, func):
+        """
+        Start initializing a component.
+
+        Args:
+            name: Component name used in the timeline and by wait()
+            func: Callable that initializes the component
+
+        Returns:
+            Future resolving to the callable's return value
+        """
+        if self.parallel:
+            future = self._executor.submit(self._timed, name, func)
+        else:
+            future = Future()
+            try:
+                future.set_result(self._timed(name, func))
+            except Exception as e:
+                future.set_exception(e)
+        self.futures[name] = future
+        return future
+
+    def wait(self, name, timeout=None):
+        """Block until a component is ready and return its result (re-raises its error)."""
+        return self.futures[name].result(timeout=timeout)
+
+    def is_ready(self, name):
+        future = self.futures.get(name)
+        return future is not None and future.done()
+
+    def wait_all(self):
+        """
+        Block until every component finished initializing.
+
+        Returns:
+            Dict of component name -> exception for those that failed
+        """
+        failures = {}
+        for name, future in list(self.futures.items()):
+            error = future.exception()
+            if error is not None:
+                failures[name] = error
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        return failures
+
+    def elapsed(self):
+        """Seconds since the timeline was created."""
+        return time.monotonic() - self.t0
+
+    def summary(self):
+        """Return one formatted line per component, ordered by start time."""
+        with self._lock:
+            entries = sorted(self.entries.items(), key=lambda item: item[1][0])
+            failures = dict(self.failures)
+        return [
+            f"{name:<10} start +{start:6.2f}s  took {duration:6.2f}s  "
+            + (f"FAILED: {failures[name]}" if name in failures else f"ready +{start + duration:6.2f}s")
+            for name, (start, duration) in entries
+        ]
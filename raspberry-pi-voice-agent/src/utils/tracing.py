@@ -0,0 +1,192 @@
+import json
+import math
+import time
+import uuid
+import threading
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from pathlib import Path
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of a list of numbers (q in 0-100)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class Trace:
+    """One interaction, from wake word to the end of the spoken reply."""
+
+    def __init__(self, name, **attrs):
+        self.trace_id = uuid.uuid4().hex[:12]
+        self.name = name
+        self.attrs = attrs
+        self.wall_time = time.time()
+        self.start = time.monotonic()
+        self.end = None
+        self.spans = []  # (name, start, duration, attrs) with monotonic start
+        self._lock = threading.Lock()
+
+    def add(self, name, start, duration, **attrs):
+        with self._lock:
+            self.spans.append((name, start, duration, attrs))
+
+    def to_dict(self):
+        """JSON-friendly form with offsets and durations in milliseconds."""
+        end = self.end if self.end is not None else time.monotonic()
+        with self._lock:
+            spans = sorted(self.spans, key=lambda span: span[1])
+        return {
+            'trace_id': self.trace_id,
+            'name': self.name,
+            'time': round(self.wall_time, 3),
+            'duration_ms': round(1000 * (end - self.start), 1),
+            'attrs': self.attrs,
+            'spans': [
+                dict(name=name, offset_ms=round(1000 * (start - self.start), 1),
+                     duration_ms=round(1000 * duration, 1), **attrs)
+                for name, start, duration, attrs in spans
+            ],
+        }
+
+
+class Tracer:
+    """
+    Lightweight latency tracing on the monotonic clock.
+
+    A Trace covers one interaction; components add child spans with
+    span() or record() while that trace is active on their thread.
+    Stages that hand work to another thread carry the Trace along and
+    activate() it there. Finished traces are appended to a JSONL file,
+    which is rotated to <file>.1 once it outgrows its byte budget,
+    optionally published (e.g. to MQTT genio/metrics), and their span
+    durations feed the p50/p95/p99 summary.
+    """
+
+    def __init__(self, path=None, publish=None, window=1000, enabled=True,
+                 max_file_bytes=5 * 1024 * 1024):
+        """
+        Args:
+            path: JSONL file that finished traces are appended to (optional)
+            max_file_bytes: Size at which the file is rotated; the file and
+                one rotated predecessor are kept (default: 5 MB)
+            publish: Optional callable(json_text) for every finished trace
+            window: Recent durations kept per span name for percentiles
+            enabled: When False every method is a cheap no-op
+        """
+        self.path = Path(path) if path else None
+        self.max_file_bytes = max_file_bytes
+        self.publish = publish
+        self.enabled = enabled
+        self._local = threading.local()
+        self._durations = defaultdict(lambda: deque(maxlen=window))
+        self._lock = threading.Lock()
+        if self.path is not None and enabled:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def start(self, name='interaction', **attrs):
+        """Begin a new trace (not yet active on any thread)."""
+        if not self.enabled:
+            return None
+        return Trace(name, **attrs)
+
+    @property
+    def current(self):
+        """Trace active on the calling thread, or None."""
+        return getattr(self._local, 'trace', None)
+
+    @contextmanager
+    def activate(self, trace):
+        """Make `trace` the parent of spans recorded on this thread."""
+        previous = self.current
+        self._local.trace = trace
+        try:
+            yield trace
+        finally:
+            self._local.trace = previous
+
+    @contextmanager
+    def span(self, name, **attrs):
+        """Time the enclosed block as a child span of the active trace."""
+        trace = self.current
+        if trace is None:
+            yield
+            return
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            trace.add(name, start, time.monotonic() - start, **attrs)
+
+    def record(self, name, duration, start=None, **attrs):
+        """
+        Add a span measured elsewhere to the active trace.
+
+        Args:
+            name: Span name
+            duration: Span length in seconds
+            start: Monotonic start time (default: ended just now)
+        """
+        trace = self.current
+        if trace is None:
+            return
+        if start is None:
+            start = time.monotonic() - duration
+        trace.add(name, start, duration, **attrs)
+
+    def finish(self, trace):
+        """Close a trace, write it out and add it to the summary."""
+        if trace is None or trace.end is not None:
+            return
+        trace.end = time.monotonic()
+        record = trace.to_dict()
+        line = json.dumps(record, ensure_ascii=False)
+
+        with self._lock:
+            self._durations[trace.name].append(record['duration_ms'])
+            for span in record['spans']:
+                self._durations[span['name']].append(span['duration_ms'])
+            if self.path is not None:
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(line + '\n')
+                    size = f.tell()
+                if size > self.max_file_bytes:
+                    self.path.replace(self.path.with_name(self.path.name + '.1'))
+
+        if self.publish is not None:
+            try:
+                self.publish(line)
+            except Exception:
+                pass  # Metrics must never break an interaction
+
+    def summary(self):
+        """
+        Latency percentiles per span name.
+
+        Returns:
+            {name: {'count', 'p50_ms', 'p95_ms', 'p99_ms'}}
+        """
+        with self._lock:
+            durations = {name: list(values) for name, values in self._durations.items()}
+        return {
+            name: {
+                'count': len(values),
+                'p50_ms': percentile(values, 50),
+                'p95_ms': percentile(values, 95),
+                'p99_ms': percentile(values, 99),
+            }
+            for name, values in durations.items() if values
+        }
+
+    def format_summary(self):
+        """Summary as aligned text lines for the log."""
+        lines = []
+        for name, stats in sorted(self.summary().items()):
+            lines.append(
+                f"{name:<18} n={stats['count']:<5} p50={stats['p50_ms']:>8.1f} ms  "
+                f"p95={stats['p95_ms']:>8.1f} ms  p99={stats['p99_ms']:>8.1f} ms"
+            )
+        return lines
@@ -0,0 +1,148 @@
+import time
+import threading
+from collections import deque
+
+OVERFLOW_POLICIES = ('drop_oldest', 'reject', 'coalesce')
+
+
+class WorkQueue:
+    """
+    Bounded queue of work items served by a pool of worker threads.
+
+    submit() never blocks, so it is safe to call from callbacks that must
+    return quickly, such as paho's network thread. When the queue is full
+    the overflow policy decides what happens to the new item:
+
+        drop_oldest  the oldest waiting item is discarded
+        reject       the new item is discarded and submit() returns False
+        coalesce     the new item replaces a waiting item with the same key,
+                     otherwise the oldest waiting item is discarded
+    """
+
+    def __init__(self, handler, workers=1, maxsize=8, overflow='drop_oldest',
+                 name='GenioWorker', on_error=None, latency_window=256):
+        """
+        Args:
+            handler: Callable run on a worker thread for every item
+            workers: Number of worker threads (default: 1, keeps items in order)
+            maxsize: Maximum number of waiting items
+            overflow: One of OVERFLOW_POLICIES
+            name: Prefix for worker thread names
+            on_error: Optional callable(item, exception) for handler failures
+            latency_window: Number of recent items kept for latency stats
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy '{overflow}', use one of {OVERFLOW_POLICIES}")
+        self.handler = handler
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.on_error = on_error
+        self._items = deque()  # (key, item, submitted at)
+        self._condition = threading.Condition()
+        self._running = True
+        self._latencies = deque(maxlen=latency_window)  # (waited, total) in seconds
+        self.counters = {
+            'submitted': 0, 'processed': 0, 'errors': 0,
+            'dropped': 0, 'rejected': 0, 'coalesced': 0,
+        }
+        self.max_depth = 0
+        self._threads = [
+            threading.Thread(target=self._work, name=f'{name}-{i}', daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, item, key=None):
+        """
+        Queue an item without blocking.
+
+        Args:
+            item: Work item passed to the handler
+            key: Coalescing key (default: the item itself)
+
+        Returns:
+            True if the item was queued, False if it was rejected
+        """
+        key = item if key is None else key
+        with self._condition:
+            if not self._running:
+                return False
+            self.counters['submitted'] += 1
+            if len(self._items) >= self.maxsize:
+                if self.overflow == 'reject':
+                    self.counters['rejected'] += 1
+                    return False
+                if self.overflow == 'coalesce':
+                    for i, (queued_key, _, submitted) in enumerate(self._items):
+                        if queued_key == key:
+                            # Keep its place in line and its original wait time
+                            self._items[i] = (key, item, submitted)
+                            self.counters['coalesced'] += 1
+                            return True
+                self._items.popleft()
+                self.counters['dropped'] += 1
+            self._items.append((key, item, time.monotonic()))
+            self.max_depth = max(self.max_depth, len(self._items))
+            self._condition.notify()
+            return True
+
+    def _work(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._items or not self._running)
+                if not self._items:
+                    return
+                _, item, submitted = self._items.popleft()
+            started = time.monotonic()
+            try:
+                self.handler(item)
+            except Exception as e:
+                with self._condition:
+                    self.counters['errors'] += 1
+                if self.on_error:
+                    self.on_error(item, e)
+            finished = time.monotonic()
+            with self._condition:
+                self.counters['processed'] += 1
+                self._latencies.append((started - submitted, finished - submitted))
+
+    @property
+    def depth(self):
+        """Number of items waiting for a worker."""
+        return len(self._items)
+
+    def metrics(self):
+        """
+        Queue depth, counters and handling latency of recent items.
+
+        Returns:
+            Dict with depth, max_depth, the counters and wait/latency
+            averages and maxima in milliseconds
+        """
+        with self._condition:
+            metrics = dict(self.counters, depth=len(self._items), max_depth=self.max_depth)
+            latencies = list(self._latencies)
+        if latencies:
+            waited = [w for w, _ in latencies]
+            total = [t for _, t in latencies]
+            metrics.update(
+                wait_ms_avg=round(1000 * sum(waited) / len(waited), 1),
+                wait_ms_max=round(1000 * max(waited), 1),
+                latency_ms_avg=round(1000 * sum(total) / len(total), 1),
+                latency_ms_max=round(1000 * max(total), 1),
+            )
+        return metrics
+
+    def stop(self, timeout=1.0):
+        """
+        Stop accepting items and let the workers finish what is queued.
+
+        Args:
+            timeout: Seconds to wait for each worker
+        """
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
@@ -1,6 +1,7 @@
-import pvporcupine
-import pyaudio
-import struct
+import time
+import ctypes
+import numpy as np
+from audio.capture import CaptureStopped
 
 
 class PorcupineDetector:
@@ -9,7 +10,8 @@ class PorcupineDetector:
     Supports both built-in keywords and custom .ppn files.
     """
     
-    def __init__(self, access_key, keywords=None, keyword_paths=None, sensitivity=0.5):
+    def __init__(self, access_key, keywords=None, keyword_paths=None, sensitivity=0.5, capture=None,
+                 echo_canceller=None, source=None, max_errors=20, direct_process=False):
         """
         Initialize Porcupine detector.
         
@@ -18,14 +20,33 @@ class PorcupineDetector:
             keywords: List of built-in keywords (e.g., ['porcupine', 'alexa'])
             keyword_paths: List of paths to custom .ppn files (optional)
             sensitivity: Detection sensitivity 0.0-1.0 (default 0.5)
+            capture: Optional shared AudioCapture to read frames from instead
+                of opening a PyAudio stream of our own
+            echo_canceller: Optional EchoCanceller that removes our own speech
+                from shared capture frames, so the wake word can interrupt playback
+            source: Optional audio.sources.AudioSource to read frames from when
+                no shared capture is used (default: the sound card)
+            max_errors: Consecutive failed frames after which detect() raises
+            direct_process: Call the C process function behind pvporcupine's
+                private _process_func/_handle, skipping the binding's per-frame
+                conversion and error handling. Only for pvporcupine releases
+                known to expose them (default: the public process())
         """
         self.access_key = access_key
         self.keywords = keywords or []
         self.keyword_paths = keyword_paths or []
         self.sensitivity = sensitivity
         self.porcupine = None
-        self.pa = None
-        self.audio_stream = None
+        self.audio_stream = source
+        self.capture = capture
+        self.reader = None
+        self.echo_canceller = echo_canceller
+        self.detection_position = None  # Capture position where the last wake word ended
+        self.max_errors = max_errors
+        self.direct_process = direct_process
+        self.error_count = 0
+        self.last_error = None
+        self._consecutive_errors = 0
         self.is_initialized = False
         
         # Validate that we have at least one keyword
@@ -35,6 +56,8 @@ class PorcupineDetector:
     def initialize(self):
         """Initialize Porcupine and audio stream."""
         try:
+            import pvporcupine
+            
             # Create Porcupine instance
             if self.keywords:
                 # Use built-in keywords
@@ -51,17 +74,20 @@ class PorcupineDetector:
                     sensitivities=[self.sensitivity] * len(self.keyword_paths)
                 )
             
-            # Initialize PyAudio
-            self.pa = pyaudio.PyAudio()
-            self.audio_stream = self.pa.open(
-                rate=self.porcupine.sample_rate,
-                channels=1,
-                format=pyaudio.paInt16,
-                input=True,
-                frames_per_buffer=self.porcupine.frame_length,
-                input_device_index=None
-            )
+            if self.capture is not None:
+                # Read frames from the shared capture stream
+                if self.capture.rate != self.porcupine.sample_rate:
+                    raise ValueError(
+                        f"Capture rate {self.capture.rate} Hz does not match "
+                        f"Porcupine rate {self.porcupine.sample_rate} Hz"
+                    )
+                self.reader = self.capture.reader()
+            elif self.audio_stream is None:
+                from audio.sources import PyAudioSource
+                
+                self.audio_stream = PyAudioSource(self.porcupine.sample_rate, self.porcupine.frame_length)
             
+            self._prepare_frame_buffer()
             self.is_initialized = True
             print(f"✅ Porcupine initialized successfully!")
             print(f"   Listening for: {self.keywords or self.keyword_paths}")
@@ -70,34 +96,88 @@ class PorcupineDetector:
         except Exception as e:
             raise RuntimeError(f"Failed to initialize Porcupine: {e}")
     
+    def _prepare_frame_buffer(self):
+        """
+        Preallocate everything the per-frame loop needs.
+        
+        Frames are copied into one ctypes buffer (viewed as a numpy array).
+        With direct_process it is handed straight to Porcupine's C process
+        function, so the hot loop creates no per-sample Python objects.
+        """
+        self._frame_length = self.porcupine.frame_length
+        self._pcm = (ctypes.c_short * self._frame_length)()
+        self._pcm_array = np.ctypeslib.as_array(self._pcm)
+        self._result = ctypes.c_int(-1)
+        self._result_ptr = ctypes.pointer(self._result)
+        self._process_func = None
+        self._handle = None
+        if self.direct_process:
+            # Private attributes of the binding; fall back to process() without them
+            self._process_func = getattr(self.porcupine, '_process_func', None)
+            self._handle = getattr(self.porcupine, '_handle', None)
+    
+    def _process_frame(self):
+        """Run Porcupine on the frame currently in the preallocated buffer."""
+        if self._process_func is None:
+            return self.porcupine.process(self._pcm)
+        status = self._process_func(self._handle, self._pcm, self._result_ptr)
+        if getattr(status, 'value', status) != 0:
+            raise RuntimeError(f"Porcupine process failed: {status}")
+        return self._result.value
+    
     def detect(self):
         """
         Check if wake word is detected (single frame check).
         
         Returns:
             True if wake word detected, False otherwise
+        
+        Raises:
+            CaptureStopped: The audio input has ended
+            RuntimeError: `max_errors` frames in a row failed
         """
         if not self.is_initialized:
             self.initialize()
         
         try:
-            pcm = self.audio_stream.read(
-                self.porcupine.frame_length,
-                exception_on_overflow=False
-            )
-            pcm = struct.unpack_from("h" * self.porcupine.frame_length, pcm)
-            keyword_index = self.porcupine.process(pcm)
-            
-            if keyword_index >= 0:
-                detected_word = self.keywords[keyword_index] if self.keywords else self.keyword_paths[keyword_index]
-                print(f"🎉 Wake word detected: {detected_word}")
-                return True
-            
-            return False
-            
+            if self.reader is not None:
+                frame = self.reader.read(self._frame_length)
+                echo = self.echo_canceller
+                if echo is not None:
+                    frame = echo.process(frame, self.reader.position - self._frame_length)
+                self._pcm_array[:] = frame
+            else:
+                pcm = self.audio_stream.read(self._frame_length)
+                if len(pcm) < 2 * self._frame_length:
+                    raise CaptureStopped("Audio source ended")
+                self._pcm_array[:] = np.frombuffer(pcm, dtype=np.int16)
+            keyword_index = self._process_frame()
+        except CaptureStopped:
+            raise
         except Exception as e:
-            print(f"Error during detection: {e}")
+            # Keep the hot loop free of I/O; only the first of a run of errors is printed
+            self.error_count += 1
+            self._consecutive_errors += 1
+            self.last_error = e
+            if self._consecutive_errors == 1:
+                print(f"Error during detection: {e}")
+            if self._consecutive_errors >= self.max_errors:
+                raise RuntimeError(
+                    f"Wake word detection failed {self._consecutive_errors} times in a row: {e}"
+                ) from e
+            # Back off so a persistent fault does not spin the CPU
+            time.sleep(min(1.0, 0.01 * 2 ** (self._consecutive_errors - 1)))
             return False
+        self._consecutive_errors = 0
+        
+        if keyword_index >= 0:
+            detected_word = self.keywords[keyword_index] if self.keywords else self.keyword_paths[keyword_index]
+            if self.reader is not None:
+                self.detection_position = self.reader.position
+            print(f"🎉 Wake word detected: {detected_word}")
+            return True
+        
+        return False
     
     def listen_for_wake_word(self):
         """
@@ -115,13 +195,15 @@ class PorcupineDetector:
                     break
         except KeyboardInterrupt:
             print("\n🛑 Wake word detection stopped by user")
+        except CaptureStopped:
+            print("🔚 Audio input ended")
     
     def cleanup(self):
         """Clean up resources."""
         if self.audio_stream is not None:
             self.audio_stream.close()
-        if self.pa is not None:
-            self.pa.terminate()
+            self.audio_stream = None
+        self.reader = None
         if self.porcupine is not None:
             self.porcupine.delete()
         self.is_initialized = False
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Unit test for the shared capture ring buffer and recording buffers.
+Runs without PyAudio or a microphone.
+"""
+
+import sys
+import numpy as np
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from audio.capture import RingBuffer, RecordingBuffer, AudioCapture, CaptureStopped
+from audio.microphone import Microphone
+from audio.sources import PipeSource, WavSource
+
+
+def test_view_is_contiguous_across_wrap():
+    ring = RingBuffer(8)
+    ring.write(np.arange(6, dtype=np.int16))
+    ring.write(np.arange(6, 12, dtype=np.int16))  # wraps around
+    window = ring.view(4, 8)
+    assert window.tolist() == list(range(4, 12))
+    assert window.base is not None  # a view, not a copy
+
+
+def test_views_are_read_only():
+    ring = RingBuffer(4)
+    ring.write(np.ones(4, dtype=np.int16))
+    window = ring.view(0, 4)
+    assert not window.flags.writeable
+
+
+def test_overwritten_samples_are_unavailable():
+    ring = RingBuffer(4)
+    ring.write(np.arange(10, dtype=np.int16))
+    assert ring.oldest == 6
+    assert ring.view(6, 4).tolist() == [6, 7, 8, 9]
+    try:
+        ring.view(5, 4)
+        assert False, "expected IndexError for overwritten samples"
+    except IndexError:
+        pass
+
+
+def test_many_small_writes_match_source():
+    ring = RingBuffer(1000)
+    source = np.random.default_rng(0).integers(-32768, 32767, 5000, dtype=np.int16)
+    for start in range(0, len(source), 512):
+        ring.write(source[start:start + 512])
+    assert np.array_equal(ring.view(4000, 1000), source[4000:])
+
+
+def fake_capture(samples, capacity_seconds=1):
+    """AudioCapture fed directly instead of from a device."""
+    capture = AudioCapture(rate=1000, frame_length=10, capacity_seconds=capacity_seconds)
+    capture.is_running = True
+    capture.ring.write(np.asarray(samples, dtype=np.int16))
+    return capture
+
+
+def test_reader_preroll_seek():
+    capture = fake_capture(np.arange(500))
+    reader = capture.reader()
+    assert reader.position == 500
+    reader.seek(500 - 100)  # 100 ms pre-roll at 1 kHz
+    assert reader.read(100).tolist() == list(range(400, 500))
+
+
+def test_reader_seek_clamps_to_oldest():
+    capture = fake_capture(np.arange(1500))
+    reader = capture.reader()
+    reader.seek(0)
+    assert reader.position == 500
+
+
+def test_reader_overrun_skips_to_oldest():
+    capture = fake_capture(np.arange(100))
+    reader = capture.reader()
+    reader.seek(0)
+    capture.ring.write(np.arange(100, 1200, dtype=np.int16))
+    window = reader.read(10)
+    assert reader.overruns == 1
+    assert window.tolist() == list(range(200, 210))
+
+
+def test_wav_source_replays_into_capture():
+    import tempfile
+    import wave
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "command.wav"
+        audio = np.arange(1, 1601, dtype=np.int16)
+        with wave.open(str(path), 'wb') as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(16000)
+            wf.writeframes(audio.tobytes())
+
+        source = WavSource([path], gap_seconds=0.1, tail_seconds=0.1, speed=0)
+        assert source.starts == [1600]
+        capture = AudioCapture(rate=16000, frame_length=512, capacity_seconds=1, source=source)
+        reader = capture.reader()
+        capture.start()
+        reader.seek(source.starts[0])
+        assert reader.read(1600, timeout=5.0).tolist() == audio.tolist()
+
+        # Capture stops by itself once the source is exhausted
+        capture._thread.join(timeout=5.0)
+        assert not capture.is_running
+        capture.stop()
+
+
+def test_source_error_stops_capture_and_wakes_readers():
+    class FailingSource:
+        rate = 16000
+
+        def __init__(self):
+            self.reads = 0
+
+        def read(self, num_samples):
+            self.reads += 1
+            if self.reads > 2:
+                raise OSError("device unplugged")
+            return np.zeros(num_samples, dtype=np.int16).tobytes()
+
+        def close(self):
+            pass
+
+    capture = AudioCapture(rate=16000, frame_length=512, capacity_seconds=1, source=FailingSource())
+    reader = capture.reader()
+    capture.start()
+    try:
+        reader.read(16000, timeout=5.0)
+    except CaptureStopped as e:
+        assert isinstance(e.__cause__, OSError)
+    else:
+        raise AssertionError("reader should raise once capture failed")
+    assert not capture.is_running
+    assert isinstance(capture.error, OSError)
+    capture.stop()
+
+
+def test_recording_buffer_normalizes_in_place():
+    recording = RecordingBuffer(capacity=8, count=2)
+    recording.start()
+    recording.append(np.array([16384, -32768], dtype=np.int16))
+    recording.append(np.array([1, 2, 3], dtype=np.int16))
+    first = recording.view()
+    assert first.dtype == np.float32 and not first.flags.writeable
+    assert first.tolist() == [0.5, -1.0, 1 / 32768, 2 / 32768, 3 / 32768]
+
+    # The next recording goes to the other buffer and leaves the first intact
+    recording.start()
+    recording.append(np.full(10, 8192, dtype=np.int16))  # grows past capacity
+    assert recording.view().tolist() == [0.25] * 10
+    assert first[0] == 0.5
+    assert not np.shares_memory(first, recording.view())
+
+
+def test_microphone_returns_float32_without_copies():
+    import io
+
+    samples = np.arange(-800, 800, dtype=np.int16)
+    source = PipeSource(io.BytesIO(samples.tobytes()))
+    mic = Microphone(chunk=160, record_seconds=0.1, source=source)
+    audio = mic.listen()
+    assert audio.dtype == np.float32
+    assert np.array_equal(audio, samples / np.float32(32768.0))
+    assert np.shares_memory(audio, mic.recording._buffers[0])
+
+
+if __name__ == "__main__":
+    test_view_is_contiguous_across_wrap()
+    test_views_are_read_only()
+    test_overwritten_samples_are_unavailable()
+    test_many_small_writes_match_source()
+    test_reader_preroll_seek()
+    test_reader_seek_clamps_to_oldest()
+    test_reader_overrun_skips_to_oldest()
+    test_wav_source_replays_into_capture()
+    test_source_error_stops_capture_and_wakes_readers()
+    test_recording_buffer_normalizes_in_place()
+    test_microphone_returns_float32_without_copies()
+    print("✅ All capture ring buffer tests passed!")
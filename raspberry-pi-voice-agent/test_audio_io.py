@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Unit test for the pluggable audio sources and sinks.
+Runs without PyAudio or sounddevice installed.
+"""
+
+import io
+import os
+import sys
+import socket
+import tempfile
+import threading
+import time
+import wave
+import numpy as np
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from audio.capture import AudioCapture
+from audio.sinks import NullSink, PipeSink, UnixSocketSink, WavSink, open_sink
+from audio.sources import PipeSource, UnixSocketSource, WavSource, open_source
+
+
+def test_pipe_source_feeds_capture():
+    samples = (np.arange(1600) % 200 - 100).astype(np.int16)
+    # An odd trailing byte (a truncated sample) is dropped
+    source = PipeSource(io.BytesIO(samples.tobytes() + b'\x01'))
+    capture = AudioCapture(frame_length=512, capacity_seconds=1, source=source)
+    capture.start()
+    capture._thread.join(timeout=2.0)
+    assert not capture.is_running
+    assert capture.position == len(samples)
+    assert np.array_equal(capture.ring.view(0, len(samples)), samples)
+    capture.stop()
+
+
+def test_pipe_sink_writes_raw_pcm():
+    out = io.BytesIO()
+    sink = PipeSink(out)
+    sink.open(22050)
+    block = np.arange(-50, 50, dtype=np.int16)
+    sink.write(block[:60])
+    sink.write(block[60:])
+    sink.close()
+    assert np.array_equal(np.frombuffer(out.getvalue(), dtype=np.int16), block)
+
+
+def test_wav_sink_numbers_utterances():
+    with tempfile.TemporaryDirectory() as tmp:
+        sink = WavSink(Path(tmp) / "replies")
+        for value in (1, 2):
+            sink.open(22050)
+            sink.write(np.full(100, value, dtype=np.int16))
+            sink.close()
+        assert sink.count == 2
+        assert sink.last_file.name == "utterance-0002.wav"
+        with wave.open(str(sink.last_file), 'rb') as wf:
+            assert wf.getframerate() == 22050
+            assert np.all(np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16) == 2)
+
+
+def test_unix_socket_round_trip():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "genio.sock")
+        block = np.arange(512, dtype=np.int16)
+        source = UnixSocketSource(path, listen=True)
+        received = []
+        reader = threading.Thread(target=lambda: received.append(bytes(source.read(512))))
+        reader.start()
+        while not os.path.exists(path):
+            reader.join(timeout=0.01)
+
+        sink = UnixSocketSink(path, listen=False)
+        sink.open(16000)
+        sink.write(block)
+        reader.join(timeout=2.0)
+        sink.close()
+        source.close()
+        assert np.array_equal(np.frombuffer(received[0], dtype=np.int16), block)
+        assert not os.path.exists(path)
+
+
+def test_unix_socket_sink_reconnects():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "speaker.sock")
+        block = np.arange(256, dtype=np.int16)
+        sink = UnixSocketSink(path)
+        sink.start()
+
+        def consumer():
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.connect(path)
+            return sock
+
+        first = consumer()
+        sink.open(16000)
+        sink.write(block)
+        sink.close()
+        assert np.array_equal(np.frombuffer(first.recv(block.nbytes, socket.MSG_WAITALL), dtype=np.int16), block)
+        first.close()
+
+        sink.open(16000)
+        try:
+            sink.write(block)
+        except OSError:
+            pass
+        else:
+            raise AssertionError("Writing to a departed consumer should fail")
+        sink.close()
+
+        second = consumer()
+        sink.open(16000)
+        sink.write(block)
+        sink.close()
+        assert np.array_equal(np.frombuffer(second.recv(block.nbytes, socket.MSG_WAITALL), dtype=np.int16), block)
+        second.close()
+        sink.shutdown()
+        assert not os.path.exists(path)
+
+
+def test_unix_socket_sink_abort_ends_wait_for_consumer():
+    with tempfile.TemporaryDirectory() as tmp:
+        sink = UnixSocketSink(os.path.join(tmp, "speaker.sock"))
+        opener = threading.Thread(target=sink.open, args=(16000,))
+        opener.start()
+        time.sleep(0.05)
+        sink.abort()
+        opener.join(timeout=1.0)
+        assert not opener.is_alive()
+        sink.write(np.zeros(16, dtype=np.int16))  # Dropped, nobody is listening
+        sink.close()
+        sink.shutdown()
+
+
+def test_specs():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "command.wav"
+        with wave.open(str(path), 'wb') as wf:
+            wf.setnchannels(1)
+            wf.setsampwidth(2)
+            wf.setframerate(16000)
+            wf.writeframes(np.zeros(160, dtype=np.int16).tobytes())
+        assert isinstance(open_source(f"wav:{tmp}"), WavSource)
+    assert isinstance(open_source("stdin"), PipeSource)
+    assert open_source("unix-connect:/tmp/mic.sock").listen is False
+    assert isinstance(open_sink("null"), NullSink)
+    assert isinstance(open_sink("stdout"), PipeSink)
+    assert open_sink("unix:/tmp/speaker.sock").listen is True
+    assert open_sink("device:2").device == 2
+    for make, spec in ((open_source, "alsa"), (open_sink, "speaker")):
+        try:
+            make(spec)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"{spec} should be rejected")
+
+
+if __name__ == "__main__":
+    test_pipe_source_feeds_capture()
+    test_pipe_sink_writes_raw_pcm()
+    test_wav_sink_numbers_utterances()
+    test_unix_socket_round_trip()
+    test_unix_socket_sink_reconnects()
+    test_unix_socket_sink_abort_ends_wait_for_consumer()
+    test_specs()
+    print("✅ All audio source/sink tests passed!")
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Unit test for echo suppression used by barge-in and the wake earcon.
+Simulates playback and microphone frames, no audio hardware needed.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from audio.capture import AudioCapture
+from audio.earcon import Earcon
+from audio.echo import EchoCanceller
+from audio.microphone import Microphone
+
+
+class FakeCapture:
+    rate = 16000
+    position = 0
+
+
+def rms(samples):
+    return float(np.sqrt(np.mean(np.square(samples.astype(np.float64)))))
+
+
+def tone(freq, seconds, amplitude=8000, rate=16000):
+    t = np.arange(int(seconds * rate)) / rate
+    return (amplitude * np.sin(2 * np.pi * freq * t)).astype(np.int16)
+
+
+def test_frames_pass_through_when_idle():
+    echo = EchoCanceller(FakeCapture())
+    frame = tone(440, 0.032)
+    assert echo.process(frame, 0) is frame
+
+
+def test_echo_is_removed_with_unknown_delay():
+    capture = FakeCapture()
+    echo = EchoCanceller(capture, delay_ms=60, search_ms=20)
+    rng = np.random.default_rng(0)
+    speech = (rng.standard_normal(16000) * 4000).astype(np.int16)
+    echo.play(speech, 16000)
+
+    # The room adds 10 ms more delay than configured and attenuates by half
+    arrival = echo.delay + 160
+    mic = np.zeros(arrival + len(speech), dtype=np.int16)
+    mic[arrival:] = speech // 2
+
+    position = arrival + 4000
+    frame = mic[position:position + 512]
+    cleaned = echo.process(frame, position)
+    assert rms(cleaned) < rms(frame) * 0.05
+
+
+def test_user_voice_survives():
+    capture = FakeCapture()
+    echo = EchoCanceller(capture, delay_ms=0, search_ms=20)
+    rng = np.random.default_rng(1)
+    speech = (rng.standard_normal(16000) * 4000).astype(np.int16)
+    echo.play(speech, 16000)
+
+    user = tone(300, 0.032, amplitude=3000)
+    frame = (speech[8000:8512] // 2 + user).astype(np.int16)
+    cleaned = echo.process(frame, 8000)
+    assert rms(cleaned - user) < rms(user) * 0.3
+
+
+def test_cancel_drops_future_reference():
+    capture = FakeCapture()
+    echo = EchoCanceller(capture, delay_ms=0)
+    echo.play(tone(440, 1.0), 22050)
+    capture.position = 1000
+    echo.cancel()
+    frame = tone(440, 0.032)
+    assert echo.process(frame, 2000) is frame
+
+
+def test_earcon_is_removed_from_recording():
+    capture = AudioCapture(rate=16000, frame_length=512, capacity_seconds=2)
+    capture.is_running = True
+    echo = EchoCanceller(capture, delay_ms=40, search_ms=20)
+    mic = Microphone(capture=capture, record_seconds=0.5, echo_canceller=echo)
+
+    # Chime played at the wake word, heard 50 ms later at half level
+    earcon = Earcon.tone(rate=16000)
+    echo.play(earcon.samples, earcon.rate)
+    heard = np.zeros(8000, dtype=np.int16)
+    heard[800:800 + len(earcon.samples)] = earcon.samples // 2
+    capture.ring.write(heard)
+
+    mic.mark_start(0)
+    recording = mic.listen()
+    assert len(recording) == 8000
+    assert rms(recording * 32768.0) < rms(heard) * 0.1
+
+
+if __name__ == "__main__":
+    test_frames_pass_through_when_idle()
+    test_echo_is_removed_with_unknown_delay()
+    test_user_voice_survives()
+    test_cancel_drops_future_reference()
+    test_earcon_is_removed_from_recording()
+    print("✅ All echo suppression tests passed!")
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Unit test for the staged pipeline engine.
+Uses a fake wake word detector and handlers, no audio hardware needed.
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from pipeline.engine import PipelineEngine
+
+
+class FakeDetector:
+    """Reports a wake word for each queued position, then stays quiet."""
+
+    def __init__(self, positions):
+        self.positions = list(positions)
+        self.detection_position = None
+
+    def detect(self):
+        time.sleep(0.01)
+        if self.positions:
+            self.detection_position = self.positions.pop(0)
+            return True
+        return False
+
+
+def run_until(engine, condition, timeout=5.0):
+    thread = threading.Thread(target=engine.run)
+    thread.start()
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    engine.stop()
+    thread.join(timeout)
+    assert not thread.is_alive()
+
+
+def test_commands_flow_through_all_stages():
+    spoken = []
+    engine = PipelineEngine(
+        FakeDetector([100, 200]),
+        record=lambda position: (f"audio@{position}", None),
+        transcribe=lambda audio, state: f"text of {audio}",
+        dispatch=lambda command: f"Du sa: {command}",
+        speak=spoken.append,
+        stats_interval=0
+    )
+    run_until(engine, lambda: len(spoken) == 2)
+    assert spoken == ["Du sa: text of audio@100", "Du sa: text of audio@200"]
+    stats = engine.stats()
+    assert stats['tts']['processed'] == 2
+    assert engine.queue_depths() == {'record': 0, 'stt': 0, 'dispatch': 0, 'tts': 0}
+
+
+def test_detection_continues_while_stt_is_busy():
+    release = threading.Event()
+    spoken = []
+
+    def slow_transcribe(audio, state):
+        release.wait(5.0)
+        return audio
+
+    engine = PipelineEngine(
+        FakeDetector([1, 2, 3]),
+        record=lambda position: (position, None),
+        transcribe=slow_transcribe,
+        dispatch=lambda command: command,
+        speak=spoken.append,
+        stats_interval=0
+    )
+    # All three wake words are recorded although the first is still transcribing
+    run_until(engine, lambda: engine.stages and engine.stages[0].processed == 3)
+    assert engine.stages[1].inbox.qsize() == 2
+    release.set()
+
+
+def test_failed_stage_speaks_apology():
+    spoken = []
+
+    def broken_stt(audio, state):
+        raise RuntimeError("decoder crashed")
+
+    engine = PipelineEngine(
+        FakeDetector([1]),
+        record=lambda position: (position, None),
+        transcribe=broken_stt,
+        dispatch=lambda command: command,
+        speak=spoken.append,
+        on_error=lambda error: "Ursäkta, jag kunde inte förstå det.",
+        stats_interval=0
+    )
+    run_until(engine, lambda: spoken)
+    assert spoken == ["Ursäkta, jag kunde inte förstå det."]
+    assert engine.stats()['stt']['errors'] == 1
+
+
+def test_record_without_speech_stops_early():
+    spoken = []
+    engine = PipelineEngine(
+        FakeDetector([1, 2]),
+        record=lambda position: None if position == 1 else (position, None),
+        transcribe=lambda audio, state: "hej",
+        dispatch=lambda command: command,
+        speak=spoken.append,
+        stats_interval=0
+    )
+    run_until(engine, lambda: spoken)
+    assert spoken == ["hej"]
+    assert engine.stats()['stt']['processed'] == 1
+
+
+def test_wake_word_interrupts_speech():
+    interrupted = threading.Event()
+    spoken = []
+
+    def speak(text):
+        spoken.append(text)
+        interrupted.wait(5.0)
+
+    detector = FakeDetector([1])
+    engine = PipelineEngine(
+        detector,
+        record=lambda position: (position, None),
+        transcribe=lambda audio, state: f"kommando {audio}",
+        dispatch=lambda command: command,
+        speak=speak,
+        barge_in=interrupted.set,
+        stats_interval=0
+    )
+    thread = threading.Thread(target=engine.run)
+    thread.start()
+    deadline = time.monotonic() + 5.0
+    while not spoken and time.monotonic() < deadline:
+        time.sleep(0.01)
+    # Saying the wake word again stops the reply and starts a new command
+    detector.positions.append(2)
+    while len(spoken) < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    engine.stop()
+    thread.join(5.0)
+    assert interrupted.is_set()
+    assert spoken == ["kommando 1", "kommando 2"]
+
+
+def test_wake_acknowledged_before_recording():
+    events = []
+
+    def record(position):
+        events.append(('record', position))
+        return None
+
+    engine = PipelineEngine(
+        FakeDetector([7]),
+        record=record,
+        transcribe=lambda audio, state: audio,
+        dispatch=lambda command: command,
+        speak=lambda text: None,
+        on_wake=lambda position: events.append(('ack', position)),
+        stats_interval=0
+    )
+    run_until(engine, lambda: len(events) == 2)
+    assert events == [('ack', 7), ('record', 7)]
+
+
+def test_stop_before_run_returns():
+    engine = PipelineEngine(
+        FakeDetector([]),
+        record=lambda position: None,
+        transcribe=lambda audio, state: None,
+        dispatch=lambda command: None,
+        speak=lambda reply: None,
+        stats_interval=0
+    )
+    # E.g. a required component failed to load before the pipeline started
+    engine.stop()
+    thread = threading.Thread(target=engine.run)
+    thread.start()
+    thread.join(2.0)
+    assert not thread.is_alive()
+
+
+def test_detector_failure_ends_run():
+    class FailingDetector(FakeDetector):
+        def detect(self):
+            raise RuntimeError("Wake word detection failed 20 times in a row")
+
+    engine = PipelineEngine(
+        FailingDetector([]),
+        record=lambda position: None,
+        transcribe=lambda audio, state: None,
+        dispatch=lambda command: None,
+        speak=lambda reply: None,
+        stats_interval=0
+    )
+    try:
+        engine.run()
+    except RuntimeError as e:
+        assert "20 times" in str(e)
+    else:
+        raise AssertionError("run() should raise the detector's error")
+
+
+if __name__ == "__main__":
+    test_commands_flow_through_all_stages()
+    test_detection_continues_while_stt_is_busy()
+    test_failed_stage_speaks_apology()
+    test_record_without_speech_stops_early()
+    test_wake_word_interrupts_speech()
+    test_wake_acknowledged_before_recording()
+    test_stop_before_run_returns()
+    test_detector_failure_ends_run()
+    print("✅ All pipeline tests passed!")
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Unit test for the playback queue and resampler behind the output stream.
+Runs without sounddevice or a sound card.
+"""
+
+import sys
+import threading
+import time
+import numpy as np
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from audio.earcon import Earcon
+from audio.playback import PlaybackQueue, Resampler
+
+
+def test_resampler_is_seamless_across_blocks():
+    t = np.arange(22050) / 22050
+    tone = (np.sin(2 * np.pi * 440 * t) * 10000).astype(np.int16)
+
+    whole = Resampler(22050, 48000).process(tone)
+    resampler = Resampler(22050, 48000)
+    blocks = np.concatenate([resampler.process(tone[i:i + 1000]) for i in range(0, len(tone), 1000)])
+
+    assert abs(len(whole) - 48000) <= 3
+    assert len(blocks) == len(whole)
+    # Only floating point rounding of the carried phase may differ
+    assert np.abs(blocks.astype(np.int32) - whole).max() <= 1
+
+
+def test_resampler_passes_matching_rate_through():
+    block = np.arange(10, dtype=np.int16)
+    assert Resampler(48000, 48000).process(block) is block
+
+
+def test_fill_spans_blocks_and_pads_with_silence():
+    queue = PlaybackQueue(max_samples=100)
+    queue.begin()
+    # Waiting for the first synthesized block is latency, not an underrun
+    for _ in range(20):
+        queue.fill(np.zeros(5, dtype=np.int16))
+    assert queue.underruns == 0
+    queue.put(np.full(3, 1, dtype=np.int16))
+    queue.put(np.full(4, 2, dtype=np.int16))
+
+    out = np.full(5, -1, dtype=np.int16)
+    assert queue.fill(out) == 5
+    assert out.tolist() == [1, 1, 1, 2, 2]
+    assert queue.fill(out) == 2
+    assert out.tolist() == [2, 2, 0, 0, 0]
+    # Running dry mid-utterance is an underrun
+    assert queue.underruns == 1 and queue.underrun_samples == 3
+
+    # Silence after the utterance was flushed is not
+    assert queue.flush(timeout=0)
+    queue.fill(out)
+    assert queue.underruns == 1
+    assert queue.stats()['played'] == 7
+
+
+def test_cancel_releases_blocked_producer():
+    queue = PlaybackQueue(max_samples=4)
+    queue.begin()
+    queue.put(np.ones(4, dtype=np.int16))
+    results = []
+    producer = threading.Thread(target=lambda: results.append(queue.put(np.ones(4, dtype=np.int16))))
+    producer.start()
+    time.sleep(0.05)
+    assert producer.is_alive()  # Queue full
+
+    queue.cancel()
+    producer.join(timeout=1.0)
+    assert results == [False]
+    assert queue.queued == 0 and queue.dropped == 4
+
+
+def test_flush_waits_for_callback():
+    queue = PlaybackQueue(max_samples=1000)
+    queue.begin()
+    queue.put(np.ones(600, dtype=np.int16))
+
+    def device():
+        out = np.zeros(100, dtype=np.int16)
+        for _ in range(10):
+            time.sleep(0.005)
+            queue.fill(out)
+
+    callback = threading.Thread(target=device)
+    callback.start()
+    assert queue.flush(timeout=2.0)
+    assert queue.played == 600
+    callback.join()
+
+
+def test_mixed_sound_overlays_speech_and_silence():
+    queue = PlaybackQueue(max_samples=100)
+    queue.begin()
+    queue.put(np.array([100, 32000, 100], dtype=np.int16))
+    queue.mix(np.full(6, 1000, dtype=np.int16))
+    queue.cancel()  # Barge-in drops speech but not the acknowledgement
+    queue.put(np.array([100, 32000, 100], dtype=np.int16))
+
+    out = np.zeros(4, dtype=np.int16)
+    queue.fill(out)
+    assert out.tolist() == [1100, 32767, 1100, 1000]  # Saturates instead of wrapping
+    queue.fill(out)
+    assert out.tolist() == [1000, 1000, 0, 0]
+
+
+def test_earcon_is_short_and_resampled_once():
+    earcon = Earcon.tone(rate=48000, note_ms=70, volume=0.3)
+    assert abs(earcon.duration - 0.14) < 0.001
+    assert np.abs(earcon.samples).max() <= 0.3 * 32767
+    assert earcon.samples[0] == 0  # Faded in, no click
+    resampled = earcon.at_rate(44100)
+    assert abs(len(resampled) - 0.14 * 44100) <= 2
+    assert earcon.at_rate(44100) is resampled
+
+
+if __name__ == "__main__":
+    test_resampler_is_seamless_across_blocks()
+    test_resampler_passes_matching_rate_through()
+    test_fill_spans_blocks_and_pads_with_silence()
+    test_cancel_releases_blocked_producer()
+    test_flush_waits_for_callback()
+    test_mixed_sound_overlays_speech_and_silence()
+    test_earcon_is_short_and_resampled_once()
+    print("✅ All playback tests passed!")
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Unit test for the priority speech scheduler.
+Uses a fake speaker, no audio hardware or TTS needed.
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from audio.scheduler import SpeechScheduler, parse_speech_payload
+from utils.workqueue import WorkQueue
+
+
+class FakeSpeaker:
+    """Speaks until released or interrupted, recording what was started."""
+
+    def __init__(self):
+        self.started = []
+        self.release = threading.Event()
+        self._interrupted = threading.Event()
+
+    def speak(self, text, stream=True):
+        self.started.append(text)
+        while not self.release.is_set() and not self._interrupted.is_set():
+            time.sleep(0.005)
+
+    def interrupt(self):
+        self._interrupted.set()
+
+    def clear_interrupt(self):
+        self._interrupted.clear()
+
+
+class SlowStartSpeaker(FakeSpeaker):
+    """Pauses between being handed a request and starting to speak it."""
+
+    def __init__(self):
+        super().__init__()
+        self.picked = threading.Event()
+        self.proceed = threading.Event()
+
+    def speak(self, text, stream=True):
+        self.picked.set()
+        self.proceed.wait()
+        super().speak(text, stream)
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    assert condition()
+
+
+def test_higher_priority_goes_first():
+    speaker = FakeSpeaker()
+    scheduler = SpeechScheduler(speaker)
+    first = scheduler.say("väder", priority='alert')
+    wait_for(lambda: speaker.started == ["väder"])
+    scheduler.say("nyheter", priority='info')
+    scheduler.say("svar", priority='reply')
+    speaker.release.set()
+    wait_for(lambda: len(speaker.started) == 3)
+    assert speaker.started == ["väder", "svar", "nyheter"]
+    assert first.wait(1.0) == 'spoken'
+    scheduler.stop()
+
+
+def test_alert_preempts_lower_priority_speech():
+    speaker = FakeSpeaker()
+    scheduler = SpeechScheduler(speaker)
+    announcement = scheduler.say("tvätten är klar", priority='info')
+    wait_for(lambda: speaker.started == ["tvätten är klar"])
+    alert = scheduler.say("brandlarm", priority='alert')
+    assert announcement.wait(1.0) == 'preempted'
+    wait_for(lambda: speaker.started[-1] == "brandlarm")
+    speaker.release.set()
+    assert alert.wait(1.0) == 'spoken'
+    assert scheduler.counters['preempted'] == 1
+    scheduler.stop()
+
+
+def test_preemption_before_speech_starts_is_kept():
+    speaker = SlowStartSpeaker()
+    scheduler = SpeechScheduler(speaker)
+    announcement = scheduler.say("tvätten är klar", priority='info')
+    speaker.picked.wait(1.0)
+    alert = scheduler.say("brandlarm", priority='alert')
+    speaker.proceed.set()
+    assert announcement.wait(1.0) == 'preempted'
+    wait_for(lambda: speaker.started[-1] == "brandlarm")
+    speaker.release.set()
+    assert alert.wait(1.0) == 'spoken'
+    scheduler.stop()
+
+
+def test_command_workers_wait_for_speech():
+    speaker = FakeSpeaker()
+    scheduler = SpeechScheduler(speaker)
+    # As in GenioAI: each worker holds its command until the reply was spoken
+    commands = WorkQueue(lambda item: scheduler.say(*item).wait(), workers=2,
+                         maxsize=1, overflow='reject')
+    commands.submit(("nyheter", 'info'))
+    wait_for(lambda: speaker.started == ["nyheter"])
+    commands.submit(("väder", 'info'))
+    wait_for(lambda: scheduler.depth == 1)
+    assert commands.submit(("sport", 'info'))
+    assert not commands.submit(("börsen", 'info'))  # The queue's policy still applies
+    speaker.release.set()
+    wait_for(lambda: commands.metrics()['processed'] == 3)
+    assert speaker.started == ["nyheter", "väder", "sport"]
+    commands.stop()
+    scheduler.stop()
+
+
+def test_second_command_worker_lets_alert_preempt():
+    speaker = FakeSpeaker()
+    scheduler = SpeechScheduler(speaker)
+    requests = []
+
+    def handle(item):
+        requests.append(scheduler.say(*item))
+        requests[-1].wait()
+
+    commands = WorkQueue(handle, workers=2)
+    commands.submit(("tvätten är klar", 'info'))
+    wait_for(lambda: speaker.started == ["tvätten är klar"])
+    commands.submit(("brandlarm", 'alert'))
+    wait_for(lambda: speaker.started[-1] == "brandlarm")
+    assert requests[0].wait(1.0) == 'preempted'
+    speaker.release.set()
+    commands.stop()
+    scheduler.stop()
+
+
+def test_identical_queued_texts_are_merged():
+    speaker = FakeSpeaker()
+    scheduler = SpeechScheduler(speaker)
+    scheduler.say("upptagen", priority='reply')
+    wait_for(lambda: speaker.started == ["upptagen"])
+    done = []
+    first = scheduler.say("post", priority='info', on_done=done.append)
+    second = scheduler.say("post", priority='reply', on_done=done.append)
+    assert second is first and first.priority == 'reply'
+    assert scheduler.depth == 1
+    speaker.release.set()
+    wait_for(lambda: len(done) == 2)
+    assert speaker.started == ["upptagen", "post"]
+    scheduler.stop()
+
+
+def test_stale_requests_expire():
+    speaker = FakeSpeaker()
+    scheduler = SpeechScheduler(speaker)
+    scheduler.say("lång mening", priority='reply')
+    wait_for(lambda: speaker.started == ["lång mening"])
+    stale = scheduler.say("bussen går nu", priority='info', ttl=0.05)
+    time.sleep(0.1)
+    speaker.release.set()
+    assert stale.wait(1.0) == 'expired'
+    assert speaker.started == ["lång mening"]
+    scheduler.stop()
+
+
+def test_barge_in_keeps_alerts():
+    speaker = FakeSpeaker()
+    scheduler = SpeechScheduler(speaker)
+    current = scheduler.say("svar", priority='reply')
+    wait_for(lambda: speaker.started == ["svar"])
+    info = scheduler.say("info", priority='info')
+    # Preempts "svar", then barge-in interrupts the alert itself
+    alert = scheduler.say("larm", priority='alert')
+    wait_for(lambda: speaker.started[-1] == "larm")
+    scheduler.say("larm igen", priority='alert')
+    assert scheduler.interrupt(keep='alert')
+    assert current.wait(1.0) == 'preempted'
+    assert info.wait(1.0) == 'dropped'
+    assert alert.wait(1.0) == 'interrupted'
+    wait_for(lambda: speaker.started[-1] == "larm igen")
+    scheduler.stop()
+
+
+def test_payload_fields():
+    assert parse_speech_payload("tänd lampan") == ("tänd lampan", 'info', None)
+    assert parse_speech_payload('{"text": "Rök i köket", "priority": "alert", "ttl": 30}') == \
+        ("Rök i köket", 'alert', 30.0)
+    assert parse_speech_payload("42") == ("42", 'info', None)
+    try:
+        parse_speech_payload('{"text": "x", "priority": "urgent"}')
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("unknown priority should be rejected")
+
+
+if __name__ == "__main__":
+    test_higher_priority_goes_first()
+    test_alert_preempts_lower_priority_speech()
+    test_preemption_before_speech_starts_is_kept()
+    test_command_workers_wait_for_speech()
+    test_second_command_worker_lets_alert_preempt()
+    test_identical_queued_texts_are_merged()
+    test_stale_requests_expire()
+    test_barge_in_keeps_alerts()
+    test_payload_fields()
+    print("✅ All speech scheduler tests passed!")
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Unit test for the parallel startup timeline.
+Runs without any engines installed.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from utils.startup import StartupTimeline
+
+
+def test_parallel_components_overlap():
+    timeline = StartupTimeline(parallel=True)
+    start = time.monotonic()
+    for name in ("stt", "tts", "wakeword"):
+        timeline.start(name, lambda: time.sleep(0.2))
+    timeline.wait_all()
+    assert time.monotonic() - start < 0.5
+    assert set(timeline.entries) == {"stt", "tts", "wakeword"}
+    assert len(timeline.summary()) == 3
+
+
+def test_sequential_runs_inline():
+    timeline = StartupTimeline(parallel=False)
+    future = timeline.start("tts", lambda: "ready")
+    assert future.done()
+    assert timeline.wait("tts") == "ready"
+
+
+def test_errors_surface_on_wait():
+    timeline = StartupTimeline(parallel=True)
+
+    def fail():
+        raise RuntimeError("model missing")
+
+    timeline.start("stt", fail)
+    try:
+        timeline.wait("stt")
+        assert False, "expected the initializer error"
+    except RuntimeError as e:
+        assert "model missing" in str(e)
+    timeline.wait_all()
+
+
+def test_failures_are_reported():
+    timeline = StartupTimeline(parallel=True)
+
+    def fail():
+        raise FileNotFoundError("models/sv_SE-nst-medium.onnx")
+
+    timeline.start("tts", fail)
+    timeline.start("stt", lambda: "ready")
+    failures = timeline.wait_all()
+    assert list(failures) == ["tts"] and isinstance(failures["tts"], FileNotFoundError)
+    assert timeline.failures.keys() == {"tts"}
+    lines = {line.split()[0]: line for line in timeline.summary()}
+    assert "FAILED" in lines["tts"] and "ready" not in lines["tts"]
+    assert "ready" in lines["stt"]
+
+
+if __name__ == "__main__":
+    test_parallel_components_overlap()
+    test_sequential_runs_inline()
+    test_errors_surface_on_wait()
+    test_failures_are_reported()
+    print("✅ All startup timeline tests passed!")
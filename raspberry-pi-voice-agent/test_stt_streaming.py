@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Unit test for incremental transcription with local agreement.
+Uses a fake Whisper model, runs without faster-whisper or a model download.
+"""
+
+import sys
+import numpy as np
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from stt.streaming import StreamingTranscriber
+
+RATE = 16000
+SCRIPT = ["tänd", "lampan", "i", "köket", "nu"]
+
+
+class FakeModel:
+    """Emits one word of SCRIPT per half second of audio."""
+
+    def transcribe(self, audio, initial_prompt=None, **kwargs):
+        offset = len(initial_prompt.split()) if initial_prompt else 0
+        words = [
+            SimpleNamespace(word=" " + SCRIPT[offset + i], end=(i + 1) * 0.5)
+            for i in range(min(len(audio) // (RATE // 2), len(SCRIPT) - offset))
+        ]
+        return [SimpleNamespace(words=words)], None
+
+
+class FakeSTT:
+    language = "sv"
+
+    def __init__(self):
+        self.model = FakeModel()
+        self.tail_lengths = []
+
+    def transcribe(self, audio):
+        self.tail_lengths.append(len(audio))
+        return "nu"
+
+
+def test_commits_agreed_prefix_and_decodes_only_tail():
+    stt = FakeSTT()
+    partials = []
+    transcriber = StreamingTranscriber(stt, rate=RATE, on_partial=partials.append)
+    audio = np.zeros(RATE * 2 + RATE // 2, dtype=np.int16)  # 2.5 s, five words
+
+    transcriber._update(audio[:RATE])          # hypothesis: tänd lampan
+    assert transcriber.committed_words == []
+    transcriber._update(audio[:RATE * 2])      # agrees on tänd lampan
+    assert transcriber.committed_words == ["tänd", "lampan"]
+    assert transcriber.committed_samples == RATE
+    assert partials[-1] == "tänd lampan i köket"
+
+    text = transcriber.finish(audio)
+    assert stt.tail_lengths == [len(audio) - RATE]
+    assert text == "tänd lampan nu"
+
+
+def test_finish_without_updates_decodes_everything():
+    stt = FakeSTT()
+    transcriber = StreamingTranscriber(stt, rate=RATE)
+    audio = np.zeros(RATE, dtype=np.int16)
+    assert transcriber.finish(audio) == "nu"
+    assert stt.tail_lengths == [RATE]
+
+
+if __name__ == "__main__":
+    test_commits_agreed_prefix_and_decodes_only_tail()
+    test_finish_without_updates_decodes_everything()
+    print("✅ All streaming STT tests passed!")
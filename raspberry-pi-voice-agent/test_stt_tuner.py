@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Unit test for the STT auto-tuner scoring and profile selection.
+Runs without faster-whisper or a model download.
+"""
+
+import sys
+import tempfile
+import yaml
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from stt.tuner import word_error_rate, candidate_profiles, choose_best, write_profile
+
+
+def test_word_error_rate():
+    assert word_error_rate("tänd lampan i köket", "Tänd lampan i köket.") == 0.0
+    assert word_error_rate("tänd lampan", "släck lampan") == 0.5
+    assert word_error_rate("tänd lampan", "tänd") == 0.5
+    assert word_error_rate("tänd", "tänd lampan nu") == 2.0
+
+
+def test_candidate_profiles_cover_compute_types():
+    profiles = candidate_profiles(quick=True)
+    assert {p["compute_type"] for p in profiles} == {"int8", "int8_float32", "float32"}
+    assert all(p["beam_size"] == 1 for p in profiles)
+
+
+def test_choose_fastest_within_tolerance():
+    results = [
+        ({"name": "accurate"}, {"rtf": 0.9, "wer": 0.10}),
+        ({"name": "fast"}, {"rtf": 0.3, "wer": 0.11}),
+        ({"name": "fastest_but_bad"}, {"rtf": 0.1, "wer": 0.30}),
+    ]
+    profile, _ = choose_best(results, wer_tolerance=0.02)
+    assert profile["name"] == "fast"
+
+
+def test_written_profile_is_stt_override():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "stt_profile.yaml"
+        write_profile({"compute_type": "int8", "beam_size": 1}, path)
+        assert yaml.safe_load(path.read_text())["stt"]["compute_type"] == "int8"
+
+
+if __name__ == "__main__":
+    test_word_error_rate()
+    test_candidate_profiles_cover_compute_types()
+    test_choose_fastest_within_tolerance()
+    test_written_profile_is_stt_override()
+    print("✅ All STT tuner tests passed!")
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Unit test for end-to-end latency tracing.
+Runs without any engines installed.
+"""
+
+import json
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from utils.tracing import Tracer, percentile
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile(values, 99) == 99
+    assert percentile([7], 99) == 7
+    assert percentile([], 50) is None
+
+
+def test_spans_follow_the_trace_across_threads():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "traces.jsonl"
+        published = []
+        tracer = Tracer(path=path, publish=published.append)
+
+        trace = tracer.start('interaction')
+        with tracer.activate(trace):
+            with tracer.span('record'):
+                time.sleep(0.01)
+
+        # A later pipeline stage activates the same trace on its own thread
+        def stage():
+            with tracer.activate(trace):
+                with tracer.span('whisper_decode'):
+                    time.sleep(0.01)
+                tracer.record('tts_first_audio', 0.005)
+
+        worker = threading.Thread(target=stage)
+        worker.start()
+        worker.join()
+        tracer.finish(trace)
+
+        lines = path.read_text(encoding='utf-8').splitlines()
+        assert len(lines) == 1
+        record = json.loads(lines[0])
+        assert [span['name'] for span in record['spans']] == ['record', 'whisper_decode', 'tts_first_audio']
+        assert record['spans'][0]['duration_ms'] >= 10
+        assert record['duration_ms'] >= 20
+        assert published == lines
+
+
+def test_spans_without_active_trace_are_ignored():
+    tracer = Tracer()
+    with tracer.span('record'):
+        pass
+    tracer.record('tts_total', 1.0)
+    assert tracer.summary() == {}
+
+
+def test_summary_percentiles():
+    tracer = Tracer()
+    for ms in range(1, 101):
+        trace = tracer.start('interaction')
+        trace.add('whisper_decode', trace.start, ms / 1000.0)
+        tracer.finish(trace)
+    summary = tracer.summary()
+    assert summary['whisper_decode']['count'] == 100
+    assert summary['whisper_decode']['p50_ms'] == 50.0
+    assert summary['whisper_decode']['p99_ms'] == 99.0
+    assert len(tracer.format_summary()) == 2
+
+
+def test_disabled_tracer_is_a_no_op():
+    tracer = Tracer(enabled=False)
+    trace = tracer.start('interaction')
+    assert trace is None
+    with tracer.activate(trace):
+        with tracer.span('record'):
+            pass
+    tracer.finish(trace)
+    assert tracer.summary() == {}
+
+
+def test_trace_file_is_rotated():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "traces.jsonl"
+        tracer = Tracer(path=path, max_file_bytes=300)
+        for _ in range(20):
+            tracer.finish(tracer.start('interaction'))
+        rotated = path.with_name("traces.jsonl.1")
+        assert rotated.exists()
+        assert {p.name for p in Path(tmp).iterdir()} <= {"traces.jsonl", "traces.jsonl.1"}
+        assert rotated.stat().st_size <= 300 + 200  # One trace past the budget at most
+        assert not path.exists() or path.stat().st_size <= 300
+        json.loads(rotated.read_text(encoding='utf-8').splitlines()[-1])
+
+
+if __name__ == "__main__":
+    test_percentile_nearest_rank()
+    test_spans_follow_the_trace_across_threads()
+    test_spans_without_active_trace_are_ignored()
+    test_summary_percentiles()
+    test_disabled_tracer_is_a_no_op()
+    test_trace_file_is_rotated()
+    print("✅ All tracing tests passed!")
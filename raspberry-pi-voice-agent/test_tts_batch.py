@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Unit test for the phrasebook pre-renderer: phrase lists, manifest
+skipping and output files. Runs without Piper.
+"""
+
+import sys
+import wave
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from tts.batch import load_phrases, load_manifest, write_manifest, plan, write_audio, phrase_id
+from tts.cache import cache_key
+
+
+def test_load_text_csv_and_yaml():
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        (tmp / "a.txt").write_text("# kommentar\nTvätten är klar.\n\nTvätten är klar.\n", encoding="utf-8")
+        assert load_phrases(tmp / "a.txt") == [
+            ("tvätten_är_klar", "Tvätten är klar."),
+            ("tvätten_är_klar_2", "Tvätten är klar."),
+        ]
+        (tmp / "b.csv").write_text("id,text\nlarm,Brandlarm i köket\n", encoding="utf-8")
+        assert load_phrases(tmp / "b.csv") == [("larm", "Brandlarm i köket")]
+        (tmp / "c.csv").write_text("God morgon\n", encoding="utf-8")
+        assert load_phrases(tmp / "c.csv") == [("god_morgon", "God morgon")]
+        (tmp / "d.yaml").write_text("- Hej\n- id: post\n  text: Posten har kommit\n", encoding="utf-8")
+        assert load_phrases(tmp / "d.yaml") == [("hej", "Hej"), ("post", "Posten har kommit")]
+        (tmp / "e.yaml").write_text("buss: Bussen går om fem minuter\n", encoding="utf-8")
+        assert load_phrases(tmp / "e.yaml") == [("buss", "Bussen går om fem minuter")]
+
+
+def test_phrase_id():
+    assert phrase_id("Klockan är 15:30!") == "klockan_är_15_30"
+    assert phrase_id("?!") == "phrase"
+
+
+def test_plan_skips_up_to_date_entries():
+    phrases = [("hej", "Hej"), ("post", "Posten har kommit")]
+    with tempfile.TemporaryDirectory() as tmp:
+        manifest = load_manifest(tmp)
+        jobs, skipped = plan(phrases, manifest, "voice-a", tmp)
+        assert [job[0] for job in jobs] == ["hej", "post"] and skipped == []
+
+        (Path(tmp) / "hej.wav").write_bytes(b"")
+        manifest['entries']['hej'] = {'hash': cache_key("voice-a", "Hej"), 'file': "hej.wav"}
+        manifest['entries']['post'] = {'hash': cache_key("voice-a", "Posten har kommit"), 'file': "post.wav"}
+        write_manifest(tmp, manifest)
+        manifest = load_manifest(tmp)
+        jobs, skipped = plan(phrases, manifest, "voice-a", tmp)
+        # post.wav is missing on disk, so it is rendered again
+        assert skipped == ["hej"] and [job[0] for job in jobs] == ["post"]
+        # A new voice model or format invalidates everything
+        assert plan(phrases, manifest, "voice-b", tmp)[1] == []
+        assert plan(phrases, manifest, "voice-a", tmp, fmt='pcm')[1] == []
+        assert plan(phrases, manifest, "voice-a", tmp, force=True)[1] == []
+
+
+def test_write_wav_and_pcm():
+    audio = (np.sin(np.arange(2205) / 5.0) * 8000).astype(np.int16)
+    with tempfile.TemporaryDirectory() as tmp:
+        write_audio(Path(tmp) / "x.wav", audio, 22050, 'wav')
+        with wave.open(str(Path(tmp) / "x.wav"), 'rb') as wf:
+            assert wf.getframerate() == 22050 and wf.getnchannels() == 1
+            assert np.array_equal(np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16), audio)
+        write_audio(Path(tmp) / "x.pcm", audio, 22050, 'pcm')
+        assert np.array_equal(np.fromfile(Path(tmp) / "x.pcm", dtype='<i2'), audio)
+        assert sorted(p.name for p in Path(tmp).iterdir()) == ["x.pcm", "x.wav"]
+
+
+if __name__ == "__main__":
+    test_load_text_csv_and_yaml()
+    test_phrase_id()
+    test_plan_skips_up_to_date_entries()
+    test_write_wav_and_pcm()
+    print("✅ All TTS batch tests passed!")
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Unit test for the two-tier TTS audio cache.
+Runs without Piper or an audio device.
+"""
+
+import os
+import sys
+import tempfile
+import numpy as np
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from tts.cache import AudioCache, cache_key
+
+
+def make_audio(samples, value=1):
+    return np.full(samples, value, dtype=np.int16)
+
+
+def test_key_depends_on_voice_and_text():
+    assert cache_key("voice-a", "Hej") == cache_key("voice-a", "Hej")
+    assert cache_key("voice-a", "Hej") != cache_key("voice-b", "Hej")
+    assert cache_key("voice-a", "Hej") != cache_key("voice-a", "Hej!")
+
+
+def test_memory_hit_and_miss():
+    cache = AudioCache(max_memory_bytes=1024)
+    key = cache_key("voice", "Du sa:")
+    assert cache.get(key) is None
+    cache.put(key, make_audio(100))
+    assert np.array_equal(cache.get(key), make_audio(100))
+    stats = cache.get_stats()
+    assert stats['misses'] == 1
+    assert stats['memory_hits'] == 1
+
+
+def test_lru_eviction_respects_byte_budget():
+    cache = AudioCache(max_memory_bytes=400)
+    keys = [cache_key("voice", str(i)) for i in range(3)]
+    cache.put(keys[0], make_audio(100))
+    cache.put(keys[1], make_audio(100))
+    cache.get(keys[0])  # keys[1] becomes least recently used
+    cache.put(keys[2], make_audio(100))
+    stats = cache.get_stats()
+    assert stats['evictions'] == 1
+    assert stats['memory_bytes'] <= 400
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None
+
+
+def test_disk_tier_survives_restart():
+    with tempfile.TemporaryDirectory() as tmp:
+        key = cache_key("voice", "Ursäkta, jag kunde inte förstå det.")
+        AudioCache(cache_dir=tmp).put(key, make_audio(50, value=7))
+
+        restarted = AudioCache(cache_dir=tmp)
+        audio = restarted.get(key)
+        assert isinstance(audio, np.memmap)
+        assert np.array_equal(audio, make_audio(50, value=7))
+        assert restarted.get_stats()['disk_hits'] == 1
+
+
+def test_disk_tier_evicts_least_recently_used():
+    with tempfile.TemporaryDirectory() as tmp:
+        keys = [cache_key("voice", text) for text in ("ett", "två", "tre")]
+        cache = AudioCache(cache_dir=tmp, max_disk_bytes=250)
+        cache.put(keys[0], make_audio(50))
+        cache.put(keys[1], make_audio(50))
+        os.utime(Path(tmp) / f"{keys[0]}.pcm", (1000, 1000))
+        os.utime(Path(tmp) / f"{keys[1]}.pcm", (2000, 2000))
+
+        restarted = AudioCache(cache_dir=tmp, max_disk_bytes=250)
+        assert restarted.get_stats()['disk_bytes'] == 200
+        assert restarted.get(keys[0]) is not None  # Read from disk, now the newest
+        restarted.put(keys[2], make_audio(50))
+
+        remaining = {path.stem for path in Path(tmp).glob("*.pcm")}
+        assert remaining == {keys[0], keys[2]}
+        stats = restarted.get_stats()
+        assert stats['disk_evictions'] == 1
+        assert stats['disk_bytes'] == 200
+
+
+if __name__ == "__main__":
+    test_key_depends_on_voice_and_text()
+    test_memory_hit_and_miss()
+    test_lru_eviction_respects_byte_budget()
+    test_disk_tier_survives_restart()
+    test_disk_tier_evicts_least_recently_used()
+    print("✅ All TTS cache tests passed!")
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Unit test for template-aware speech: slot matching, silence trimming and
+crossfading pre-rendered fragments. Runs without Piper or an audio device.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from tts.templates import SpeechTemplate, trim_silence, crossfade_blocks
+
+
+def test_template_parts_and_match():
+    template = SpeechTemplate('echo', "Du sa: {command}")
+    assert template.parts == [('text', "Du sa:"), ('slot', 'command')]
+    assert template.fragments == ["Du sa:"]
+    assert template.match("Du sa: tänd lampan.") == {'command': "tänd lampan."}
+    assert template.match("  Du sa: hej  ") == {'command': "hej"}
+
+
+def test_template_rejects_other_text():
+    template = SpeechTemplate('received', "Mottaget kommando: {command}")
+    assert template.match("Du sa: hej") is None
+    assert template.match("Mottaget kommando:   ") is None
+    try:
+        SpeechTemplate('bad', "Värde {0}")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("positional slots should be rejected")
+
+
+def test_trim_silence_keeps_margin():
+    audio = np.zeros(1000, dtype=np.int16)
+    audio[400:600] = 5000
+    trimmed = trim_silence(audio, keep=50)
+    assert len(trimmed) == 300
+    assert trimmed[50] == 5000 and trimmed[0] == 0
+    assert len(trim_silence(np.zeros(100, dtype=np.int16))) == 0
+
+
+def test_crossfade_joins_segments():
+    first = np.full(3000, 1000, dtype=np.int16)
+    second = np.full(2000, -1000, dtype=np.int16)
+    calls = []
+
+    def pending():
+        calls.append(True)
+        return second
+
+    blocks = list(crossfade_blocks([first, pending], fade=100, block_frames=512))
+    audio = np.concatenate(blocks)
+    assert calls == [True]
+    assert len(audio) == len(first) + len(second) - 100
+    assert all(len(block) <= 512 for block in blocks)
+    # The seam ramps from one level to the other without a jump
+    assert np.max(np.abs(np.diff(audio.astype(np.int32)))) < 50
+    assert audio[0] == 1000 and audio[-1] == -1000
+
+
+def test_first_segment_plays_before_later_ones_render():
+    ready = []
+
+    def slot():
+        ready.append(True)
+        return np.ones(500, dtype=np.int16)
+
+    blocks = crossfade_blocks([np.ones(4096, dtype=np.int16), slot], fade=64, block_frames=1024)
+    next(blocks)
+    assert ready == []
+
+
+if __name__ == "__main__":
+    test_template_parts_and_match()
+    test_template_rejects_other_text()
+    test_trim_silence_keeps_margin()
+    test_crossfade_joins_segments()
+    test_first_segment_plays_before_later_ones_render()
+    print("✅ All TTS template tests passed!")
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Unit test for sentence splitting used by pipelined TTS playback.
+Runs without Piper or an audio device.
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from tts.text import split_sentences
+
+
+def test_splits_on_sentence_end():
+    chunks = split_sentences("Hej! Hur mår du? Jag mår bra.")
+    assert chunks == ["Hej!", "Hur mår du?", "Jag mår bra."]
+
+
+def test_long_sentence_split_on_clauses():
+    long_sentence = ", ".join(["detta är en ganska lång bisats"] * 6) + "."
+    chunks = split_sentences(long_sentence, max_chars=60)
+    assert len(chunks) == 6
+    assert all(len(chunk) <= 60 for chunk in chunks)
+
+
+def test_empty_text():
+    assert split_sentences("") == []
+    assert split_sentences("   ") == []
+
+
+def test_short_sentence_kept_whole():
+    assert split_sentences("Mottaget kommando: tänd lampan") == ["Mottaget kommando: tänd lampan"]
+
+
+if __name__ == "__main__":
+    test_splits_on_sentence_end()
+    test_long_sentence_split_on_clauses()
+    test_empty_text()
+    test_short_sentence_kept_whole()
+    print("✅ All sentence splitting tests passed!")
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Unit test for the voice registry and switching voices in PiperTTS.
+Uses empty model files with real-looking configs; nothing is synthesized.
+"""
+
+import sys
+import json
+import tempfile
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from audio.sinks import NullSink
+from tts.tts_engine import PiperTTS
+from tts.voices import VoiceRegistry
+
+
+def make_voice(directory, name, sample_rate, speakers=None):
+    model = Path(directory) / f"{name}.onnx"
+    model.write_bytes(b"onnx")
+    config = {
+        "audio": {"sample_rate": sample_rate, "quality": "x_low" if sample_rate == 16000 else "medium"},
+        "espeak": {"voice": "sv"},
+        "inference": {"noise_scale": 0.5, "length_scale": 1.1, "noise_w": 0.7},
+        "num_speakers": len(speakers or {}) or 1,
+        "speaker_id_map": speakers or {},
+    }
+    Path(f"{model}.json").write_text(json.dumps(config), encoding="utf-8")
+    return model
+
+
+def test_voice_reads_model_config():
+    with tempfile.TemporaryDirectory() as tmp:
+        voices = VoiceRegistry()
+        voice = voices.add("lag", make_voice(tmp, "lag", 16000, {"anna": 0, "nils": 1}), speaker="nils")
+        assert voice.sample_rate == 16000 and voice.language == "sv"
+        assert (voice.length_scale, voice.noise_scale, voice.noise_w) == (1.1, 0.5, 0.7)
+        assert voice.speaker_id == 1 and voice.num_speakers == 2
+        assert voice.resolve_speaker("0") == 0
+        for speaker in ("olle", 5):
+            try:
+                voice.resolve_speaker(speaker)
+            except ValueError:
+                pass
+            else:
+                raise AssertionError(f"speaker {speaker!r} should be rejected")
+
+
+def test_overrides_change_the_cache_fingerprint():
+    with tempfile.TemporaryDirectory() as tmp:
+        model = make_voice(tmp, "mellan", 22050)
+        voices = VoiceRegistry()
+        normal = voices.add("normal", model)
+        fast = voices.add("snabb", model, length_scale=0.8)
+        assert fast.length_scale == 0.8 and normal.length_scale == 1.1
+        assert fast.fingerprint != normal.fingerprint
+        assert voices.names == ["normal", "snabb"] and "snabb" in voices
+        try:
+            voices.get("saknas")
+        except KeyError:
+            pass
+        else:
+            raise AssertionError("unknown voices should raise KeyError")
+
+
+def test_engine_uses_config_sample_rate_and_switches():
+    with tempfile.TemporaryDirectory() as tmp:
+        voices = VoiceRegistry()
+        voices.add("lag", make_voice(tmp, "lag", 16000, {"anna": 0, "nils": 1}), speaker="anna")
+        tts = PiperTTS(make_voice(tmp, "mellan", 22050), use_python_api=False, sink=NullSink(), voices=voices)
+        assert voices.names == ["lag", "mellan"]
+        assert tts.sample_rate == 22050 and tts.model_path.name == "mellan.onnx"
+        medium_id = tts.voice_id
+        assert "--speaker" not in tts._piper_command()
+
+        tts.select_voice("lag")
+        assert tts.sample_rate == 16000 and tts.model_path.name == "lag.onnx"
+        assert tts.voice_id != medium_id
+        command = tts._piper_command()
+        assert command[command.index("--speaker") + 1] == "0"
+        assert command[command.index("--length_scale") + 1] == "1.1"
+
+
+if __name__ == "__main__":
+    test_voice_reads_model_config()
+    test_overrides_change_the_cache_fingerprint()
+    test_engine_uses_config_sample_rate_and_switches()
+    print("✅ All TTS voice tests passed!")
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Unit test for voice-activity endpointing.
+Uses synthetic audio, runs without a microphone.
+"""
+
+import sys
+import numpy as np
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from audio.capture import AudioCapture
+from audio.microphone import Microphone
+from audio.sources import PipeSource
+from audio.vad import EnergyVAD, Endpointer
+
+RATE = 16000
+
+
+def tone(seconds, amplitude=0.3):
+    t = np.arange(int(RATE * seconds)) / RATE
+    return (np.sin(2 * np.pi * 220 * t) * amplitude * 32767).astype(np.int16)
+
+
+def silence(seconds):
+    rng = np.random.default_rng(0)
+    return rng.normal(0, 20, int(RATE * seconds)).astype(np.int16)
+
+
+def run(endpointer, audio):
+    """Feed audio block by block and return seconds consumed when the endpointer stops."""
+    block = endpointer.block_length
+    for start in range(0, len(audio) - block + 1, block):
+        if endpointer.update(audio[start:start + block]):
+            return (start + block) / RATE
+    return None
+
+
+def test_speech_frames_detected():
+    vad = EnergyVAD(rate=RATE)
+    audio = np.concatenate([silence(0.3), tone(0.3)])
+    speech = vad.is_speech(audio)
+    assert not speech[:5].any()
+    assert speech[-5:].all()
+
+
+def test_ends_after_trailing_silence():
+    endpointer = Endpointer(EnergyVAD(rate=RATE), trailing_silence_ms=500, max_seconds=10)
+    audio = np.concatenate([silence(0.3), tone(0.6), silence(3.0)])
+    stopped_at = run(endpointer, audio)
+    assert endpointer.reason == 'end_of_speech'
+    # Speech ends at 0.9 s; we should stop roughly 0.5 s later, not at max_seconds
+    assert 1.3 <= stopped_at <= 1.6
+
+
+def test_no_speech_times_out():
+    endpointer = Endpointer(EnergyVAD(rate=RATE), start_timeout=1.0)
+    stopped_at = run(endpointer, silence(3.0))
+    assert endpointer.reason == 'no_speech'
+    assert stopped_at <= 1.05
+
+
+def test_max_duration():
+    endpointer = Endpointer(EnergyVAD(rate=RATE), max_seconds=1.0)
+    run(endpointer, tone(2.0))
+    assert endpointer.reason == 'max_duration'
+
+
+def test_speech_in_first_frame_is_detected():
+    vad = EnergyVAD(rate=RATE)
+    assert vad.is_speech(tone(0.1)).all()
+    assert vad.is_speech(np.concatenate([silence(0.3), tone(0.3)]))[-5:].all()
+
+
+def test_preroll_does_not_end_recording_early():
+    import io
+
+    vad = EnergyVAD(rate=RATE)
+    vad.is_speech(silence(1.0))  # Noise floor learned by an earlier command
+    endpointer = Endpointer(vad, start_timeout=3.0, trailing_silence_ms=700, max_seconds=8.0)
+    wake_end = int(RATE * 1.5)
+    # Wake word, a 1.5 s pause, then the command
+    audio = np.concatenate([silence(1.0), tone(0.5), silence(1.5), tone(0.6), silence(3.0)])
+    capture = AudioCapture(rate=RATE, frame_length=512, capacity_seconds=10,
+                           source=PipeSource(io.BytesIO(audio.tobytes()), rate=RATE))
+    mic = Microphone(capture=capture, preroll_ms=300, endpointer=endpointer)
+    capture.start()
+    mic.mark_start(wake_end)
+    recording = mic.listen()
+    capture.stop()
+    assert endpointer.reason == 'end_of_speech'
+    # Pre-roll is kept, and recording ends about 0.7 s after the command
+    assert 0.3 + 2.1 + 0.6 <= len(recording) / RATE <= 0.3 + 2.1 + 0.9
+    assert np.abs(recording[:int(RATE * 0.3)]).max() > 0.2
+
+
+if __name__ == "__main__":
+    test_speech_frames_detected()
+    test_ends_after_trailing_silence()
+    test_no_speech_times_out()
+    test_max_duration()
+    test_speech_in_first_frame_is_detected()
+    test_preroll_does_not_end_recording_early()
+    print("✅ All VAD endpointing tests passed!")
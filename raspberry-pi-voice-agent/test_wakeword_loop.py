@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Unit test for the wake word detection loop's error handling.
+Uses a fake Porcupine engine, runs without pvporcupine or a microphone.
+"""
+
+import io
+import sys
+import time
+import numpy as np
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from audio.capture import AudioCapture, CaptureStopped
+from audio.sources import PipeSource
+from wakeword.porcupine_detector import PorcupineDetector
+
+
+class FakePorcupine:
+    frame_length = 512
+    sample_rate = 16000
+
+    def __init__(self, fail=False, keyword_at=None):
+        self.fail = fail
+        self.keyword_at = keyword_at  # Frame index where the keyword is heard
+        self.frames = 0
+
+    def process(self, pcm):
+        if self.fail:
+            raise ValueError("bad frame")
+        assert len(pcm) == self.frame_length
+        self.frames += 1
+        return 0 if self.frames - 1 == self.keyword_at else -1
+
+
+def make_detector(porcupine, **kwargs):
+    detector = PorcupineDetector("key", keywords=["porcupine"], **kwargs)
+    detector.porcupine = porcupine
+    detector._prepare_frame_buffer()
+    detector.is_initialized = True
+    return detector
+
+
+def test_finite_source_ends_detection():
+    audio = np.zeros(512 * 4, dtype=np.int16)
+    detector = make_detector(FakePorcupine(), source=PipeSource(io.BytesIO(audio.tobytes())))
+    assert [detector.detect() for _ in range(4)] == [False] * 4
+    try:
+        detector.detect()
+    except CaptureStopped:
+        pass
+    else:
+        raise AssertionError("detect() should raise once the source ended")
+
+
+def test_stopped_capture_ends_detection():
+    audio = np.zeros(512 * 4, dtype=np.int16)
+    capture = AudioCapture(rate=16000, frame_length=512, capacity_seconds=1,
+                           source=PipeSource(io.BytesIO(audio.tobytes())))
+    detector = make_detector(FakePorcupine())
+    detector.reader = capture.reader()
+    capture.start()
+    start = time.monotonic()
+    detector.listen_for_wake_word()  # Returns instead of spinning once capture stops
+    assert time.monotonic() - start < 2.0
+    capture.stop()
+
+
+def test_repeated_errors_back_off_then_raise():
+    audio = np.zeros(512 * 10, dtype=np.int16)
+    detector = make_detector(FakePorcupine(fail=True), max_errors=4,
+                             source=PipeSource(io.BytesIO(audio.tobytes())))
+    start = time.monotonic()
+    assert [detector.detect() for _ in range(3)] == [False] * 3
+    assert time.monotonic() - start >= 0.07  # 10 + 20 + 40 ms
+    try:
+        detector.detect()
+    except RuntimeError as e:
+        assert not isinstance(e, CaptureStopped)
+        assert isinstance(e.__cause__, ValueError)
+    else:
+        raise AssertionError("detect() should give up after max_errors")
+    assert detector.error_count == 4
+
+
+def test_public_process_is_used_by_default():
+    class BindingWithPrivates(FakePorcupine):
+        _handle = object()
+
+        def _process_func(self, *args):
+            raise AssertionError("private process function called")
+
+    audio = np.zeros(512 * 3, dtype=np.int16)
+    porcupine = BindingWithPrivates(keyword_at=1)
+    detector = make_detector(porcupine, source=PipeSource(io.BytesIO(audio.tobytes())))
+    assert [detector.detect() for _ in range(3)] == [False, True, False]
+    assert porcupine.frames == 3
+
+
+if __name__ == "__main__":
+    test_finite_source_ends_detection()
+    test_stopped_capture_ends_detection()
+    test_repeated_errors_back_off_then_raise()
+    test_public_process_is_used_by_default()
+    print("✅ All wake word loop tests passed!")
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Unit test for the bounded MQTT command work queue.
+Runs without a broker.
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from utils.workqueue import WorkQueue
+
+
+def blocked_queue(overflow, maxsize=2):
+    """Queue whose single worker is stuck on the first item until released."""
+    release = threading.Event()
+    started = threading.Event()
+    handled = []
+
+    def handler(item):
+        started.set()
+        release.wait(5.0)
+        handled.append(item)
+
+    queue = WorkQueue(handler, workers=1, maxsize=maxsize, overflow=overflow)
+    queue.submit("first")
+    assert started.wait(5.0)
+    return queue, release, handled
+
+
+def test_items_are_handled_in_order():
+    handled = []
+    queue = WorkQueue(handled.append, maxsize=8)
+    for i in range(5):
+        assert queue.submit(i)
+    queue.stop()
+    assert handled == [0, 1, 2, 3, 4]
+    metrics = queue.metrics()
+    assert metrics['processed'] == 5
+    assert metrics['depth'] == 0
+    assert 'latency_ms_avg' in metrics
+
+
+def test_drop_oldest():
+    queue, release, handled = blocked_queue('drop_oldest')
+    for item in ("a", "b", "c"):
+        assert queue.submit(item)
+    assert queue.depth == 2
+    release.set()
+    queue.stop()
+    assert handled == ["first", "b", "c"]
+    assert queue.metrics()['dropped'] == 1
+
+
+def test_reject():
+    queue, release, handled = blocked_queue('reject')
+    assert queue.submit("a")
+    assert queue.submit("b")
+    assert not queue.submit("c")
+    release.set()
+    queue.stop()
+    assert handled == ["first", "a", "b"]
+    assert queue.metrics()['rejected'] == 1
+
+
+def test_coalesce():
+    queue, release, handled = blocked_queue('coalesce')
+    queue.submit("tänd lampan")
+    queue.submit("vad är klockan")
+    queue.submit("tänd lampan")
+    queue.submit("spela musik")
+    release.set()
+    queue.stop()
+    assert handled == ["first", "vad är klockan", "spela musik"]
+    metrics = queue.metrics()
+    assert metrics['coalesced'] == 1
+    assert metrics['dropped'] == 1
+
+
+def test_handler_errors_are_counted():
+    errors = []
+
+    def handler(item):
+        raise RuntimeError("speaker busy")
+
+    queue = WorkQueue(handler, on_error=lambda item, e: errors.append(item))
+    queue.submit("hej")
+    queue.stop()
+    assert errors == ["hej"]
+    assert queue.metrics()['errors'] == 1
+
+
+def test_unknown_policy_is_rejected():
+    try:
+        WorkQueue(print, overflow='block')
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+
+
+if __name__ == "__main__":
+    test_items_are_handled_in_order()
+    test_drop_oldest()
+    test_reject()
+    test_coalesce()
+    test_handler_errors_are_counted()
+    test_unknown_policy_is_rejected()
+    print("✅ All work queue tests passed!")